@@ -0,0 +1,232 @@
+"""
+Admission control for screening work
+
+Every upload holds one slot while it parses, calls the LLM and saves. At most
+``ADMISSION_MAX_IN_FLIGHT`` slots are held per worker process; further work
+waits in a FIFO queue per lane, and a freed slot goes to the oldest waiter of
+the highest-priority lane:
+
+    interactive   single uploads from the UI (default)
+    bulk          uploads sent with "X-Priority: bulk", and re-screen jobs
+
+Instead of queueing without bound, an upload is turned away with
+``Overloaded`` (503 + Retry-After in the API) when its lane's queue is full or
+it has waited ``ADMISSION_QUEUE_TIMEOUT_SECONDS``. Retry-After is estimated
+from the recent average time a slot is held and the number of waiters.
+
+Re-screen jobs use ``hold_blocking()``: they wait as long as it takes (their
+own concurrency is bounded by RESCREEN_CONCURRENCY), so a running job yields
+to interactive uploads instead of failing.
+"""
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Deque, Dict, Optional
+
+from backend import metrics
+from backend.config import settings
+
+LANES = ("interactive", "bulk")  # priority order
+SERVICE_TIME_DECAY = 0.2  # weight of the newest sample in the average slot hold time
+
+
+class Overloaded(Exception):
+    """No slot could be granted; retry after ``retry_after`` seconds"""
+
+    def __init__(self, lane: str, reason: str, retry_after: int):
+        super().__init__(f"Screening capacity exhausted ({reason}); retry in {retry_after}s")
+        self.lane = lane
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("lane", "notify", "granted")
+
+    def __init__(self, lane: str, notify: Callable[[], None]):
+        self.lane = lane
+        self.notify = notify
+        self.granted = False
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():  # the waiter may have timed out meanwhile
+        future.set_result(True)
+
+
+class AdmissionController:
+    """Slots for screening work, shared by the event loop and worker threads"""
+
+    def __init__(self, max_in_flight: int, max_queue: Dict[str, int], queue_timeout: float):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._lock = threading.Lock()
+        self._in_flight = dict.fromkeys(LANES, 0)
+        self._queues: Dict[str, Deque[_Waiter]] = {lane: deque() for lane in LANES}
+        self._service_time = 1.0  # seconds, until measured
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_in_flight > 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "max_in_flight": self.max_in_flight,
+                "in_flight": dict(self._in_flight),
+                "queued": {lane: len(queue) for lane, queue in self._queues.items()},
+                "avg_service_seconds": round(self._service_time, 3),
+            }
+
+    def retry_after(self) -> int:
+        """Seconds until a new arrival would likely get a slot (clamped to 1..60)"""
+        waiting = sum(len(queue) for queue in self._queues.values())
+        return max(1, min(60, math.ceil(self._service_time * (waiting + 1) / self.max_in_flight)))
+
+    # --- called with self._lock held --------------------------------------
+
+    def _take(self, lane: str) -> None:
+        self._in_flight[lane] += 1
+        metrics.ADMISSION_IN_FLIGHT.labels(lane).inc()
+
+    def _try_take(self, lane: str) -> bool:
+        # A free slot with waiters only exists transiently; never jump the queue
+        if sum(self._in_flight.values()) < self.max_in_flight and not any(self._queues.values()):
+            self._take(lane)
+            return True
+        return False
+
+    def _enqueue(self, lane: str, notify: Callable[[], None], bounded: bool) -> _Waiter:
+        queue = self._queues[lane]
+        if bounded and len(queue) >= self.max_queue.get(lane, 0):
+            raise self._overloaded(lane, "queue_full")
+        waiter = _Waiter(lane, notify)
+        queue.append(waiter)
+        metrics.ADMISSION_QUEUE_DEPTH.labels(lane).inc()
+        return waiter
+
+    def _withdraw(self, waiter: _Waiter) -> bool:
+        """Remove a waiter that gave up; False if it was granted a slot meanwhile"""
+        if waiter.granted:
+            return False
+        self._queues[waiter.lane].remove(waiter)
+        metrics.ADMISSION_QUEUE_DEPTH.labels(waiter.lane).dec()
+        return True
+
+    def _overloaded(self, lane: str, reason: str) -> Overloaded:
+        metrics.ADMISSION_REJECTED.labels(lane, reason).inc()
+        return Overloaded(lane, reason, self.retry_after())
+
+    # ----------------------------------------------------------------------
+
+    def _release(self, lane: str, held_for: Optional[float]) -> None:
+        with self._lock:
+            self._in_flight[lane] -= 1
+            metrics.ADMISSION_IN_FLIGHT.labels(lane).dec()
+            if held_for is not None:
+                self._service_time += SERVICE_TIME_DECAY * (held_for - self._service_time)
+            for queue in self._queues.values():  # LANES order: interactive first
+                if queue:
+                    waiter = queue.popleft()
+                    metrics.ADMISSION_QUEUE_DEPTH.labels(waiter.lane).dec()
+                    waiter.granted = True
+                    self._take(waiter.lane)
+                    waiter.notify()
+                    break
+
+    def _held(self, lane: str, queued_since: float):
+        metrics.ADMISSION_WAIT.labels(lane).observe(time.perf_counter() - queued_since)
+        return time.perf_counter()
+
+    @asynccontextmanager
+    async def slot(self, lane: str = "interactive"):
+        """Hold a slot for the block; raises Overloaded if the queue is full or the wait times out"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+        with self._lock:
+            waiter = None if self._try_take(lane) else self._enqueue(
+                lane, lambda: loop.call_soon_threadsafe(_resolve, granted), bounded=True
+            )
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(granted, self.queue_timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                with self._lock:
+                    withdrawn = self._withdraw(waiter)
+                if withdrawn:
+                    if isinstance(e, asyncio.CancelledError):
+                        raise
+                    with self._lock:
+                        raise self._overloaded(lane, "timeout")
+                if isinstance(e, asyncio.CancelledError):  # granted as the client went away
+                    self._release(lane, None)
+                    raise
+                # granted just as the deadline passed: keep the slot
+        held = self._held(lane, started)
+        try:
+            yield
+        finally:
+            self._release(lane, time.perf_counter() - held)
+
+    @contextmanager
+    def hold_blocking(self, lane: str = "bulk"):
+        """Hold a slot from a worker thread, waiting as long as needed (background jobs)"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        event = threading.Event()
+        with self._lock:
+            waiter = None if self._try_take(lane) else self._enqueue(lane, event.set, bounded=False)
+        if waiter is not None:
+            event.wait()
+        held = self._held(lane, started)
+        try:
+            yield
+        finally:
+            self._release(lane, time.perf_counter() - held)
+
+
+_controller: Optional[AdmissionController] = None
+_controller_lock = threading.RLock()
+
+
+def configure(
+    max_in_flight: Optional[int] = None,
+    max_queue: Optional[int] = None,
+    bulk_max_queue: Optional[int] = None,
+    queue_timeout: Optional[float] = None
+) -> AdmissionController:
+    """(Re)build the process-wide controller; arguments default to settings"""
+    global _controller
+    with _controller_lock:
+        _controller = AdmissionController(
+            settings.ADMISSION_MAX_IN_FLIGHT if max_in_flight is None else max_in_flight,
+            {
+                "interactive": settings.ADMISSION_MAX_QUEUE if max_queue is None else max_queue,
+                "bulk": settings.ADMISSION_BULK_MAX_QUEUE if bulk_max_queue is None else bulk_max_queue,
+            },
+            settings.ADMISSION_QUEUE_TIMEOUT_SECONDS if queue_timeout is None else queue_timeout
+        )
+        return _controller
+
+
+def controller() -> AdmissionController:
+    if _controller is None:
+        with _controller_lock:
+            if _controller is None:
+                configure()
+    return _controller
+
+
+def lane_for(priority_header: Optional[str]) -> str:
+    """Lane of an upload from its X-Priority header"""
+    return "bulk" if (priority_header or "").strip().lower() == "bulk" else "interactive"
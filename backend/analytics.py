@@ -0,0 +1,267 @@
+"""
+Per-job score analytics from daily rollups
+
+``screening_rollups`` holds one row per (job description, UTC day): screening
+counts per recommended action, a histogram of match scores in whole-point
+buckets, and the sum and sum of squares of the scores. /api/analytics builds
+distributions, percentiles and trends from those rows, so its cost depends on
+the number of days asked for, not on how many screenings there are.
+
+Rollups are kept current by the DatabaseService write paths, like the
+full-text index: ``record()`` after new screenings are flushed, ``unrecord()``
+before screenings are deleted. Each change is one atomic UPSERT that adds to
+the counters, so concurrent workers never overwrite each other's counts.
+``rebuild()`` recomputes the table (and any missing ``job_hash``) from
+screening_records after bulk loads that bypass the write paths.
+
+Percentiles are interpolated within the one-point histogram buckets.
+"""
+import hashlib
+import math
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, func, insert, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from backend.compression import decompress
+from backend.models import ScreeningRecord, ScreeningRollup
+
+SCORE_BUCKETS = range(1, 11)
+ACTION_COLUMNS = {"Shortlist": "shortlisted", "Maybe": "maybe", "Reject": "rejected"}
+PERCENTILES = (10, 25, 50, 75, 90)
+MAX_DAYS = 730
+
+_COUNTERS = (
+    ["screenings", *ACTION_COLUMNS.values(), "score_sum", "score_sq_sum"]
+    + [f"score_{bucket}" for bucket in SCORE_BUCKETS]
+)
+_TABLE = ScreeningRollup.__table__
+_UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+Key = Tuple[str, date]
+
+
+def job_hash(job_description: Optional[str]) -> str:
+    """Rollup key of a job description (surrounding whitespace ignored)"""
+    return hashlib.sha256((job_description or "").strip().encode("utf-8")).hexdigest()
+
+
+def score_bucket(score: float) -> int:
+    return min(SCORE_BUCKETS[-1], max(SCORE_BUCKETS[0], int(score)))
+
+
+def _accumulate(totals: Dict[Key, dict], rows: Iterable, sign: int = 1) -> Dict[Key, dict]:
+    """Add screening rows (job_hash, job_title, screened_at, match_score, recommended_action) to ``totals``"""
+    for row in rows:
+        if row.job_hash is None:  # bulk-loaded and never rolled up
+            continue
+        key = (row.job_hash, (row.screened_at or datetime.utcnow()).date())
+        entry = totals.get(key)
+        if entry is None:
+            entry = totals[key] = dict.fromkeys(_COUNTERS, 0)
+            entry["job_title"] = row.job_title
+        entry["screenings"] += sign
+        if row.recommended_action in ACTION_COLUMNS:
+            entry[ACTION_COLUMNS[row.recommended_action]] += sign
+        if row.match_score is not None:
+            entry["score_sum"] += sign * row.match_score
+            entry["score_sq_sum"] += sign * row.match_score * row.match_score
+            entry[f"score_{score_bucket(row.match_score)}"] += sign
+    return totals
+
+
+def _upsert(db: Session, totals: Dict[Key, dict]) -> None:
+    """Add each entry of ``totals`` to its rollup row, creating missing rows"""
+    if not totals:
+        return
+    dialect_insert = _UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+    if dialect_insert is not None:  # one executemany for every key
+        stmt = dialect_insert(_TABLE)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["job_hash", "day"],
+                set_={name: _TABLE.c[name] + stmt.excluded[name] for name in _COUNTERS}
+            ),
+            [dict(values, job_hash=key[0], day=key[1]) for key, values in totals.items()]
+        )
+        return
+    for key, values in totals.items():
+        counters = {name: values[name] for name in _COUNTERS}
+        updated = db.execute(
+            update(_TABLE).where(_TABLE.c.job_hash == key[0], _TABLE.c.day == key[1])
+            .values({name: _TABLE.c[name] + value for name, value in counters.items()})
+        ).rowcount
+        if not updated:
+            db.execute(insert(_TABLE).values(job_hash=key[0], day=key[1], **values))
+
+
+def record(db: Session, screenings: Iterable) -> None:
+    """Count flushed screenings into the rollups (same transaction)"""
+    _upsert(db, _accumulate({}, screenings))
+
+
+def unrecord(db: Session, screenings: Iterable) -> None:
+    """Take screenings about to be deleted out of the rollups (same transaction)"""
+    totals = _accumulate({}, screenings, sign=-1)
+    _upsert(db, totals)
+    if totals:  # drop the rows that are now empty
+        db.execute(
+            delete(_TABLE).where(
+                _TABLE.c.job_hash == bindparam("key_hash"), _TABLE.c.day == bindparam("key_day"), _TABLE.c.screenings <= 0
+            ),
+            [{"key_hash": key[0], "key_day": key[1]} for key in totals]
+        )
+
+
+def _backfill_job_hashes(conn, batch_size: int = 1000) -> int:
+    """Set job_hash on screenings that lack it; identical stored texts are hashed once"""
+    hashes: Dict[object, str] = {}
+    after = filled = 0
+    while True:
+        rows = conn.execute(text(
+            "SELECT id, job_description FROM screening_records "
+            "WHERE job_hash IS NULL AND id > :after ORDER BY id LIMIT :limit"
+        ), {"after": after, "limit": batch_size}).all()
+        if not rows:
+            return filled
+        updates = []
+        for row_id, stored in rows:
+            raw = bytes(stored) if isinstance(stored, memoryview) else stored
+            digest = hashes.get(raw)
+            if digest is None:
+                if len(hashes) > 10000:
+                    hashes.clear()
+                digest = hashes[raw] = job_hash(None if raw is None else decompress(raw))
+            updates.append({"id": row_id, "job_hash": digest})
+        conn.execute(text("UPDATE screening_records SET job_hash = :job_hash WHERE id = :id"), updates)
+        filled += len(updates)
+        after = rows[-1][0]
+
+
+def rebuild(bind) -> int:
+    """
+    Recompute every rollup row from screening_records
+
+    ``bind`` is an Engine, or a Connection inside a transaction (migrations).
+    Returns the number of rollup rows written.
+    """
+    if isinstance(bind, Engine):
+        with bind.begin() as conn:
+            return rebuild(conn)
+    _backfill_job_hashes(bind)
+    stmt = select(
+        ScreeningRecord.job_hash, ScreeningRecord.job_title, ScreeningRecord.screened_at,
+        ScreeningRecord.match_score, ScreeningRecord.recommended_action
+    ).execution_options(yield_per=5000)
+    totals: Dict[Key, dict] = {}
+    for rows in bind.execute(stmt).partitions():
+        _accumulate(totals, rows)
+    bind.execute(delete(_TABLE))
+    if totals:
+        bind.execute(insert(_TABLE), [
+            dict(values, job_hash=key[0], day=key[1]) for key, values in totals.items()
+        ])
+    return len(totals)
+
+
+def percentile(histogram: Dict[int, int], pct: float) -> Optional[float]:
+    """``pct``-th percentile of a one-point-bucket histogram, interpolated within the bucket"""
+    total = sum(histogram.values())
+    if not total:
+        return None
+    target = pct / 100 * total
+    seen = 0
+    for bucket in SCORE_BUCKETS:
+        count = histogram.get(bucket, 0)
+        if count and seen + count >= target:
+            width = 1.0 if bucket < SCORE_BUCKETS[-1] else 0.0
+            return round(bucket + width * (target - seen) / count, 2)
+        seen += count
+    return float(SCORE_BUCKETS[-1])
+
+
+def _mean(score_sum: float, scored: int) -> Optional[float]:
+    return round(score_sum / scored, 2) if scored else None
+
+
+def _window(days: int) -> Tuple[date, date]:
+    end = datetime.utcnow().date()
+    return end - timedelta(days=days - 1), end
+
+
+def summary(db: Session, job_hash: Optional[str] = None, job_title: Optional[str] = None, days: int = 30) -> dict:
+    """Score distribution, percentiles and daily trend over the last ``days`` days"""
+    start, end = _window(days)
+    query = db.query(ScreeningRollup).filter(ScreeningRollup.day >= start)
+    if job_hash:
+        query = query.filter(ScreeningRollup.job_hash == job_hash)
+    if job_title:
+        query = query.filter(ScreeningRollup.job_title == job_title)
+
+    totals = dict.fromkeys(_COUNTERS, 0)
+    trend: Dict[date, dict] = {}
+    titles = set()
+    for row in query.order_by(ScreeningRollup.day).all():
+        titles.add(row.job_title)
+        day = trend.setdefault(row.day, dict.fromkeys(_COUNTERS, 0))
+        for name in _COUNTERS:
+            value = getattr(row, name)
+            totals[name] += value
+            day[name] += value
+
+    histogram = {bucket: totals[f"score_{bucket}"] for bucket in SCORE_BUCKETS}
+    scored = sum(histogram.values())
+    mean = totals["score_sum"] / scored if scored else None
+    variance = max(0.0, totals["score_sq_sum"] / scored - mean * mean) if scored else None
+    return {
+        "job_hash": job_hash,
+        "job_title": job_title or (titles.pop() if len(titles) == 1 else None),
+        "start": start,
+        "end": end,
+        "screenings": totals["screenings"],
+        **{name: totals[name] for name in ACTION_COLUMNS.values()},
+        "mean_score": None if mean is None else round(mean, 2),
+        "stddev_score": None if variance is None else round(math.sqrt(variance), 2),
+        "percentiles": {f"p{pct}": percentile(histogram, pct) for pct in PERCENTILES},
+        "histogram": [{"score": bucket, "count": count} for bucket, count in histogram.items()],
+        "trend": [
+            {
+                "day": day,
+                "screenings": values["screenings"],
+                **{name: values[name] for name in ACTION_COLUMNS.values()},
+                "mean_score": _mean(values["score_sum"], sum(values[f"score_{b}"] for b in SCORE_BUCKETS)),
+            }
+            for day, values in trend.items()
+        ],
+    }
+
+
+def jobs(db: Session, days: int = 30, limit: int = 20) -> List[dict]:
+    """Job descriptions screened in the last ``days`` days, busiest first"""
+    start, _ = _window(days)
+    scored = sum(getattr(ScreeningRollup, f"score_{bucket}") for bucket in SCORE_BUCKETS)
+    rows = db.query(
+        ScreeningRollup.job_hash,
+        func.max(ScreeningRollup.job_title).label("job_title"),
+        func.sum(ScreeningRollup.screenings).label("screenings"),
+        func.sum(ScreeningRollup.shortlisted).label("shortlisted"),
+        func.sum(ScreeningRollup.score_sum).label("score_sum"),
+        func.sum(scored).label("scored"),
+        func.max(ScreeningRollup.day).label("last_day")
+    ).filter(
+        ScreeningRollup.day >= start
+    ).group_by(ScreeningRollup.job_hash).order_by(func.sum(ScreeningRollup.screenings).desc()).limit(limit).all()
+    return [
+        {
+            "job_hash": row.job_hash,
+            "job_title": row.job_title,
+            "screenings": row.screenings,
+            "shortlisted": row.shortlisted,
+            "mean_score": _mean(row.score_sum, row.scored),
+            "last_day": row.last_day,
+        }
+        for row in rows
+    ]
@@ -0,0 +1,431 @@
+"""
+Tiered cache shared by all workers, with write invalidation
+
+Lookups go through up to three tiers, fastest first, and a hit in a lower
+tier is copied into the ones above it:
+
+    memory   per-process LRU (CACHE_MEMORY_ENTRIES)
+    shared   SQLite file in CACHE_DIR, shared by every worker on the host
+    redis    optional (CACHE_REDIS_URL), shared across hosts
+
+Values are bytes (get_json/set_json wrap orjson). Each namespace has a TTL;
+"versioned" namespaces hold data derived from the database (dashboard
+snapshots, stats) and are keyed by the data generation. Every write path
+bumps the generation, so older entries become unreachable in all tiers and
+all workers at once, without explicit eviction.
+
+The generation lives in a memory-mapped file next to the shared tier (an
+8-byte epoch and an 8-byte counter), so reading it is a struct unpack and
+bumping it takes a file lock. With Redis configured it lives in Redis
+instead, so workers on other hosts see the same sequence. The epoch changes
+whenever the counter is recreated, so ETags from an older sequence never match
+by accident.
+
+A tier that raises is skipped for TIER_RETRY_SECONDS; the cache only ever
+degrades to a miss.
+"""
+import hashlib
+import logging
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+import orjson
+
+from backend import metrics
+from backend.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+TIER_RETRY_SECONDS = 5.0
+PRUNE_EVERY_WRITES = 500
+
+
+class Namespace(NamedTuple):
+    versioned: bool  # keyed by data generation: any committed write invalidates
+    ttl: float  # seconds
+    memory: bool = True  # False for values other workers update in place
+
+
+def _namespaces() -> Dict[str, Namespace]:
+    return {
+        "snapshot": Namespace(True, settings.CACHE_SNAPSHOT_TTL_SECONDS),
+        "stats": Namespace(True, settings.CACHE_SNAPSHOT_TTL_SECONDS),
+        "llm_extract": Namespace(False, settings.CACHE_LLM_TTL_SECONDS),
+        "llm_score": Namespace(False, settings.CACHE_LLM_TTL_SECONDS),
+        "rescreen_job": Namespace(False, 86400, memory=False),
+    }
+
+
+class MemoryTier:
+    """Per-process LRU of (expires_at, value)"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteTier:
+    """Host-wide tier: one SQLite file (WAL) opened by every worker"""
+
+    name = "shared"
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        self._conn().executescript("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS ix_cache_entries_expires_at ON cache_entries (expires_at);
+        """)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=2.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._conn().execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at >= ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        conn = self._conn()
+        conn.execute("INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                     (key, value, time.time() + ttl))
+        self._writes += 1
+        if self._writes % PRUNE_EVERY_WRITES == 0:
+            self.prune(conn)
+
+    def prune(self, conn: Optional[sqlite3.Connection] = None) -> None:
+        """Drop expired entries, then the soonest-expiring ones beyond max_entries"""
+        conn = conn or self._conn()
+        conn.execute("DELETE FROM cache_entries WHERE expires_at < ?", (time.time(),))
+        conn.execute(
+            "DELETE FROM cache_entries WHERE key IN (SELECT key FROM cache_entries ORDER BY expires_at DESC "
+            "LIMIT -1 OFFSET ?)", (self.max_entries,)
+        )
+
+    def delete(self, key: str) -> None:
+        self._conn().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM cache_entries")
+
+
+class RedisTier:
+    """Cross-host tier on any Redis-protocol server"""
+
+    name = "redis"
+
+    def __init__(self, client, prefix: str):
+        self._client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._client.set(self.prefix + key, value, ex=max(1, int(ttl)))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match=self.prefix + "*", count=1000):
+            self._client.delete(key)
+
+
+class FileGeneration:
+    """Epoch + counter in a memory-mapped file; readers never lock"""
+
+    _LAYOUT = struct.Struct("<8sQ")
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        with self._locked():
+            if os.fstat(self._fd).st_size < self._LAYOUT.size:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                os.write(self._fd, self._LAYOUT.pack(os.urandom(8), 0))
+        self._mm = mmap.mmap(self._fd, self._LAYOUT.size)
+        self.epoch = self._LAYOUT.unpack_from(self._mm)[0].hex()
+
+    def _locked(self):
+        return _FileLock(self._fd, self._lock)
+
+    def value(self) -> int:
+        return struct.unpack_from("<Q", self._mm, 8)[0]
+
+    def bump(self) -> int:
+        with self._locked():
+            value = self.value() + 1
+            struct.pack_into("<Q", self._mm, 8, value)
+            return value
+
+
+class _FileLock:
+    """Thread lock plus an exclusive flock (flock alone does not exclude threads sharing the fd)"""
+
+    def __init__(self, fd: int, lock: threading.Lock):
+        self._fd = fd
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock.acquire()
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._lock.release()
+        return False
+
+
+class RedisGeneration:
+    """Generation counter shared across hosts (one GET per read)"""
+
+    def __init__(self, client, prefix: str):
+        self._client = client
+        self._key = prefix + "generation"
+        client.set(prefix + "epoch", os.urandom(4).hex(), nx=True)
+        self.epoch = "r" + client.get(prefix + "epoch").decode()
+
+    def value(self) -> int:
+        return int(self._client.get(self._key) or 0)
+
+    def bump(self) -> int:
+        return int(self._client.incr(self._key))
+
+
+class TieredCache:
+    """Read-through over the configured tiers"""
+
+    def __init__(self, tiers: List, generation: FileGeneration, shared_generation: Optional[RedisGeneration] = None):
+        self.tiers = tiers
+        self.namespaces = _namespaces()
+        self._generation = generation
+        self._shared_generation = shared_generation
+        self._shared_generation_stale = False  # a bump failed to reach Redis
+        self._down_until: Dict[str, float] = {}
+
+    def _call(self, tier, method: str, *args):
+        """Run a tier operation; a failing tier is skipped for a while instead of failing the request"""
+        if self._down_until.get(tier.name, 0) > time.monotonic():
+            return None
+        try:
+            return getattr(tier, method)(*args)
+        except Exception as e:
+            self._down_until[tier.name] = time.monotonic() + TIER_RETRY_SECONDS
+            logger.warning(f"Cache tier {tier.name} unavailable ({method}): {e}")
+            return None
+
+    def generation(self) -> Tuple[str, int]:
+        """(epoch, counter) of the data generation"""
+        if self._shared_generation is not None and self._down_until.get("redis", 0) <= time.monotonic():
+            try:
+                if self._shared_generation_stale:
+                    # Writes happened while Redis was unreachable: entries under
+                    # the Redis generation it still holds are outdated
+                    self._shared_generation.bump()
+                    self._shared_generation_stale = False
+                return self._shared_generation.epoch, self._shared_generation.value()
+            except Exception as e:
+                self._down_until["redis"] = time.monotonic() + TIER_RETRY_SECONDS
+                logger.warning(f"Cache tier redis unavailable (generation): {e}")
+        return self._generation.epoch, self._generation.value()
+
+    def bump(self) -> int:
+        version = self._generation.bump()
+        if self._shared_generation is not None:
+            try:
+                version = self._shared_generation.bump()
+            except Exception as e:
+                self._shared_generation_stale = True
+                logger.warning(f"Cache tier redis unavailable (bump): {e}")
+        return version
+
+    def _key(self, namespace: str, key: str, version: Optional[int]) -> str:
+        if self.namespaces[namespace].versioned:
+            epoch, current = self.generation()
+            return f"{namespace}:{epoch}.{current if version is None else version}:{key}"
+        return f"{namespace}:{key}"
+
+    def _tiers(self, namespace: str) -> List:
+        return self.tiers if self.namespaces[namespace].memory else [t for t in self.tiers if t.name != "memory"]
+
+    def get(self, namespace: str, key: str, version: Optional[int] = None) -> Optional[bytes]:
+        spec = self.namespaces[namespace]
+        if spec.ttl <= 0:
+            return None
+        full_key = self._key(namespace, key, version)
+        tiers = self._tiers(namespace)
+        for idx, tier in enumerate(tiers):
+            value = self._call(tier, "get", full_key)
+            metrics.cache_tier_result(namespace, tier.name, value is not None)
+            if value is not None:
+                for upper in tiers[:idx]:
+                    self._call(upper, "set", full_key, value, spec.ttl)
+                metrics.cache_hit(namespace)
+                return value
+        metrics.cache_miss(namespace)
+        return None
+
+    def set(self, namespace: str, key: str, value: bytes, version: Optional[int] = None) -> None:
+        """Store in every tier; a versioned value built from an outdated generation is dropped"""
+        spec = self.namespaces[namespace]
+        if spec.ttl <= 0:
+            return
+        if spec.versioned and version is not None and version != self.generation()[1]:
+            return
+        full_key = self._key(namespace, key, version)
+        for tier in self._tiers(namespace):
+            self._call(tier, "set", full_key, value, spec.ttl)
+
+    def delete(self, namespace: str, key: str) -> None:
+        full_key = self._key(namespace, key, None)
+        for tier in self._tiers(namespace):
+            self._call(tier, "delete", full_key)
+
+    def clear(self) -> None:
+        for tier in self.tiers:
+            self._call(tier, "clear")
+
+
+_cache: Optional[TieredCache] = None
+_configure_lock = threading.RLock()
+
+
+def configure(directory: Optional[str] = None, redis_url: Optional[str] = None) -> TieredCache:
+    """(Re)build the process-wide cache from settings; arguments override CACHE_DIR / CACHE_REDIS_URL"""
+    global _cache
+    with _configure_lock:
+        _cache = _build(directory, redis_url)
+    return _cache
+
+
+def _build(directory: Optional[str], redis_url: Optional[str]) -> TieredCache:
+    directory = directory or settings.CACHE_DIR
+    redis_url = settings.CACHE_REDIS_URL if redis_url is None else redis_url
+    os.makedirs(directory, exist_ok=True)
+    tiers: List = []
+    if settings.CACHE_MEMORY_ENTRIES > 0:
+        tiers.append(MemoryTier(settings.CACHE_MEMORY_ENTRIES))
+    if settings.CACHE_SHARED_ENABLED:
+        tiers.append(SQLiteTier(os.path.join(directory, "cache.db"), settings.CACHE_SHARED_MAX_ENTRIES))
+    shared_generation = None
+    if redis_url:
+        try:
+            import redis
+            client = redis.Redis.from_url(redis_url, socket_timeout=0.25, socket_connect_timeout=0.25)
+            shared_generation = RedisGeneration(client, settings.CACHE_REDIS_PREFIX)
+            tiers.append(RedisTier(client, settings.CACHE_REDIS_PREFIX + "cache:"))
+        except Exception as e:  # ImportError or unreachable server
+            logger.warning(f"Redis cache tier disabled: {e}")
+    return TieredCache(tiers, FileGeneration(os.path.join(directory, "generation")), shared_generation)
+
+
+def get_cache() -> TieredCache:
+    """The process-wide cache, configured from settings on first use"""
+    if _cache is None:
+        with _configure_lock:
+            if _cache is None:
+                configure()
+    return _cache
+
+
+def content_key(*parts: str) -> str:
+    """Stable key for values that are a pure function of their inputs (prompts, texts)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def get_json(namespace: str, key: str, version: Optional[int] = None) -> Optional[Any]:
+    value = get_cache().get(namespace, key, version)
+    return orjson.loads(value) if value is not None else None
+
+
+def set_json(namespace: str, key: str, value: Any, version: Optional[int] = None) -> None:
+    get_cache().set(namespace, key, orjson.dumps(value), version)
+
+
+def data_version() -> int:
+    return get_cache().generation()[1]
+
+
+def bump_data_version() -> int:
+    """Make every versioned entry stale in all workers; called after every committed write"""
+    return get_cache().bump()
+
+
+def etag(version: int, *parts) -> str:
+    return '"' + ".".join([get_cache().generation()[0], str(version)] + [str(p) for p in parts]) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], tag: str) -> bool:
+    """True if an If-None-Match header lists ``tag`` (weak or strong)"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or tag in candidates or f"W/{tag}" in candidates
+
+
+def get_snapshot(key: Hashable, version: int) -> Optional[bytes]:
+    return get_cache().get("snapshot", repr(key), version)
+
+
+def put_snapshot(key: Hashable, version: int, value: bytes) -> None:
+    # A write may have landed while the snapshot was being built; only keep it
+    # if it still describes the current version.
+    get_cache().set("snapshot", repr(key), value, version)
@@ -0,0 +1,327 @@
+"""
+Compressed storage for large text columns
+
+``Candidate.resume_text`` and ``ScreeningRecord.job_description`` are stored as
+compressed blobs through the ``CompressedText`` column type. Each stored value
+starts with a two-byte header naming its codec, so rows written with different
+codecs (or before compression existed) can be read side by side:
+
+    b"\\x00z" + zlib stream
+    b"\\x00s" + zstd frame
+    b"\\x00d" + 4-byte dictionary id + zstd frame compressed with that dictionary
+
+Values without a header are plain text: legacy TEXT values are returned
+unchanged and header-less blobs (COMPRESSION_CODEC=none) are decoded as UTF-8.
+A NUL byte never starts resume or job-description text, so the header cannot
+collide with uncompressed data.
+
+zstd needs the optional ``zstandard`` package; without it new values are
+written with zlib (reading zstd rows then fails loudly). Trained dictionaries
+live in the ``compression_dictionaries`` table, one sequence per column, and
+are never deleted because rows keep referring to them.
+
+Migrate an existing database (compress legacy rows, optionally training
+dictionaries first):
+
+    python -m backend.compression --train-dictionaries --vacuum
+"""
+import argparse
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from typing import Dict, Optional, Union
+
+from sqlalchemy import insert, inspect, text
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from backend.config import settings
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+ZLIB = b"\x00z"
+ZSTD = b"\x00s"
+ZSTD_DICT = b"\x00d"
+HEADER_SIZE = 2
+_DICT_ID = struct.Struct(">I")
+
+# Dictionary training: sample count and target size
+DICTIONARY_SAMPLES = 2000
+DICTIONARY_SIZE = 112 * 1024
+
+_lock = threading.Lock()
+_dictionaries: Dict[int, "zstandard.ZstdCompressionDict"] = {}
+_active_dictionary: Dict[str, Optional[int]] = {}
+_engine = None
+# zstd (de)compressor objects are costly to build (especially with a dictionary)
+# and not safe to share between threads, so each thread keeps its own, rebuilt
+# when use_engine() bumps the generation (dictionaries differ per database)
+_local = threading.local()
+_generation = 0
+
+
+def zstd_available() -> bool:
+    return zstandard is not None
+
+
+def use_engine(engine) -> None:
+    """Load dictionaries from ``engine`` instead of the application database"""
+    global _engine, _generation
+    with _lock:
+        _engine = engine
+        _dictionaries.clear()
+        _active_dictionary.clear()
+        _generation += 1
+
+
+def _dictionary_engine():
+    if _engine is None:
+        from backend.database import engine
+        return engine
+    return _engine
+
+
+def _load_dictionary(dict_id: int):
+    dictionary = _dictionaries.get(dict_id)
+    if dictionary is None:
+        with _dictionary_engine().connect() as conn:
+            row = conn.execute(
+                text("SELECT data FROM compression_dictionaries WHERE id = :id"), {"id": dict_id}
+            ).first()
+        if row is None:
+            raise LookupError(f"Compression dictionary {dict_id} not found")
+        dictionary = zstandard.ZstdCompressionDict(bytes(row[0]))
+        _dictionaries[dict_id] = dictionary
+    return dictionary
+
+
+def _zstd(kind: str, dict_id: Optional[int]):
+    """Cached per-thread ZstdCompressor/ZstdDecompressor for ``dict_id`` (None: no dictionary)"""
+    cache = getattr(_local, "zstd", None)
+    if cache is None or _local.generation != _generation:
+        cache = _local.zstd = {}
+        _local.generation = _generation
+    key = (kind, dict_id, settings.COMPRESSION_LEVEL if kind == "c" else None)
+    codec = cache.get(key)
+    if codec is None:
+        options = {"dict_data": _load_dictionary(dict_id)} if dict_id is not None else {}
+        if kind == "c":
+            codec = zstandard.ZstdCompressor(level=settings.COMPRESSION_LEVEL, **options)
+        else:
+            codec = zstandard.ZstdDecompressor(**options)
+        cache[key] = codec
+    return codec
+
+
+def _active_dictionary_id(column: str) -> Optional[int]:
+    """Newest trained dictionary for ``column`` (looked up once per process)"""
+    if column not in _active_dictionary:
+        try:
+            with _dictionary_engine().connect() as conn:
+                row = conn.execute(
+                    text("SELECT MAX(id) FROM compression_dictionaries WHERE column_name = :column"),
+                    {"column": column}
+                ).first()
+        except Exception:  # table not created yet
+            row = None
+        _active_dictionary[column] = row[0] if row else None
+    return _active_dictionary[column]
+
+
+def compress(value: str, dictionary: Optional[str] = None, codec: Optional[str] = None) -> bytes:
+    """
+    Encode ``value`` for storage
+
+    Args:
+        value: Text to store
+        dictionary: Column name whose trained dictionary should be used, if any
+        codec: "zstd", "zlib" or "none" (defaults to settings.COMPRESSION_CODEC)
+    """
+    codec = codec or settings.COMPRESSION_CODEC
+    data = value.encode("utf-8")
+    if codec == "none":
+        return data  # header-less: read back as plain UTF-8
+    if codec == "zstd" and zstandard is not None:
+        dict_id = _active_dictionary_id(dictionary) if dictionary and settings.COMPRESSION_USE_DICTIONARY else None
+        if dict_id is not None:
+            return ZSTD_DICT + _DICT_ID.pack(dict_id) + _zstd("c", dict_id).compress(data)
+        return ZSTD + _zstd("c", None).compress(data)
+    return ZLIB + zlib.compress(data, min(settings.COMPRESSION_LEVEL, 9))
+
+
+def decompress(value: Union[bytes, str, memoryview]) -> str:
+    """Decode a stored value (compressed or legacy plain text)"""
+    if isinstance(value, str):
+        return value
+    value = bytes(value)
+    header = value[:HEADER_SIZE]
+    if header == ZLIB:
+        return zlib.decompress(value[HEADER_SIZE:]).decode("utf-8")
+    if header in (ZSTD, ZSTD_DICT):
+        if zstandard is None:
+            raise RuntimeError("zstd-compressed data found but the zstandard package is not installed")
+        if header == ZSTD:
+            return _zstd("d", None).decompress(value[HEADER_SIZE:]).decode("utf-8")
+        (dict_id,) = _DICT_ID.unpack_from(value, HEADER_SIZE)
+        return _zstd("d", dict_id).decompress(value[HEADER_SIZE + _DICT_ID.size:]).decode("utf-8")
+    return value.decode("utf-8")  # uncompressed, or legacy text converted to a binary column type
+
+
+def is_compressed(value) -> bool:
+    return isinstance(value, (bytes, memoryview)) and bytes(value[:HEADER_SIZE]) in (ZLIB, ZSTD, ZSTD_DICT)
+
+
+class CompressedText(TypeDecorator):
+    """Text column stored as a compressed blob; decompressed when loaded"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, dictionary: Optional[str] = None):
+        super().__init__()
+        self.dictionary = dictionary
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress(value, self.dictionary)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return decompress(value)
+
+
+# ----------------------------------------------------------------------
+# Migration of existing rows
+# ----------------------------------------------------------------------
+COMPRESSED_COLUMNS = [
+    ("candidates", "resume_text"),
+    ("screening_records", "job_description"),
+]
+
+
+def train_dictionary(engine, table: str, column: str) -> Optional[int]:
+    """Train a zstd dictionary from a sample of ``table.column`` and store it"""
+    if zstandard is None:
+        raise RuntimeError("Dictionary training needs the zstandard package")
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL ORDER BY RANDOM() LIMIT :limit"),
+            {"limit": DICTIONARY_SAMPLES}
+        ).all()
+    samples = [decompress(row[0]).encode("utf-8") for row in rows]
+    if len(samples) < 10:
+        return None
+    dictionary = zstandard.train_dictionary(DICTIONARY_SIZE, samples)
+    from backend.models import CompressionDictionary
+    with engine.begin() as conn:
+        result = conn.execute(insert(CompressionDictionary).values(column_name=column, data=dictionary.as_bytes()))
+        dict_id = result.inserted_primary_key[0]
+    with _lock:
+        _active_dictionary[column] = dict_id
+    return dict_id
+
+
+def _stored_bytes(engine, table: str, column: str) -> int:
+    size = f"LENGTH(CAST({column} AS BLOB))" if engine.dialect.name == "sqlite" else f"OCTET_LENGTH({column})"
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT COALESCE(SUM({size}), 0) FROM {table}")).scalar()
+
+
+def _ensure_binary_column(engine, table: str, column: str) -> None:
+    """
+    SQLite stores blobs in a TEXT column as-is; other databases need the
+    column converted first (legacy text becomes header-less UTF-8 bytes)
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    column_type = next(c["type"] for c in inspect(engine).get_columns(table) if c["name"] == column)
+    if not isinstance(column_type, LargeBinary):
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE BYTEA USING convert_to({column}, 'UTF8')"))
+
+
+def compress_existing_rows(engine, table: str, column: str, batch_size: int = 500) -> dict:
+    """
+    Rewrite legacy plain-text values of ``table.column`` in compressed form
+
+    Works in id-ordered batches with one transaction each, so it can be
+    interrupted and re-run; already compressed rows are left untouched.
+    """
+    _ensure_binary_column(engine, table, column)
+    bytes_before = _stored_bytes(engine, table, column)
+    started = time.perf_counter()
+    converted = 0
+    last_id = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(f"SELECT id, {column} FROM {table} WHERE id > :last_id AND {column} IS NOT NULL ORDER BY id LIMIT :limit"),
+                {"last_id": last_id, "limit": batch_size}
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            updates = [
+                {"id": row_id, "value": compress(decompress(value), column)}
+                for row_id, value in rows if not is_compressed(value)
+            ]
+            updates = [u for u in updates if is_compressed(u["value"])]  # codec "none": nothing to do
+            if updates:
+                conn.execute(text(f"UPDATE {table} SET {column} = :value WHERE id = :id"), updates)
+                converted += len(updates)
+    return {
+        "table": table,
+        "column": column,
+        "rows_converted": converted,
+        "bytes_before": bytes_before,
+        "bytes_after": _stored_bytes(engine, table, column),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def migrate(engine, train_dictionaries: bool = False, vacuum: bool = False, batch_size: int = 500) -> list:
+    """Compress every legacy value in COMPRESSED_COLUMNS; returns one report per column"""
+    from backend.database import Base
+    from backend.models import CompressionDictionary  # noqa: F401  (registers the table)
+    Base.metadata.create_all(bind=engine, tables=[CompressionDictionary.__table__])
+    use_engine(engine)
+
+    reports = []
+    for table, column in COMPRESSED_COLUMNS:
+        if train_dictionaries:
+            train_dictionary(engine, table, column)
+        reports.append(compress_existing_rows(engine, table, column, batch_size))
+    if vacuum and engine.dialect.name == "sqlite":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("VACUUM")
+    return reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compress stored resume text and job descriptions")
+    parser.add_argument("--train-dictionaries", action="store_true", help="Train a zstd dictionary per column first")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards to return freed pages (SQLite)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    from backend.database import engine
+    file_size = os.path.getsize(engine.url.database) if engine.dialect.name == "sqlite" else None
+    for report in migrate(engine, args.train_dictionaries, args.vacuum, args.batch_size):
+        saved = report["bytes_before"] - report["bytes_after"]
+        ratio = report["bytes_before"] / report["bytes_after"] if report["bytes_after"] else 0
+        print(f"{report['table']}.{report['column']}: {report['rows_converted']} rows compressed, "
+              f"{report['bytes_before']:,} -> {report['bytes_after']:,} bytes "
+              f"({saved:,} saved, {ratio:.1f}x) in {report['seconds']}s")
+    if file_size is not None:
+        print(f"database file: {file_size:,} -> {os.path.getsize(engine.url.database):,} bytes")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,6 +28,76 @@ class Settings:
     LLM_SCORING_TEMPERATURE: float = float(os.getenv("LLM_SCORING_TEMPERATURE", "0.5"))
     LLM_MAX_TOKENS_EXTRACTION: int = int(os.getenv("LLM_MAX_TOKENS_EXTRACTION", "1500"))
     LLM_MAX_TOKENS_SCORING: int = int(os.getenv("LLM_MAX_TOKENS_SCORING", "1000"))
+    LLM_BACKEND: str = os.getenv("LLM_BACKEND", "gemini")  # gemini | rest | fake (services/llm_backend.py)
+    LLM_FAKE_LATENCY_MS: float = float(os.getenv("LLM_FAKE_LATENCY_MS", "800"))  # simulated call time
+    LLM_FAKE_JITTER_MS: float = float(os.getenv("LLM_FAKE_JITTER_MS", "200"))
+    
+    # LLM_BACKEND=rest: Gemini REST API over a pool of keep-alive connections per worker
+    LLM_BASE_URL: str = os.getenv("LLM_BASE_URL", "https://generativelanguage.googleapis.com")
+    LLM_POOL_SIZE: int = int(os.getenv("LLM_POOL_SIZE", "8"))
+    LLM_POOL_WARM: int = int(os.getenv("LLM_POOL_WARM", "2"))  # connections opened at startup; 0: none
+    LLM_KEEPALIVE_SECONDS: float = float(os.getenv("LLM_KEEPALIVE_SECONDS", "120"))  # idle connection lifetime
+    LLM_HTTP2: bool = os.getenv("LLM_HTTP2", "true").lower() == "true"  # when the h2 package is installed
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+    
+    # Long resumes: above EXTRACTION_CHUNK_CHARS, sections are extracted in parallel chunks and merged
+    EXTRACTION_CHUNK_CHARS: int = int(os.getenv("EXTRACTION_CHUNK_CHARS", "12000"))  # 0: always one prompt
+    EXTRACTION_CHUNK_CONCURRENCY: int = int(os.getenv("EXTRACTION_CHUNK_CONCURRENCY", "4"))  # LLM calls per resume
+    
+    # Scoring one resume against several jobs (/api/analyze/multi)
+    MULTI_SCORE_MAX_JOBS: int = int(os.getenv("MULTI_SCORE_MAX_JOBS", "20"))  # job descriptions per request
+    MULTI_SCORE_JOBS_PER_CALL: int = int(os.getenv("MULTI_SCORE_JOBS_PER_CALL", "5"))  # jobs packed into one prompt
+    MULTI_SCORE_CONCURRENCY: int = int(os.getenv("MULTI_SCORE_CONCURRENCY", "4"))  # packed prompts in flight
+    
+    # Re-screening stored candidates (/api/jobs/rescreen)
+    RESCREEN_CONCURRENCY: int = int(os.getenv("RESCREEN_CONCURRENCY", "4"))  # parallel scoring calls
+    RESCREEN_BATCH_SIZE: int = int(os.getenv("RESCREEN_BATCH_SIZE", "50"))  # records per write transaction
+    
+    # Bulk deletes and the retention purge (services/retention_service.py)
+    DELETE_BATCH_SIZE: int = int(os.getenv("DELETE_BATCH_SIZE", "500"))  # rows per delete transaction
+    RETENTION_DAYS: int = int(os.getenv("RETENTION_DAYS", "0"))  # purge screenings older than this; 0 disables
+    RETENTION_INTERVAL_HOURS: float = float(os.getenv("RETENTION_INTERVAL_HOURS", "24"))
+    RETENTION_VACUUM: bool = os.getenv("RETENTION_VACUUM", "false").lower() == "true"  # VACUUM after a purge
+    
+    # Change feed (backend/events.py, GET /api/events)
+    EVENTS_POLL_SECONDS: float = float(os.getenv("EVENTS_POLL_SECONDS", "0.5"))  # per worker, while clients listen
+    EVENTS_HEARTBEAT_SECONDS: float = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))  # keep-alive comment on idle streams
+    EVENTS_RETENTION_HOURS: float = float(os.getenv("EVENTS_RETENTION_HOURS", "24"))  # how far back clients can resume
+    
+    # Admission control for screening work (backend/admission.py), per worker process:
+    # beyond ADMISSION_MAX_IN_FLIGHT, uploads wait in a bounded queue (interactive before bulk)
+    # and get 503 + Retry-After when it is full or their wait exceeds the timeout
+    ADMISSION_MAX_IN_FLIGHT: int = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "8"))  # 0 disables admission control
+    ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))  # waiting interactive uploads
+    ADMISSION_BULK_MAX_QUEUE: int = int(os.getenv("ADMISSION_BULK_MAX_QUEUE", "16"))  # waiting "X-Priority: bulk" uploads
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "20"))
+    
+    # Upload dedup: "reuse" skips extraction for near-duplicates, "flag" only reports them
+    NEAR_DUPLICATE_MODE: str = os.getenv("NEAR_DUPLICATE_MODE", "reuse")  # reuse | flag | off
+    NEAR_DUPLICATE_THRESHOLD: float = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.9"))  # estimated Jaccard
+    
+    # PDF text extraction (services/pdf_text.py): auto | pdfium | pypdf | pdfminer | pypdf2
+    PDF_TEXT_ENGINE: str = os.getenv("PDF_TEXT_ENGINE", "auto")
+    PDF_TEXT_MIN_QUALITY: float = float(os.getenv("PDF_TEXT_MIN_QUALITY", "0.9"))  # auto: below this, try other engines
+    
+    # Skill taxonomy matching (services/skill_taxonomy.py)
+    SKILL_MATCH_MODE: str = os.getenv("SKILL_MATCH_MODE", "merge")  # merge | replace | off
+    SKILL_TAXONOMY_FILE: str = os.getenv("SKILL_TAXONOMY_FILE", "")  # JSON {canonical: [aliases]} to add
+
+    # Stored resume text / job descriptions (backend/compression.py)
+    COMPRESSION_CODEC: str = os.getenv("COMPRESSION_CODEC", "zstd")  # zstd | zlib | none (zstd falls back to zlib)
+    COMPRESSION_LEVEL: int = int(os.getenv("COMPRESSION_LEVEL", "6"))
+    COMPRESSION_USE_DICTIONARY: bool = os.getenv("COMPRESSION_USE_DICTIONARY", "true").lower() == "true"
+    
+    # Cache tiers (backend/cache.py): per-process LRU -> shared SQLite file -> optional Redis
+    CACHE_DIR: str = os.getenv("CACHE_DIR", ".cache")  # shared tier + generation counter (one per host)
+    CACHE_MEMORY_ENTRIES: int = int(os.getenv("CACHE_MEMORY_ENTRIES", "1024"))
+    CACHE_SHARED_ENABLED: bool = os.getenv("CACHE_SHARED_ENABLED", "true").lower() == "true"
+    CACHE_SHARED_MAX_ENTRIES: int = int(os.getenv("CACHE_SHARED_MAX_ENTRIES", "50000"))
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "")  # e.g. redis://localhost:6379/0 (pip install redis)
+    CACHE_REDIS_PREFIX: str = os.getenv("CACHE_REDIS_PREFIX", "resume_screener:")
+    CACHE_SNAPSHOT_TTL_SECONDS: float = float(os.getenv("CACHE_SNAPSHOT_TTL_SECONDS", "3600"))
+    CACHE_LLM_TTL_SECONDS: float = float(os.getenv("CACHE_LLM_TTL_SECONDS", str(7 * 86400)))  # 0: don't cache LLM results
     
     # File Upload Settings
     MAX_FILE_SIZE_MB: int = int(os.getenv("MAX_FILE_SIZE_MB", "10"))
@@ -43,12 +113,24 @@ class Settings:
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FILE: str = os.getenv("LOG_FILE", "resume_screener.log")
+    LOG_MAX_BYTES: int = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT: int = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))  # records buffered before dropping
+    LOG_VERBOSE_PER_SECOND: float = float(os.getenv("LOG_VERBOSE_PER_SECOND", "2"))  # raw LLM dumps etc.
     
     # Admin Authentication
     ADMIN_USERNAME: str = os.getenv("ADMIN_USERNAME", "admin")
     ADMIN_PASSWORD: str = os.getenv("ADMIN_PASSWORD", "admin123")
     SESSION_SECRET_KEY: str = os.getenv("SESSION_SECRET_KEY", "your-secret-key-change-in-production")
     
+    # Request Profiling (opt-in; see backend/profiling.py)
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "False").lower() == "true"
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0.01"))
+    PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "")  # X-Profile-Token value that forces a profile
+    PROFILING_INTERVAL_MS: float = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "profiles")
+    PROFILING_MAX_STORED: int = int(os.getenv("PROFILING_MAX_STORED", "100"))
+    
     @classmethod
     def validate(cls) -> bool:
         """Validate critical settings"""
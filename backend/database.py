@@ -1,7 +1,7 @@
 """
 Database configuration and session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -18,6 +18,16 @@ if DATABASE_URL.startswith("sqlite"):
         DATABASE_URL, 
         connect_args={"check_same_thread": False}  # Needed for SQLite
     )
+
+    @event.listens_for(engine, "connect")
+    def _register_sqlite_functions(dbapi_connection, connection_record):
+        # Used by the full-text index view to read compressed resume text
+        from backend.compression import decompress
+        dbapi_connection.create_function(
+            "decompress_text", 1, lambda value: None if value is None else decompress(value), deterministic=True
+        )
+        # SQLite enforces foreign keys (and ON DELETE CASCADE) only when asked, per connection
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
 else:
     engine = create_engine(DATABASE_URL)
 
@@ -42,9 +52,10 @@ def get_db():
 
 def init_db():
     """
-    Initialize database - create all tables
+    Initialize database - create or migrate the schema (backend/migrations.py)
     Call this on application startup
     """
-    from backend.models import Candidate, ScreeningRecord, Experience, Education
-    Base.metadata.create_all(bind=engine)
+    from backend import migrations, search
+    migrations.migrate(engine)
+    search.ensure_index(engine)
     print("✓ Database initialized successfully")
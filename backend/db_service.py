@@ -1,18 +1,41 @@
 """
 Database service layer for CRUD operations
 """
-from sqlalchemy.orm import Session
-from backend.models import Candidate, Experience, Education, ScreeningRecord
-from backend.schemas import CandidateProfile, ScreeningResult
-from typing import List, Optional
+from sqlalchemy.orm import Session, joinedload, defer, selectinload, undefer, load_only
+from backend.models import Candidate, Experience, Education, ScreeningRecord, ResumeLSHBand
+from backend.schemas import CandidateProfile, ScreeningResult, MatchScore, Experience as ExperienceSchema, Education as EducationSchema
+from backend.metrics import stage_timer
+from backend import analytics, cache, events, search, serializers
+from services import near_duplicate, skill_taxonomy
+from sqlalchemy import select, delete, exists, func, and_, or_
+from sqlalchemy.exc import IntegrityError
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime
 
+# Screening columns analytics.record()/unrecord() read
+_ROLLUP_COLUMNS = (
+    ScreeningRecord.job_hash, ScreeningRecord.job_title, ScreeningRecord.screened_at,
+    ScreeningRecord.match_score, ScreeningRecord.recommended_action
+)
+# ...plus what a screening delete event carries
+_DELETED_SCREENING_COLUMNS = (ScreeningRecord.id, ScreeningRecord.candidate_id) + _ROLLUP_COLUMNS
+
+
+def _screening_deleted(row) -> dict:
+    return events.event("screening", "delete", row.id, {"candidate_id": row.candidate_id, "recommended_action": row.recommended_action})
+
 
 class DatabaseService:
     """Service for database operations"""
     
     @staticmethod
-    def save_screening_result(db: Session, screening_result: ScreeningResult, resume_text: str) -> int:
+    def save_screening_result(
+        db: Session,
+        screening_result: ScreeningResult,
+        resume_text: str,
+        resume_sha256: Optional[str] = None,
+        minhash_signature=None
+    ) -> int:
         """
         Save complete screening result to database
         
@@ -20,12 +43,52 @@ class DatabaseService:
             db: Database session
             screening_result: ScreeningResult object from resume_extractor
             resume_text: Original resume text
+            resume_sha256: SHA-256 of the uploaded PDF bytes (exact-repeat dedup)
+            minhash_signature: MinHash signature of resume_text (near-duplicate lookup)
             
         Returns:
             int: Candidate ID
         """
-        candidate_data = screening_result.candidate
-        match_data = screening_result.match_score
+        return DatabaseService.save_screening_results(
+            db, screening_result.candidate, resume_text, screening_result.resume_filename,
+            [(screening_result.job_description, screening_result.match_score)], resume_sha256, minhash_signature
+        )
+    
+    @staticmethod
+    def save_screening_results(
+        db: Session,
+        candidate_data: CandidateProfile,
+        resume_text: str,
+        resume_filename: str,
+        matches: List[Tuple[str, MatchScore]],
+        resume_sha256: Optional[str] = None,
+        minhash_signature=None
+    ) -> int:
+        """
+        Save a candidate and one ScreeningRecord per (job_description, MatchScore) in one transaction
+        
+        Returns:
+            int: Candidate ID
+        """
+        with stage_timer("db_save"):
+            try:
+                return DatabaseService._save_screening_results(db, candidate_data, resume_text, resume_filename, matches, resume_sha256, minhash_signature)
+            except IntegrityError:
+                # A concurrent upload inserted the same email between our lookup and
+                # insert (candidates.email is unique): retry, which updates that row
+                db.rollback()
+                return DatabaseService._save_screening_results(db, candidate_data, resume_text, resume_filename, matches, resume_sha256, minhash_signature)
+    
+    @staticmethod
+    def _save_screening_results(
+        db: Session,
+        candidate_data: CandidateProfile,
+        resume_text: str,
+        resume_filename: str,
+        matches: List[Tuple[str, MatchScore]],
+        resume_sha256: Optional[str],
+        minhash_signature
+    ) -> int:
         
         # Check if candidate already exists (by email)
         existing_candidate = None
@@ -35,8 +98,9 @@ class DatabaseService:
             ).first()
         
         if existing_candidate:
-            # Update existing candidate
+            # Update existing candidate (unindexed first: FTS5 reads the old values)
             candidate = existing_candidate
+            search.remove(db, candidate.id)
             candidate.name = candidate_data.name or candidate.name
             candidate.phone = candidate_data.phone or candidate.phone
             candidate.location = candidate_data.location or candidate.location
@@ -45,7 +109,8 @@ class DatabaseService:
             candidate.summary = candidate_data.summary
             candidate.total_experience_years = candidate_data.total_experience_years
             candidate.resume_text = resume_text
-            candidate.resume_filename = screening_result.resume_filename
+            candidate.resume_filename = resume_filename
+            candidate.resume_sha256 = resume_sha256 or candidate.resume_sha256
             candidate.updated_at = datetime.utcnow()
             
             # Delete old experiences and educations
@@ -63,11 +128,15 @@ class DatabaseService:
                 summary=candidate_data.summary,
                 total_experience_years=candidate_data.total_experience_years,
                 resume_text=resume_text,
-                resume_filename=screening_result.resume_filename
+                resume_filename=resume_filename,
+                resume_sha256=resume_sha256
             )
             db.add(candidate)
             db.flush()  # Get candidate ID
         
+        if minhash_signature is not None:
+            DatabaseService._store_minhash(db, candidate, minhash_signature)
+        
         # Add experiences
         for exp_data in candidate_data.experience:
             experience = Experience(
@@ -91,24 +160,104 @@ class DatabaseService:
             )
             db.add(education)
         
-        # Add screening record
-        screening_record = ScreeningRecord(
-            candidate_id=candidate.id,
-            job_description=screening_result.job_description,
-            job_title=DatabaseService._extract_job_title(screening_result.job_description),
-            match_score=match_data.score,
-            justification=match_data.justification,
-            strengths=match_data.strengths,
-            concerns=match_data.concerns,
-            recommended_action=match_data.recommended_action
-        )
-        db.add(screening_record)
+        # Add screening records
+        screening_records = [
+            ScreeningRecord(
+                candidate_id=candidate.id,
+                job_description=job_description,
+                job_title=DatabaseService._extract_job_title(job_description),
+                job_hash=analytics.job_hash(job_description),
+                match_score=match_data.score,
+                justification=match_data.justification,
+                strengths=match_data.strengths,
+                concerns=match_data.concerns,
+                recommended_action=match_data.recommended_action
+            ) for job_description, match_data in matches
+        ]
+        db.add_all(screening_records)
         
+        db.flush()
+        search.add(db, candidate.id)
+        analytics.record(db, screening_records)
+        events.record(db, [
+            events.event("candidate", "update" if existing_candidate else "insert", candidate.id, {"name": candidate.name, "email": candidate.email}),
+            *(events.event("screening", "insert", record.id, serializers.screening_summary(record)) for record in screening_records)
+        ])
         db.commit()
+        cache.bump_data_version()
         db.refresh(candidate)
         
         return candidate.id
     
+    @staticmethod
+    def _store_minhash(db: Session, candidate: Candidate, signature) -> None:
+        """Store a candidate's MinHash signature and replace its LSH band rows"""
+        candidate.minhash_signature = near_duplicate.signature_to_bytes(signature)
+        db.query(ResumeLSHBand).filter(ResumeLSHBand.candidate_id == candidate.id).delete()
+        db.add_all([
+            ResumeLSHBand(candidate_id=candidate.id, band=band, bucket=bucket)
+            for band, bucket in enumerate(near_duplicate.band_buckets(signature))
+        ])
+    
+    @staticmethod
+    def get_candidate_by_resume_hash(db: Session, resume_sha256: str) -> Optional[Candidate]:
+        """Most recently updated candidate whose uploaded PDF had this SHA-256"""
+        return db.query(Candidate).options(
+            undefer(Candidate.resume_text),
+            selectinload(Candidate.experiences),
+            selectinload(Candidate.educations)
+        ).filter(
+            Candidate.resume_sha256 == resume_sha256
+        ).order_by(Candidate.updated_at.desc()).first()
+    
+    @staticmethod
+    def get_screening_for_job(db: Session, candidate_id: int, job_description: str) -> Optional[ScreeningRecord]:
+        """Latest screening of a candidate against exactly this job description"""
+        # job_description is stored compressed, so narrow by title in SQL and compare text here
+        records = db.query(ScreeningRecord).options(undefer(ScreeningRecord.job_description)).filter(
+            ScreeningRecord.candidate_id == candidate_id,
+            ScreeningRecord.job_title == DatabaseService._extract_job_title(job_description)
+        ).order_by(ScreeningRecord.screened_at.desc())
+        return next((r for r in records if r.job_description == job_description), None)
+    
+    @staticmethod
+    def match_score_from_record(record: ScreeningRecord) -> MatchScore:
+        return MatchScore(
+            score=record.match_score,
+            justification=record.justification or "",
+            strengths=record.strengths or [],
+            concerns=record.concerns or [],
+            recommended_action=record.recommended_action
+        )
+    
+    @staticmethod
+    def find_near_duplicate(db: Session, signature, threshold: float, max_candidates: int = 50) -> Optional[Tuple[Candidate, float]]:
+        """
+        Most similar stored resume at or above ``threshold`` (estimated Jaccard)
+        
+        LSH band buckets narrow the search to resumes sharing at least one band,
+        then their full signatures are compared.
+        """
+        # One (band AND bucket) term per band rather than a row-value IN: SQLite
+        # answers the OR with an index lookup per term, but scans the table for IN
+        candidate_ids = [row.candidate_id for row in db.query(ResumeLSHBand.candidate_id).filter(or_(*(
+            and_(ResumeLSHBand.band == band, ResumeLSHBand.bucket == bucket)
+            for band, bucket in enumerate(near_duplicate.band_buckets(signature))
+        ))).distinct().limit(max_candidates).all()]
+        if not candidate_ids:
+            return None
+        
+        best = None
+        for candidate_id, stored in db.query(Candidate.id, Candidate.minhash_signature).filter(
+            Candidate.id.in_(candidate_ids), Candidate.minhash_signature.isnot(None)
+        ).all():
+            score = near_duplicate.similarity(signature, near_duplicate.signature_from_bytes(stored))
+            if score >= threshold and (best is None or score > best[1]):
+                best = (candidate_id, score)
+        if best is None:
+            return None
+        return DatabaseService.get_candidate_by_id(db, best[0]), best[1]
+    
     @staticmethod
     def _extract_job_title(job_description: str) -> str:
         """Extract job title from job description (first line usually)"""
@@ -118,12 +267,138 @@ class DatabaseService:
     @staticmethod
     def get_all_candidates(db: Session, skip: int = 0, limit: int = 100) -> List[Candidate]:
         """Get all candidates with pagination"""
-        return db.query(Candidate).offset(skip).limit(limit).all()
+        return db.query(Candidate).options(
+            defer(Candidate.resume_text), defer(Candidate.summary)
+        ).offset(skip).limit(limit).all()
     
     @staticmethod
     def get_candidate_by_id(db: Session, candidate_id: int) -> Optional[Candidate]:
         """Get candidate by ID with all related data"""
-        return db.query(Candidate).filter(Candidate.id == candidate_id).first()
+        return db.query(Candidate).options(
+            selectinload(Candidate.experiences),
+            selectinload(Candidate.educations)
+        ).filter(Candidate.id == candidate_id).first()
+    
+    @staticmethod
+    def candidate_profile(candidate: Candidate) -> CandidateProfile:
+        """Rebuild the extracted CandidateProfile from stored rows (no LLM call)"""
+        return CandidateProfile(
+            name=candidate.name,
+            email=candidate.email,
+            phone=candidate.phone,
+            location=candidate.location,
+            skills=candidate.skills or [],
+            experience=[
+                ExperienceSchema(
+                    role=e.role or "",
+                    company=e.company or "",
+                    duration=e.duration,
+                    years=e.years,
+                    responsibilities=e.responsibilities or []
+                ) for e in candidate.experiences
+            ],
+            education=[
+                EducationSchema(
+                    degree=e.degree or "",
+                    institution=e.institution or "",
+                    year=e.year,
+                    gpa=e.gpa
+                ) for e in candidate.educations
+            ],
+            total_experience_years=candidate.total_experience_years,
+            certifications=candidate.certifications or [],
+            summary=candidate.summary
+        )
+    
+    @staticmethod
+    def find_candidate_ids(
+        db: Session,
+        candidate_ids: Optional[List[int]] = None,
+        skill: Optional[str] = None,
+        min_experience_years: Optional[float] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[int]:
+        """Candidate IDs matching a filter, in ID order"""
+        query = db.query(Candidate.id)
+        if candidate_ids:
+            query = query.filter(Candidate.id.in_(candidate_ids))
+        if skill:
+            query = query.filter(DatabaseService._skill_filter(skill))
+        if min_experience_years is not None:
+            query = query.filter(Candidate.total_experience_years >= min_experience_years)
+        if created_after is not None:
+            query = query.filter(Candidate.created_at >= created_after)
+        if created_before is not None:
+            query = query.filter(Candidate.created_at < created_before)
+        query = query.order_by(Candidate.id)
+        if limit:
+            query = query.limit(limit)
+        return [row.id for row in query.all()]
+    
+    @staticmethod
+    def get_candidates_for_rescreen(db: Session, candidate_ids: List[int]) -> List[Candidate]:
+        """Load candidates (with resume text) and experiences/educations in three queries"""
+        return db.query(Candidate).options(
+            undefer(Candidate.resume_text),
+            selectinload(Candidate.experiences),
+            selectinload(Candidate.educations)
+        ).filter(Candidate.id.in_(candidate_ids)).order_by(Candidate.id).all()
+    
+    @staticmethod
+    def save_rescreen_results(db: Session, job_description: str, results: List[Tuple[int, MatchScore]]) -> int:
+        """
+        Insert one ScreeningRecord per (candidate_id, MatchScore) in a single transaction
+        
+        Results for candidates deleted meanwhile are dropped.
+        
+        Returns:
+            int: Number of records written
+        """
+        if not results:
+            return 0
+        with stage_timer("db_save"):
+            try:
+                written = DatabaseService._save_rescreen_results(db, job_description, results)
+            except IntegrityError:
+                # A candidate was deleted between our lookup and insert: retry, which drops it
+                db.rollback()
+                written = DatabaseService._save_rescreen_results(db, job_description, results)
+        cache.bump_data_version()
+        return written
+    
+    @staticmethod
+    def _save_rescreen_results(db: Session, job_description: str, results: List[Tuple[int, MatchScore]]) -> int:
+        # Names for the screening events: one query, and held here so record.candidate finds them in the identity map
+        candidates = db.query(Candidate).options(load_only(Candidate.name, Candidate.email)).filter(
+            Candidate.id.in_({candidate_id for candidate_id, _ in results})
+        ).all()
+        existing = {candidate.id for candidate in candidates}
+        results = [(candidate_id, match) for candidate_id, match in results if candidate_id in existing]
+        if not results:
+            return 0
+        job_title = DatabaseService._extract_job_title(job_description)
+        job_hash = analytics.job_hash(job_description)
+        records = [
+            ScreeningRecord(
+                candidate_id=candidate_id,
+                job_description=job_description,
+                job_title=job_title,
+                job_hash=job_hash,
+                match_score=match.score,
+                justification=match.justification,
+                strengths=match.strengths,
+                concerns=match.concerns,
+                recommended_action=match.recommended_action
+            ) for candidate_id, match in results
+        ]
+        db.add_all(records)
+        db.flush()
+        analytics.record(db, records)
+        events.record(db, [events.event("screening", "insert", record.id, serializers.screening_summary(record)) for record in records])
+        db.commit()
+        return len(records)
     
     @staticmethod
     def get_candidate_by_email(db: Session, email: str) -> Optional[Candidate]:
@@ -148,7 +423,11 @@ class DatabaseService:
             min_score: Minimum match score filter
             recommended_action: Filter by action (Shortlist/Maybe/Reject)
         """
-        query = db.query(ScreeningRecord)
+        # List pages need only the candidate's name/email and never the job description
+        query = db.query(ScreeningRecord).options(
+            joinedload(ScreeningRecord.candidate).load_only(Candidate.name, Candidate.email),
+            defer(ScreeningRecord.job_description)
+        )
         
         if min_score is not None:
             query = query.filter(ScreeningRecord.match_score >= min_score)
@@ -165,12 +444,47 @@ class DatabaseService:
             ScreeningRecord.candidate_id == candidate_id
         ).order_by(ScreeningRecord.screened_at.desc()).all()
     
+    @staticmethod
+    def search_resumes(db: Session, query: str, limit: int = 20, offset: int = 0) -> Tuple[int, bool, List[Tuple[Candidate, float, str]]]:
+        """
+        Full-text search over resumes (see backend/search.py for query syntax)
+        
+        Returns:
+            (total matches, ranked, [(Candidate, score, snippet), ...]) best match
+            first, or newest first when the query is too broad to rank
+        
+        Raises:
+            ValueError: If the query has no searchable terms
+        """
+        total, ranked, hits = search.search(db, query, limit, offset)
+        if not hits:
+            return total, ranked, []
+        candidates = {c.id: c for c in db.query(Candidate).options(
+            load_only(Candidate.id, Candidate.name, Candidate.email, Candidate.location,
+                      Candidate.skills, Candidate.total_experience_years)
+        ).filter(Candidate.id.in_([candidate_id for candidate_id, _, _ in hits])).all()}
+        return total, ranked, [(candidates[cid], score, snippet) for cid, score, snippet in hits if cid in candidates]
+    
+    @staticmethod
+    def _skill_filter(skill: str):
+        """
+        Skills-list filter: a taxonomy skill matches its canonical name or any
+        alias as a whole list element ("postgres" finds "PostgreSQL", "Go" does
+        not find "Django"); unknown names keep substring matching
+        """
+        canonical = skill_taxonomy.matcher().canonical(skill)
+        if canonical is None:
+            return Candidate.skills.contains(skill)
+        return or_(*[
+            Candidate.skills.contains(f'"{form}"', autoescape=True) for form in skill_taxonomy.matcher().forms(canonical)
+        ])
+    
     @staticmethod
     def search_candidates_by_skill(db: Session, skill: str) -> List[Candidate]:
         """Search candidates who have a specific skill"""
         # SQLite JSON search (for PostgreSQL, use different syntax)
         return db.query(Candidate).filter(
-            Candidate.skills.contains(skill)
+            DatabaseService._skill_filter(skill)
         ).all()
     
     @staticmethod
@@ -180,12 +494,10 @@ class DatabaseService:
         
         Returns list of (Candidate, ScreeningRecord) tuples
         """
-        from sqlalchemy import and_
-        
         # Subquery to get latest screening for each candidate
         subquery = db.query(
             ScreeningRecord.candidate_id,
-            ScreeningRecord.id.label('latest_screening_id')
+            func.max(ScreeningRecord.id).label('latest_screening_id')
         ).filter(
             ScreeningRecord.recommended_action == 'Shortlist'
         ).group_by(
@@ -207,7 +519,11 @@ class DatabaseService:
     
     @staticmethod
     def get_database_stats(db: Session) -> dict:
-        """Get database statistics"""
+        """Get database statistics (cached until the next write)"""
+        version = cache.data_version()
+        stats = cache.get_json("stats", "database", version)
+        if stats is not None:
+            return stats
         total_candidates = db.query(Candidate).count()
         total_screenings = db.query(ScreeningRecord).count()
         shortlisted = db.query(ScreeningRecord).filter(
@@ -220,13 +536,99 @@ class DatabaseService:
             ScreeningRecord.recommended_action == 'Reject'
         ).count()
         
-        return {
+        stats = {
             "total_candidates": total_candidates,
             "total_screenings": total_screenings,
             "shortlisted": shortlisted,
             "maybe": maybe,
             "rejected": rejected
         }
+        cache.set_json("stats", "database", stats, version)
+        return stats
+    
+    # Columns streamed by the export endpoints (large text columns are left out)
+    CANDIDATE_EXPORT_COLUMNS = [
+        Candidate.id, Candidate.name, Candidate.email, Candidate.phone, Candidate.location,
+        Candidate.skills, Candidate.certifications, Candidate.total_experience_years,
+        Candidate.resume_filename, Candidate.created_at, Candidate.updated_at
+    ]
+    SCREENING_EXPORT_COLUMNS = [
+        ScreeningRecord.id, ScreeningRecord.candidate_id,
+        Candidate.name.label("candidate_name"), Candidate.email.label("candidate_email"),
+        ScreeningRecord.job_title, ScreeningRecord.match_score, ScreeningRecord.recommended_action,
+        ScreeningRecord.justification, ScreeningRecord.strengths, ScreeningRecord.concerns,
+        ScreeningRecord.screened_at
+    ]
+    
+    @staticmethod
+    def _screening_filters(
+        start: Optional[datetime],
+        end: Optional[datetime],
+        min_score: Optional[float],
+        recommended_action: Optional[str]
+    ) -> list:
+        conditions = []
+        if start is not None:
+            conditions.append(ScreeningRecord.screened_at >= start)
+        if end is not None:
+            conditions.append(ScreeningRecord.screened_at < end)
+        if min_score is not None:
+            conditions.append(ScreeningRecord.match_score >= min_score)
+        if recommended_action:
+            conditions.append(ScreeningRecord.recommended_action == recommended_action)
+        return conditions
+    
+    @staticmethod
+    def iter_screenings_export(
+        db: Session,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        min_score: Optional[float] = None,
+        recommended_action: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> Iterator[dict]:
+        """
+        Stream screening rows (joined with candidate name/email) for export
+        
+        Rows are fetched from a server-side cursor ``batch_size`` at a time, so
+        memory stays flat regardless of how many rows match.
+        """
+        stmt = select(*DatabaseService.SCREENING_EXPORT_COLUMNS).join(
+            Candidate, Candidate.id == ScreeningRecord.candidate_id
+        ).where(
+            *DatabaseService._screening_filters(start, end, min_score, recommended_action)
+        ).order_by(ScreeningRecord.id).execution_options(yield_per=batch_size)
+        
+        for row in db.execute(stmt):
+            yield row._asdict()
+    
+    @staticmethod
+    def iter_candidates_export(
+        db: Session,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        min_score: Optional[float] = None,
+        recommended_action: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> Iterator[dict]:
+        """
+        Stream candidate rows for export
+        
+        The date range applies to ``created_at``; score/action filters keep
+        candidates with at least one matching screening.
+        """
+        stmt = select(*DatabaseService.CANDIDATE_EXPORT_COLUMNS)
+        if start is not None:
+            stmt = stmt.where(Candidate.created_at >= start)
+        if end is not None:
+            stmt = stmt.where(Candidate.created_at < end)
+        screening_conditions = DatabaseService._screening_filters(None, None, min_score, recommended_action)
+        if screening_conditions:
+            stmt = stmt.where(exists().where(ScreeningRecord.candidate_id == Candidate.id, *screening_conditions))
+        stmt = stmt.order_by(Candidate.id).execution_options(yield_per=batch_size)
+        
+        for row in db.execute(stmt):
+            yield row._asdict()
     
     @staticmethod
     def delete_candidate(db: Session, candidate_id: int) -> dict:
@@ -234,35 +636,98 @@ class DatabaseService:
         Delete a candidate and all related records (cascade delete)
         Returns dict with deletion summary
         """
-        # Get the candidate first
-        candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+        candidate = db.query(Candidate.name).filter(Candidate.id == candidate_id).first()
         if not candidate:
             return {"success": False, "message": "Candidate not found"}
         
-        candidate_name = candidate.name
-        
-        # Count related records before deletion
-        experiences_count = db.query(Experience).filter(Experience.candidate_id == candidate_id).count()
-        educations_count = db.query(Education).filter(Education.candidate_id == candidate_id).count()
-        screenings_count = db.query(ScreeningRecord).filter(ScreeningRecord.candidate_id == candidate_id).count()
-        
-        # Delete related records (SQLAlchemy will handle this if cascade is set, but explicit is better)
-        db.query(Experience).filter(Experience.candidate_id == candidate_id).delete()
-        db.query(Education).filter(Education.candidate_id == candidate_id).delete()
-        db.query(ScreeningRecord).filter(ScreeningRecord.candidate_id == candidate_id).delete()
-        
-        # Delete the candidate
-        db.delete(candidate)
-        db.commit()
-        
+        deleted = DatabaseService.delete_candidates(db, [candidate_id])
         return {
             "success": True,
-            "message": f"Successfully deleted {candidate_name}",
+            "message": f"Successfully deleted {candidate.name}",
             "deleted": {
-                "candidate": candidate_name,
-                "experiences": experiences_count,
-                "educations": educations_count,
-                "screenings": screenings_count
+                "candidate": candidate.name,
+                "experiences": deleted["experiences"],
+                "educations": deleted["educations"],
+                "screenings": deleted["screenings"]
             }
         }
-
+    
+    @staticmethod
+    def delete_candidates(db: Session, candidate_ids: List[int], batch_size: int = 500) -> dict:
+        """
+        Delete candidates with their experiences, educations, screenings and LSH bands
+        
+        Set-based and ``batch_size`` candidates per transaction, so concurrent
+        writers wait for one short batch at most. Child rows go by ON DELETE
+        CASCADE; full-text entries and analytics rollups are taken out first,
+        and a change event is recorded for each candidate and screening.
+        
+        Returns:
+            dict: Deleted row counts per table
+        """
+        deleted = dict.fromkeys(("candidates", "experiences", "educations", "screenings"), 0)
+        try:
+            for start in range(0, len(candidate_ids), max(1, batch_size)):
+                batch = candidate_ids[start:start + max(1, batch_size)]
+                with stage_timer("db_delete"):
+                    search.remove_many(db, batch)  # while the rows still hold the indexed values
+                    counts = db.execute(select(
+                        select(func.count()).where(Experience.candidate_id.in_(batch)).scalar_subquery(),
+                        select(func.count()).where(Education.candidate_id.in_(batch)).scalar_subquery(),
+                        select(func.count()).where(ScreeningRecord.candidate_id.in_(batch)).scalar_subquery()
+                    )).one()
+                    screenings = db.execute(
+                        select(*_DELETED_SCREENING_COLUMNS).where(ScreeningRecord.candidate_id.in_(batch))
+                    ).all()
+                    analytics.unrecord(db, screenings)
+                    existing = db.execute(select(Candidate.id).where(Candidate.id.in_(batch))).scalars().all()
+                    events.record(db, [_screening_deleted(row) for row in screenings] + [
+                        events.event("candidate", "delete", candidate_id) for candidate_id in existing
+                    ])
+                    removed = db.execute(
+                        delete(Candidate).where(Candidate.id.in_(batch)).execution_options(synchronize_session=False)
+                    ).rowcount
+                    db.commit()
+                deleted["candidates"] += removed
+                if removed:
+                    deleted["experiences"] += counts[0]
+                    deleted["educations"] += counts[1]
+                    deleted["screenings"] += counts[2]
+        finally:
+            if deleted["candidates"]:
+                cache.bump_data_version()
+        return deleted
+    
+    @staticmethod
+    def delete_screenings_before(db: Session, before: datetime, batch_size: int = 500) -> int:
+        """Delete screenings older than ``before`` (oldest first, ``batch_size`` per transaction); returns how many"""
+        deleted = 0
+        try:
+            while True:
+                with stage_timer("db_delete"):
+                    ids = db.execute(
+                        select(ScreeningRecord.id).where(ScreeningRecord.screened_at < before)
+                        .order_by(ScreeningRecord.screened_at).limit(max(1, batch_size))
+                    ).scalars().all()
+                    if not ids:
+                        return deleted
+                    screenings = db.execute(select(*_DELETED_SCREENING_COLUMNS).where(ScreeningRecord.id.in_(ids))).all()
+                    analytics.unrecord(db, screenings)
+                    events.record(db, map(_screening_deleted, screenings))
+                    deleted += db.execute(
+                        delete(ScreeningRecord).where(ScreeningRecord.id.in_(ids)).execution_options(synchronize_session=False)
+                    ).rowcount
+                    db.commit()
+        finally:
+            if deleted:
+                cache.bump_data_version()
+    
+    @staticmethod
+    def find_unscreened_candidate_ids(db: Session, created_before: datetime) -> List[int]:
+        """Candidates added before ``created_before`` that have no screening left, in ID order"""
+        return db.execute(
+            select(Candidate.id).where(
+                Candidate.created_at < created_before,
+                ~exists().where(ScreeningRecord.candidate_id == Candidate.id)
+            ).order_by(Candidate.id)
+        ).scalars().all()
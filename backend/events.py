@@ -0,0 +1,86 @@
+"""
+Change feed: what the DatabaseService write paths changed, in commit order
+
+Every write appends compact events to ``change_events`` in the same
+transaction as the rows they describe, like the full-text index and the
+analytics rollups, so an event is visible exactly when its change is. The
+primary key is the event's sequence number; clients resume from it
+(/api/events, services/change_feed.py). Payloads:
+
+    candidate insert / update   {"name", "email"}
+    candidate delete            {}  (its screenings get their own delete events first)
+    screening insert            the /api/screenings row (serializers.screening_summary)
+    screening delete            {"candidate_id", "recommended_action"}
+
+which is enough to keep the dashboard's counters and screening list current
+without reloading them.
+
+Sequence numbers are taken at insert, not at commit. SQLite runs one writer at
+a time, so they also commit in order; on PostgreSQL a later number can commit
+first, so ``since()`` stops at a gap until it is GAP_WAIT_SECONDS old (a
+rolled-back write leaves a gap for good). Events older than
+EVENTS_RETENTION_HOURS are pruned, except the newest, so the head survives.
+"""
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+import orjson
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.models import ChangeEvent
+
+GAP_WAIT_SECONDS = 2.0
+PRUNE_EVERY = 1000  # record() calls per process between prunes
+
+_COLUMNS = (ChangeEvent.seq, ChangeEvent.entity, ChangeEvent.op, ChangeEvent.entity_id, ChangeEvent.data, ChangeEvent.created_at)
+_recorded = 0
+
+
+def event(entity: str, op: str, entity_id: int, data: Optional[dict] = None) -> dict:
+    """One change_events row; ``data`` is encoded here, once, and sent to clients verbatim"""
+    return {"entity": entity, "op": op, "entity_id": entity_id, "data": orjson.dumps(data or {}).decode()}
+
+
+def record(db: Session, changes: Iterable[dict]) -> None:
+    """Append events (from ``event()``) to the caller's transaction"""
+    global _recorded
+    changes = list(changes)
+    if not changes:
+        return
+    db.execute(insert(ChangeEvent), changes)
+    _recorded += 1
+    if _recorded % PRUNE_EVERY == 0:
+        prune(db, datetime.utcnow() - timedelta(hours=settings.EVENTS_RETENTION_HOURS))
+
+
+def since(db: Session, after: int, limit: int = 500) -> List:
+    """Events after sequence number ``after``, oldest first (up to a recent gap; see the module docstring)"""
+    rows = db.execute(select(*_COLUMNS).where(ChangeEvent.seq > after).order_by(ChangeEvent.seq).limit(limit)).all()
+    settled = datetime.utcnow() - timedelta(seconds=GAP_WAIT_SECONDS)
+    expected = after + 1
+    for index, row in enumerate(rows):
+        if row.seq != expected and row.created_at > settled:
+            return rows[:index]
+        expected = row.seq + 1
+    return rows
+
+
+def head(db: Session) -> int:
+    """Sequence number of the latest event (0 before the first)"""
+    return db.execute(select(func.max(ChangeEvent.seq))).scalar() or 0
+
+
+def oldest(db: Session) -> Optional[int]:
+    """Sequence number of the oldest event still kept"""
+    return db.execute(select(func.min(ChangeEvent.seq))).scalar()
+
+
+def prune(db: Session, before: datetime) -> int:
+    """Delete events created before ``before``, keeping the latest; returns how many"""
+    latest = select(func.max(ChangeEvent.seq)).scalar_subquery()
+    return db.execute(
+        delete(ChangeEvent).where(ChangeEvent.created_at < before, ChangeEvent.seq < latest)
+        .execution_options(synchronize_session=False)
+    ).rowcount
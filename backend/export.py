@@ -0,0 +1,170 @@
+"""
+Streaming bulk export of candidates and screenings
+
+Each export opens its own session and walks a server-side cursor, encoding
+rows into NDJSON, CSV or Parquet chunks as it goes. Nothing is accumulated
+beyond one batch, so a million-row export uses the same memory as a small one.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterable, Iterator, List
+
+from backend.database import SessionLocal
+from backend.db_service import DatabaseService
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+ENTITIES = {
+    "candidates": DatabaseService.iter_candidates_export,
+    "screenings": DatabaseService.iter_screenings_export,
+}
+
+# Column order (CSV header / Parquet schema) per entity
+COLUMNS = {
+    "candidates": [c.key for c in DatabaseService.CANDIDATE_EXPORT_COLUMNS],
+    "screenings": [c.key for c in DatabaseService.SCREENING_EXPORT_COLUMNS],
+}
+
+LIST_COLUMNS = {"skills", "certifications", "strengths", "concerns"}
+INTEGER_COLUMNS = {"id", "candidate_id"}
+FLOAT_COLUMNS = {"match_score", "total_experience_years"}
+DATETIME_COLUMNS = {"created_at", "updated_at", "screened_at"}
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _rows(entity: str, filters: dict) -> Iterator[dict]:
+    """Yield export rows from a dedicated session (closed when the stream ends)"""
+    db = SessionLocal()
+    try:
+        yield from ENTITIES[entity](db, batch_size=EXPORT_BATCH_SIZE, **filters)
+    finally:
+        db.close()
+
+
+def _batched(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ndjson_stream(rows: Iterable[dict]) -> Iterator[bytes]:
+    for batch in _batched(rows, EXPORT_BATCH_SIZE):
+        yield "".join(json.dumps(row, default=_json_default) + "\n" for row in batch).encode("utf-8")
+
+
+def csv_stream(rows: Iterable[dict], columns: List[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in _batched(rows, EXPORT_BATCH_SIZE):
+        for row in batch:
+            writer.writerow([
+                "; ".join(row[col] or []) if col in LIST_COLUMNS
+                else row[col].isoformat() if isinstance(row[col], datetime)
+                else row[col]
+                for col in columns
+            ])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the stream"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _parquet_schema(columns: List[str]):
+    import pyarrow as pa
+
+    def column_type(col):
+        if col in LIST_COLUMNS:
+            return pa.list_(pa.string())
+        if col in INTEGER_COLUMNS:
+            return pa.int64()
+        if col in FLOAT_COLUMNS:
+            return pa.float64()
+        if col in DATETIME_COLUMNS:
+            return pa.timestamp("us")
+        return pa.string()
+
+    return pa.schema([(col, column_type(col)) for col in columns])
+
+
+def parquet_stream(rows: Iterable[dict], columns: List[str]) -> Iterator[bytes]:
+    """One Parquet row group per batch, flushed to the client as it is written"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema(columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for batch in _batched(rows, EXPORT_BATCH_SIZE):
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_stream(entity: str, fmt: str, filters: dict) -> Iterator[bytes]:
+    """Byte stream for ``entity`` in ``fmt``; the caller validates both"""
+    rows = _rows(entity, filters)
+    if fmt == "ndjson":
+        return ndjson_stream(rows)
+    if fmt == "csv":
+        return csv_stream(rows, COLUMNS[entity])
+    return parquet_stream(rows, COLUMNS[entity])
+
+
+def export_filename(entity: str, fmt: str) -> str:
+    return f"{entity}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{EXPORT_FORMATS[fmt][1]}"
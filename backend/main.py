@@ -1,25 +1,60 @@
 ﻿from fastapi import FastAPI, UploadFile, File, Form, Request, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
 from starlette.middleware.sessions import SessionMiddleware
 from dotenv import load_dotenv
-import PyPDF2, io, logging
-from typing import Optional
+import logging, asyncio, time, orjson, hashlib
+from typing import List, Optional
+from datetime import datetime
 from services.resume_extractor import ResumeExtractor
-from backend.database import get_db, init_db
+from services import rescreen_service, retention_service, change_feed, near_duplicate, local_extractor, singleflight, resume_extractor, llm_backend, pdf_text
+from backend.database import SessionLocal, get_db, init_db
 from backend.db_service import DatabaseService
 from backend.config import settings
+from backend import metrics, profiling, export, serializers, cache, search, analytics, admission, events
+from backend.serializers import FastJSONResponse
+from backend.schemas import RescreenRequest, BulkDeleteRequest, RetentionRequest, AnalyzeResponse, MultiAnalyzeResponse, JobMatch, DedupInfo, ScreeningResult, CandidateListResponse, CandidateDetail, ScreeningListResponse, ShortlistedResponse, StatsResponse, SearchResponse, AnalyticsResponse, AnalyticsJobsResponse
+from backend.logging_config import setup_logging, request_id, new_request_id
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', handlers=[logging.FileHandler('resume_screener.log'), logging.StreamHandler()])
+setup_logging()
 logger = logging.getLogger(__name__)
 
 load_dotenv()
-app = FastAPI(title="Smart Resume Screener", version="2.0")
+app = FastAPI(title="Smart Resume Screener", version="2.0", default_response_class=FastJSONResponse)
+screening_flights = singleflight.Group("analyze")  # identical uploads in flight, by (PDF hash, job hash)
 
 app.add_middleware(SessionMiddleware, secret_key=settings.SESSION_SECRET_KEY, session_cookie="resume_screener_session", max_age=86400, same_site="lax", https_only=False)
 app.add_middleware(CORSMiddleware, allow_origins=["http://localhost:5173", "http://localhost:5174", "http://localhost:5175", "http://127.0.0.1:5173"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
+@app.middleware("http")
+async def track_requests(request: Request, call_next):
+    rid = request.headers.get("x-request-id") or new_request_id()
+    rid_token = request_id.set(rid)
+    timings_token = metrics.stage_timings.set({})
+    started = time.perf_counter()
+    metrics.REQUESTS_IN_FLIGHT.inc()
+    trigger = profiling.should_profile(request)
+    profile = profiling.start(request, trigger) if trigger else None
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["X-Request-ID"] = rid
+        if profile:
+            response.headers["X-Profile-Id"] = profile[0].id
+        return response
+    finally:
+        metrics.REQUESTS_IN_FLIGHT.dec()
+        route = request.scope.get("route")
+        metrics.REQUESTS_TOTAL.labels(route.path if route else "unmatched", str(status)).inc()
+        logger.info(f"{request.method} {request.url.path} {status}", extra={"method": request.method, "path": request.url.path, "status": status, "duration_ms": round((time.perf_counter() - started) * 1000, 3), "stages": metrics.stage_timings.get() or None})
+        if profile:
+            profiling.stop(*profile, status)
+            await asyncio.to_thread(profiling.save, profile[0])
+        metrics.stage_timings.reset(timings_token)
+        request_id.reset(rid_token)
+
 def is_authenticated(request: Request) -> bool:
     return request.session.get("authenticated", False)
 
@@ -32,15 +67,56 @@ async def require_auth(request: Request):
 async def startup_event():
     try:
         init_db()
+        cache.bump_data_version()  # bulk loads and migrations write without bumping it
         logger.info("Database initialized")
     except Exception as e:
         logger.error(f"Database init failed: {e}")
         raise
+    try:  # open pooled LLM connections now, not on the first screenings
+        started = time.perf_counter()
+        opened = await asyncio.to_thread(llm_backend.warm_up, resume_extractor.model)
+        if opened:
+            logger.info(f"LLM connections warmed: {opened} in {(time.perf_counter() - started) * 1000:.0f} ms")
+    except Exception as e:
+        logger.warning(f"LLM warm-up failed: {e}")
+    if retention_service.start_scheduler():
+        logger.info(f"Retention purge every {settings.RETENTION_INTERVAL_HOURS:g} h: screenings older than {settings.RETENTION_DAYS} days")
 
 @app.get("/")
 def read_root():
     return {"message": "Smart Resume Screener API", "version": "2.0", "status": "running"}
 
+@app.get("/metrics")
+def get_metrics():
+    return Response(content=metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/api/debug/profiling")
+def get_profiling_state(_: bool = Depends(require_auth)):
+    return profiling.state.to_dict()
+
+@app.post("/api/debug/profiling")
+def set_profiling_state(enabled: bool = Form(...), sample_rate: Optional[float] = Form(None), _: bool = Depends(require_auth)):
+    if sample_rate is not None and not 0.0 <= sample_rate <= 1.0:
+        raise HTTPException(status_code=400, detail="sample_rate must be between 0 and 1")
+    profiling.state.enabled = enabled
+    if sample_rate is not None:
+        profiling.state.sample_rate = sample_rate
+    return profiling.state.to_dict()
+
+@app.get("/api/debug/profiles")
+def list_profiles(_: bool = Depends(require_auth)):
+    profiles = profiling.list_profiles()
+    return {"profiles": profiles, "count": len(profiles)}
+
+@app.get("/api/debug/profiles/{profile_id}")
+def get_profile(profile_id: str, format: str = "json", _: bool = Depends(require_auth)):
+    data = profiling.load(profile_id)
+    if not data:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "folded":
+        return PlainTextResponse(profiling.to_folded(data))
+    return data
+
 @app.post("/api/login")
 async def login(request: Request, username: str = Form(...), password: str = Form(...)):
     if username == settings.ADMIN_USERNAME and password == settings.ADMIN_PASSWORD:
@@ -59,58 +135,251 @@ def check_auth(request: Request):
     auth = is_authenticated(request)
     return JSONResponse(content={"authenticated": auth, "username": request.session.get("username") if auth else None})
 
-@app.post("/api/analyze/")
-async def analyze_resume(file: UploadFile = File(...), job_description: str = Form(...), db: Session = Depends(get_db)):
+@app.post("/api/analyze/", response_model=AnalyzeResponse)
+async def analyze_resume(request: Request, file: UploadFile = File(...), job_description: str = Form(...)):
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="PDF only")
     if len(job_description.strip()) < 10:
         raise HTTPException(status_code=400, detail="Job description too short")
     
-    contents = await file.read()
+    with metrics.stage_timer("upload_read"):
+        contents = await file.read()
+    if len(contents) > 10 * 1024 * 1024:
+        raise HTTPException(status_code=400, detail="File exceeds 10MB")
+    
+    # The same PDF for the same job already in flight (double click, two recruiters): share that
+    # run's result and single database write instead of parsing and calling the LLM again
+    sha = hashlib.sha256(contents).hexdigest()
+    lane = admission.lane_for(request.headers.get("x-priority"))
+    
+    async def screen():
+        # Only the run that does the work takes an admission slot; coalesced callers wait on it
+        async with admission.controller().slot(lane):
+            return await asyncio.to_thread(_screen_upload, contents, sha, file.filename, job_description)
+    
+    try:
+        data, coalesced = await screening_flights.do((sha, analytics.job_hash(job_description)), screen)
+    except admission.Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    if coalesced:
+        data = {**data, "resume_filename": file.filename, "dedup": {**data["dedup"], "coalesced": True}}
+    return FastJSONResponse(content=data)
+
+def _prepare_upload(db: Session, contents: bytes, sha: str) -> tuple:
+    """Text of an upload plus what dedup found: (text, local, known candidate, profile to reuse, MinHash signature, DedupInfo)"""
+    # Same PDF bytes, or (after parsing) a stored resume with this email and identical text:
+    # reuse stored text and profile, and screenings of jobs that were already scored
+    dedup, profile, signature, local = DedupInfo(), None, None, None
+    known = DatabaseService.get_candidate_by_resume_hash(db, sha)
+    (metrics.cache_hit if known and known.resume_text else metrics.cache_miss)("upload_hash")
+    if known and known.resume_text:
+        dedup.exact_match, text = True, known.resume_text
+    else:
+        known = None
+        with metrics.stage_timer("pdf_parse"):
+            text = pdf_text.extract(contents).text
+        if not text.strip():
+            raise HTTPException(status_code=400, detail="No text extracted")
+        with metrics.stage_timer("local_extract"):
+            local = local_extractor.extract(text)
+        by_email = DatabaseService.get_candidate_by_email(db, local.email) if local.email else None
+        if by_email:
+            dedup.email_match = by_email.id
+            if by_email.resume_text == text:
+                known = by_email
+    if known:
+        profile = DatabaseService.candidate_profile(known)
+    elif settings.NEAR_DUPLICATE_MODE != "off":
+        # Near-duplicate (re-exported or lightly edited PDF): MinHash + LSH lookup
+        with metrics.stage_timer("near_duplicate"):
+            signature = near_duplicate.signature(text)
+            match = DatabaseService.find_near_duplicate(db, signature, settings.NEAR_DUPLICATE_THRESHOLD)
+        (metrics.cache_hit if match else metrics.cache_miss)("near_duplicate")
+        if match:
+            dedup.near_duplicate_of, dedup.similarity = match[0].id, match[1]
+            if settings.NEAR_DUPLICATE_MODE == "reuse":
+                dedup.reused, profile = "extraction", DatabaseService.candidate_profile(match[0])
+    return text, local, known, profile, signature, dedup
+
+def _screen_upload(contents: bytes, sha: str, filename: str, job_description: str) -> dict:
+    """Dedup lookups, parse, LLM screening and save for one upload (worker thread, own session)"""
+    with profiling.follow_thread(), SessionLocal() as db:
+        text, local, known, profile, signature, dedup = _prepare_upload(db, contents, sha)
+        if known:
+            prior = DatabaseService.get_screening_for_job(db, known.id, job_description)
+            if prior:
+                dedup.reused = "screening"
+                result = ScreeningResult(candidate=profile, match_score=DatabaseService.match_score_from_record(prior), job_description=job_description, resume_filename=filename)
+                return {**result.model_dump(), "candidate_id": known.id, "dedup": dedup.model_dump()}
+            dedup.reused = "extraction"
+        
+        result = ResumeExtractor.screen_resume(text, job_description, filename, candidate=profile, local=local)
+        cand_id = DatabaseService.save_screening_result(db, result, text, resume_sha256=sha, minhash_signature=signature)
+        logger.info(f"Score: {result.match_score.score:.1f}/10")
+        
+        data = result.model_dump()
+        data['candidate_id'] = cand_id
+        data['dedup'] = dedup.model_dump()
+        return data
+
+@app.post("/api/analyze/multi", response_model=MultiAnalyzeResponse)
+async def analyze_resume_multi(request: Request, file: UploadFile = File(...), job_descriptions: List[str] = Form(...)):
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="PDF only")
+    if len(job_descriptions) > settings.MULTI_SCORE_MAX_JOBS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.MULTI_SCORE_MAX_JOBS} job descriptions")
+    if any(len(jd.strip()) < 10 for jd in job_descriptions):
+        raise HTTPException(status_code=400, detail="Job description too short")
+    
+    with metrics.stage_timer("upload_read"):
+        contents = await file.read()
     if len(contents) > 10 * 1024 * 1024:
         raise HTTPException(status_code=400, detail="File exceeds 10MB")
     
-    reader = PyPDF2.PdfReader(io.BytesIO(contents))
-    text = "".join([p.extract_text() for p in reader.pages if p.extract_text()])
-    if not text.strip():
-        raise HTTPException(status_code=400, detail="No text extracted")
+    sha = hashlib.sha256(contents).hexdigest()
+    lane = admission.lane_for(request.headers.get("x-priority"))
     
-    result = ResumeExtractor.screen_resume(text, job_description, file.filename)
-    cand_id = DatabaseService.save_screening_result(db, result, text)
-    logger.info(f"Score: {result.match_score.score:.1f}/10")
+    async def screen():
+        async with admission.controller().slot(lane):
+            return await asyncio.to_thread(_screen_upload_multi, contents, sha, file.filename, job_descriptions)
     
-    data = result.dict()
-    data['candidate_id'] = cand_id
-    # Convert datetime to ISO format string for JSON serialization
-    if 'screened_at' in data and data['screened_at']:
-        data['screened_at'] = data['screened_at'].isoformat()
-    return JSONResponse(content=data)
-
-@app.get("/api/candidates/")
+    try:
+        key = (sha, tuple(analytics.job_hash(jd) for jd in job_descriptions))
+        data, coalesced = await screening_flights.do(key, screen)
+    except admission.Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    if coalesced:
+        data = {**data, "resume_filename": file.filename, "dedup": {**data["dedup"], "coalesced": True}}
+    return FastJSONResponse(content=data)
+
+def _screen_upload_multi(contents: bytes, sha: str, filename: str, job_descriptions: List[str]) -> dict:
+    """One parse and extraction, packed scoring of every job not yet scored, and one write for all of them"""
+    with profiling.follow_thread(), SessionLocal() as db:
+        text, local, known, profile, signature, dedup = _prepare_upload(db, contents, sha)
+        scores = {}  # by job hash: (MatchScore, reused)
+        if known:
+            for jd in job_descriptions:
+                prior = DatabaseService.get_screening_for_job(db, known.id, jd)
+                if prior:
+                    scores[analytics.job_hash(jd)] = (DatabaseService.match_score_from_record(prior), True)
+            dedup.reused = "screening" if len(scores) == len({analytics.job_hash(jd) for jd in job_descriptions}) else "extraction"
+        
+        pending = list({analytics.job_hash(jd): jd for jd in job_descriptions if analytics.job_hash(jd) not in scores}.values())
+        cand_id = known.id if known else None
+        if pending:
+            if not text or len(text.strip()) < 50:
+                raise ValueError("Resume text is too short or empty")
+            if profile is None:
+                profile = ResumeExtractor.extract_candidate_data(text, local)
+            new_scores = ResumeExtractor.compute_match_scores(text, pending, profile)
+            scores.update((analytics.job_hash(jd), (score, False)) for jd, score in zip(pending, new_scores))
+            cand_id = DatabaseService.save_screening_results(db, profile, text, filename, list(zip(pending, new_scores)), resume_sha256=sha, minhash_signature=signature)
+            logger.info(f"Scored against {len(pending)} jobs: " + ", ".join(f"{score.score:.1f}" for score in new_scores))
+        
+        results = [JobMatch(job_description=jd, match_score=scores[analytics.job_hash(jd)][0], reused=scores[analytics.job_hash(jd)][1]) for jd in job_descriptions]
+        return MultiAnalyzeResponse(candidate=profile, candidate_id=cand_id, resume_filename=filename, results=results, dedup=dedup).model_dump()
+
+@app.get("/api/candidates/", response_model=CandidateListResponse)
 async def get_candidates(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), _: bool = Depends(require_auth)):
     candidates = DatabaseService.get_all_candidates(db, skip, limit)
-    return {"candidates": [{"id": c.id, "name": c.name, "email": c.email, "phone": c.phone, "location": c.location, "skills": c.skills, "total_experience_years": c.total_experience_years, "created_at": c.created_at.isoformat() if c.created_at else None} for c in candidates], "skip": skip, "limit": limit, "count": len(candidates)}
+    return FastJSONResponse({"candidates": serializers.serialize_all(serializers.candidate_summary, candidates), "skip": skip, "limit": limit, "count": len(candidates)})
 
-@app.get("/api/candidates/{candidate_id}")
+@app.get("/api/candidates/{candidate_id}", response_model=CandidateDetail)
 async def get_candidate(candidate_id: int, db: Session = Depends(get_db)):
     c = DatabaseService.get_candidate_by_id(db, candidate_id)
     if not c:
         raise HTTPException(status_code=404, detail="Not found")
-    return {"id": c.id, "name": c.name, "email": c.email, "phone": c.phone, "location": c.location, "skills": c.skills, "certifications": c.certifications, "summary": c.summary, "total_experience_years": c.total_experience_years, "resume_filename": c.resume_filename, "experiences": [{"role": e.role, "company": e.company, "duration": e.duration, "years": e.years, "responsibilities": e.responsibilities} for e in c.experiences], "educations": [{"degree": e.degree, "institution": e.institution, "year": e.year, "gpa": e.gpa} for e in c.educations], "created_at": c.created_at.isoformat() if c.created_at else None}
+    return FastJSONResponse(serializers.candidate_detail(c))
 
-@app.get("/api/screenings/")
+@app.get("/api/screenings/", response_model=ScreeningListResponse)
 async def get_screenings(skip: int = 0, limit: int = 100, min_score: Optional[int] = None, recommended_action: Optional[str] = None, db: Session = Depends(get_db), _: bool = Depends(require_auth)):
     screenings = DatabaseService.get_screening_records(db, skip, limit, min_score, recommended_action)
-    return {"screenings": [{"id": s.id, "candidate_id": s.candidate_id, "candidate_name": s.candidate.name, "candidate_email": s.candidate.email, "job_title": s.job_title, "match_score": s.match_score, "recommended_action": s.recommended_action, "justification": s.justification, "strengths": s.strengths, "concerns": s.concerns, "screened_at": s.screened_at.isoformat() if s.screened_at else None} for s in screenings], "skip": skip, "limit": limit, "count": len(screenings)}
+    return FastJSONResponse({"screenings": serializers.serialize_all(serializers.screening_summary, screenings), "skip": skip, "limit": limit, "count": len(screenings)})
 
-@app.get("/api/shortlisted/")
+@app.get("/api/search", response_model=SearchResponse)
+async def search_resumes(q: str, limit: int = 20, offset: int = 0, db: Session = Depends(get_db), _: bool = Depends(require_auth)):
+    if not search.available():
+        raise HTTPException(status_code=501, detail="Full-text search requires SQLite with FTS5")
+    limit, offset = max(1, min(limit, settings.MAX_PAGE_SIZE)), max(0, offset)
+    try:
+        total, ranked, hits = DatabaseService.search_resumes(db, q, limit, offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse({"query": q, "results": serializers.serialize_all(serializers.search_hit, hits), "total": total, "ranked": ranked, "limit": limit, "offset": offset})
+
+@app.get("/api/shortlisted/", response_model=ShortlistedResponse)
 async def get_shortlisted(limit: int = 50, db: Session = Depends(get_db)):
     results = DatabaseService.get_shortlisted_candidates(db, limit)
-    return {"shortlisted_candidates": [{"candidate_id": c.id, "name": c.name, "email": c.email, "skills": c.skills, "total_experience_years": c.total_experience_years, "match_score": s.match_score, "job_title": s.job_title, "strengths": s.strengths, "screened_at": s.screened_at.isoformat() if s.screened_at else None} for c, s in results], "count": len(results)}
+    return FastJSONResponse({"shortlisted_candidates": serializers.serialize_all(serializers.shortlisted_row, results), "count": len(results)})
 
-@app.get("/api/stats/")
+@app.get("/api/stats/", response_model=StatsResponse)
 async def get_stats(db: Session = Depends(get_db), _: bool = Depends(require_auth)):
-    return DatabaseService.get_database_stats(db)
+    return FastJSONResponse(DatabaseService.get_database_stats(db))
+
+@app.get("/api/analytics", response_model=AnalyticsResponse)
+async def get_analytics(job_hash: Optional[str] = None, job_title: Optional[str] = None, days: int = 30, db: Session = Depends(get_db), _: bool = Depends(require_auth)):
+    days = max(1, min(days, analytics.MAX_DAYS))
+    return FastJSONResponse(analytics.summary(db, job_hash, job_title, days))
+
+@app.get("/api/analytics/jobs", response_model=AnalyticsJobsResponse)
+async def get_analytics_jobs(days: int = 30, limit: int = 20, db: Session = Depends(get_db), _: bool = Depends(require_auth)):
+    days, limit = max(1, min(days, analytics.MAX_DAYS)), max(1, min(limit, settings.MAX_PAGE_SIZE))
+    return FastJSONResponse({"jobs": analytics.jobs(db, days, limit), "days": days})
+
+@app.get("/api/dashboard")
+async def get_dashboard(request: Request, limit: int = 100, db: Session = Depends(get_db), _: bool = Depends(require_auth)):
+    limit = max(1, min(limit, settings.MAX_PAGE_SIZE))
+    version = cache.data_version()
+    tag = cache.etag(version, limit)
+    headers = {"ETag": tag, "Cache-Control": "private, no-cache"}
+    if cache.etag_matches(request.headers.get("if-none-match"), tag):
+        return Response(status_code=304, headers=headers)
+    body = cache.get_snapshot(("dashboard", limit), version)
+    if body is None:
+        # seq: the change feed position this snapshot reflects (clients follow /api/events from it);
+        # read again after the data, and the data re-read if a write committed in between
+        for _ in range(3):
+            seq = events.head(db)
+            stats, screenings = DatabaseService.get_database_stats(db), DatabaseService.get_screening_records(db, 0, limit)
+            if events.head(db) == seq:
+                break
+        body = orjson.dumps({"version": version, "seq": seq, "stats": stats, "screenings": serializers.serialize_all(serializers.screening_summary, screenings)})
+        cache.put_snapshot(("dashboard", limit), version, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@app.get("/api/events")
+async def change_events(request: Request, after: Optional[int] = None, _: bool = Depends(require_auth)):
+    # EventSource resends the last id it saw on reconnect; that wins over the ?after= in its URL
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id:
+        if not last_event_id.isdigit():
+            raise HTTPException(status_code=400, detail="Last-Event-ID must be a sequence number")
+        after = int(last_event_id)
+    return StreamingResponse(change_feed.feed.stream(after), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.post("/api/jobs/rescreen", status_code=202)
+def rescreen_candidates(body: RescreenRequest, _: bool = Depends(require_auth)):
+    job = rescreen_service.start_rescreen(body)
+    return FastJSONResponse(status_code=202, content=job.to_dict())
+
+@app.get("/api/jobs/{job_id}")
+def get_job_status(job_id: str, _: bool = Depends(require_auth)):
+    status = rescreen_service.job_status(job_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return status
+
+@app.get("/api/export/{entity}")
+def export_data(entity: str, format: str = "ndjson", start: Optional[datetime] = None, end: Optional[datetime] = None, min_score: Optional[float] = None, recommended_action: Optional[str] = None, _: bool = Depends(require_auth)):
+    if entity not in export.ENTITIES:
+        raise HTTPException(status_code=404, detail=f"Unknown export '{entity}'")
+    if format not in export.EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(export.EXPORT_FORMATS)}")
+    if format == "parquet" and not export.parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+    filters = {"start": start, "end": end, "min_score": min_score, "recommended_action": recommended_action}
+    media_type = export.EXPORT_FORMATS[format][0]
+    return StreamingResponse(export.export_stream(entity, format, filters), media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{export.export_filename(entity, format)}"'})
 
 @app.delete("/api/candidates/{candidate_id}")
 async def delete_candidate(candidate_id: int, db: Session = Depends(get_db), _: bool = Depends(require_auth)):
@@ -118,3 +387,34 @@ async def delete_candidate(candidate_id: int, db: Session = Depends(get_db), _:
     if not result["success"]:
         raise HTTPException(status_code=404, detail=result["message"])
     return result
+
+@app.post("/api/candidates/bulk-delete")
+async def bulk_delete_candidates(body: BulkDeleteRequest, _: bool = Depends(require_auth)):
+    if body.candidate_ids == []:
+        raise HTTPException(status_code=400, detail="candidate_ids is empty")
+    # An empty filter would match every candidate (find_candidate_ids ignores empty values)
+    criteria = {k: v for k, v in body.model_dump(exclude={"dry_run", "limit"}).items() if v not in (None, "")}
+    if not criteria:
+        raise HTTPException(status_code=400, detail="Give candidate_ids or at least one filter")
+    
+    def run() -> dict:
+        with SessionLocal() as db:
+            ids = DatabaseService.find_candidate_ids(db, **criteria, limit=body.limit)
+            if body.dry_run:
+                return {"matched": len(ids), "dry_run": True}
+            return {"matched": len(ids), "deleted": DatabaseService.delete_candidates(db, ids, settings.DELETE_BATCH_SIZE)}
+    return await asyncio.to_thread(run)
+
+@app.get("/api/maintenance/retention")
+def get_retention(_: bool = Depends(require_auth)):
+    return FastJSONResponse({"days": settings.RETENTION_DAYS, "interval_hours": settings.RETENTION_INTERVAL_HOURS, "vacuum": settings.RETENTION_VACUUM, "last": retention_service.last_report()})
+
+@app.post("/api/maintenance/retention")
+async def run_retention(body: RetentionRequest, _: bool = Depends(require_auth)):
+    try:
+        report = await asyncio.to_thread(retention_service.purge, body.days, body.vacuum)
+    except retention_service.PurgeRunning as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(report)
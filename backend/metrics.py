@@ -0,0 +1,363 @@
+"""
+Lightweight in-process metrics with Prometheus text exposition
+
+Counters, gauges and histograms are plain Python objects guarded by a lock, so
+recording a sample costs a dict lookup and a couple of additions. Label
+children are created once and cached, which keeps the hot path allocation-free.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from backend.profiling import current_profile
+
+# Per-request stage timings (ms), set by the request middleware
+stage_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("stage_timings", default=None)
+
+# Latency buckets (seconds): PDF parsing sits in the low milliseconds, LLM calls in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    """Base class: a named metric family with optional label children"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def labels(self, *values: str):
+        """Get (or create) the child for a label combination"""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """A fresh child (per label combination) holding this metric's value"""
+
+    def _default(self):
+        return self.labels()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(child.render(self.name, self.labelnames, values))
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def render(self, name, labelnames, values):
+        return [f"{name}{_format_labels(labelnames, values)} {_format_value(self.value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (e.g. in-flight requests)"""
+
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def render(self, name, labelnames, values):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = 'le="' + _format_value(bound) + '"'
+            lines.append(f"{name}_bucket{_format_labels(labelnames, values, le)} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labelnames, values)} {_format_value(self.sum)}")
+        lines.append(f"{name}_count{_format_labels(labelnames, values)} {self.count}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed buckets"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+
+class Registry:
+    """Collection of metric families rendered together at /metrics"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> None:
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# ----------------------------------------------------------------------
+# Application metrics
+# ----------------------------------------------------------------------
+STAGE_LATENCY = Histogram(
+    "resume_screener_stage_duration_seconds",
+    "Time spent in each screening pipeline stage",
+    ["stage"]
+)
+STAGE_ERRORS = Counter(
+    "resume_screener_errors_total",
+    "Errors raised per pipeline stage",
+    ["stage"]
+)
+LLM_TOKENS = Counter(
+    "resume_screener_llm_tokens_total",
+    "LLM tokens consumed, by call and token kind (prompt/completion)",
+    ["call", "kind"]
+)
+CACHE_REQUESTS = Counter(
+    "resume_screener_cache_requests_total",
+    "Cache lookups by cache name and result (hit/miss)",
+    ["cache", "result"]
+)
+CACHE_TIER_REQUESTS = Counter(
+    "resume_screener_cache_tier_requests_total",
+    "Lookups per cache tier (memory/shared/redis) by cache name and result (hit/miss)",
+    ["cache", "tier", "result"]
+)
+PDF_EXTRACTIONS = Counter(
+    "resume_screener_pdf_extractions_total",
+    "PDF text extractions by engine used (after probing, with PDF_TEXT_ENGINE=auto)",
+    ["engine"]
+)
+LLM_CONNECTIONS = Counter(
+    "resume_screener_llm_connections_total",
+    "LLM HTTP requests by connection use (new: opened a connection, reused: pooled keep-alive one)",
+    ["result"]
+)
+LLM_CONNECT_SECONDS = Histogram(
+    "resume_screener_llm_connect_seconds",
+    "Time to open an LLM connection (TCP connect + TLS handshake)",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+SINGLEFLIGHT_CALLS = Counter(
+    "resume_screener_singleflight_calls_total",
+    "Calls through single-flight groups, by operation and role (leader: executed, coalesced: shared an in-flight call)",
+    ["operation", "role"]
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "resume_screener_admission_in_flight",
+    "Screening work holding an admission slot, by lane (interactive/bulk)",
+    ["lane"]
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "resume_screener_admission_queue_depth",
+    "Screening work waiting for an admission slot, by lane",
+    ["lane"]
+)
+ADMISSION_REJECTED = Counter(
+    "resume_screener_admission_rejected_total",
+    "Requests turned away with 503, by lane and reason (queue_full/timeout)",
+    ["lane", "reason"]
+)
+ADMISSION_WAIT = Histogram(
+    "resume_screener_admission_wait_seconds",
+    "Time spent queued before an admission slot was granted, by lane",
+    ["lane"]
+)
+CHANGE_FEED_SUBSCRIBERS = Gauge(
+    "resume_screener_change_feed_subscribers",
+    "Open /api/events streams"
+)
+CHANGE_FEED_EVENTS = Counter(
+    "resume_screener_change_feed_events_total",
+    "Change events sent to /api/events clients, by source (live: fanned out, backlog: read for a resuming client)",
+    ["source"]
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "resume_screener_requests_in_flight",
+    "HTTP requests currently being handled"
+)
+LOG_RECORDS_DROPPED = Counter(
+    "resume_screener_log_records_dropped_total",
+    "Log records dropped instead of blocking (queue_full/rate_limited)",
+    ["reason"]
+)
+REQUESTS_TOTAL = Counter(
+    "resume_screener_http_requests_total",
+    "HTTP requests handled, by endpoint and status code",
+    ["endpoint", "status"]
+)
+
+
+class stage_timer:
+    """
+    Time a pipeline stage into STAGE_LATENCY (and count errors)
+
+    The duration is also added to the request's stage timings (emitted with
+    the access log record), and recorded as a span when the request is being
+    profiled.
+
+    Usage:
+        with stage_timer("pdf_parse"):
+            ...
+    """
+
+    __slots__ = ("stage", "_histogram", "_started")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._histogram = STAGE_LATENCY.labels(stage)
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._started
+        self._histogram.observe(elapsed)
+        if exc_type is not None:
+            STAGE_ERRORS.labels(self.stage).inc()
+        timings = stage_timings.get()
+        if timings is not None:
+            timings[self.stage] = round(timings.get(self.stage, 0.0) + elapsed * 1000, 3)
+        profile = current_profile.get()
+        if profile is not None:
+            profile.add_span(self.stage, self._started, elapsed, exc_type is not None)
+        return False
+
+
+def record_llm_usage(call: str, response) -> None:
+    """Count prompt/completion tokens from a Gemini response, if it reports usage"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    prompt_tokens = getattr(usage, "prompt_token_count", 0) or 0
+    completion_tokens = getattr(usage, "candidates_token_count", 0) or 0
+    if prompt_tokens:
+        LLM_TOKENS.labels(call, "prompt").inc(prompt_tokens)
+    if completion_tokens:
+        LLM_TOKENS.labels(call, "completion").inc(completion_tokens)
+
+
+def cache_hit(cache: str) -> None:
+    CACHE_REQUESTS.labels(cache, "hit").inc()
+
+
+def cache_miss(cache: str) -> None:
+    CACHE_REQUESTS.labels(cache, "miss").inc()
+
+
+def llm_connection(setup_seconds) -> None:
+    """Count an LLM request; ``setup_seconds`` is None when it reused a pooled connection"""
+    if setup_seconds is None:
+        LLM_CONNECTIONS.labels("reused").inc()
+    else:
+        LLM_CONNECTIONS.labels("new").inc()
+        LLM_CONNECT_SECONDS.observe(setup_seconds)
+
+
+def singleflight_call(operation: str, coalesced: bool) -> None:
+    SINGLEFLIGHT_CALLS.labels(operation, "coalesced" if coalesced else "leader").inc()
+
+
+def cache_tier_result(cache: str, tier: str, hit: bool) -> None:
+    CACHE_TIER_REQUESTS.labels(cache, tier, "hit" if hit else "miss").inc()
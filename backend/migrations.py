@@ -0,0 +1,271 @@
+"""
+Versioned schema migrations
+
+``create_all`` only creates missing tables, so index and constraint changes
+never reached existing databases. Each migration here has a version number,
+runs in its own transaction and is recorded in ``schema_version``. A new
+database is created from the models and stamped with the latest version
+directly; an existing one (including databases from before versioning) gets
+every migration it has not seen, in order.
+
+Migrations are written to be safe to re-run (IF [NOT] EXISTS, re-checked
+version), and hold a lock while they run (BEGIN IMMEDIATE on SQLite, an
+advisory lock on PostgreSQL), so several workers starting at once apply each
+migration exactly once.
+
+    python -m backend.migrations            # upgrade
+    python -m backend.migrations --status   # list applied / pending versions
+
+When a migration changes the schema, change the models to match: new
+databases never run it.
+"""
+import argparse
+import logging
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy import MetaData, inspect, text
+from sqlalchemy.schema import CreateTable
+
+from backend.database import Base
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_TABLE = "schema_version"
+_PG_LOCK_KEY = 7243110  # arbitrary, constant per application
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    upgrade: Callable  # (connection) -> None
+
+
+def _has_table(conn, name: str) -> bool:
+    return inspect(conn).has_table(name)
+
+
+def _baseline(conn) -> None:
+    """Schema as of before versioning: missing tables, and nullable columns added to existing ones"""
+    Base.metadata.create_all(bind=conn)
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {col["name"] for col in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing and column.nullable:
+                column_type = column.type.compile(dialect=conn.dialect)
+                conn.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}')
+                if column.index:
+                    conn.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS ix_{table.name}_{column.name} ON {table.name} ({column.name})')
+
+
+def _composite_indexes(conn) -> None:
+    """Indexes for the screening list filters, candidate history and child-row lookups"""
+    for statement in (
+        "CREATE INDEX IF NOT EXISTS ix_screening_records_action_screened_score "
+        "ON screening_records (recommended_action, screened_at, match_score)",
+        "CREATE INDEX IF NOT EXISTS ix_screening_records_candidate_screened ON screening_records (candidate_id, screened_at)",
+        "CREATE INDEX IF NOT EXISTS ix_screening_records_action_candidate ON screening_records (recommended_action, candidate_id)",
+        "DROP INDEX IF EXISTS ix_screening_records_recommended_action",  # prefix of the first composite
+        "CREATE INDEX IF NOT EXISTS ix_experiences_candidate_id ON experiences (candidate_id)",
+        "CREATE INDEX IF NOT EXISTS ix_educations_candidate_id ON educations (candidate_id)",
+        "CREATE INDEX IF NOT EXISTS ix_candidates_created_at ON candidates (created_at)",
+    ):
+        conn.exec_driver_sql(statement)
+
+
+def _unique_candidate_email(conn) -> None:
+    """
+    Merge candidates that share an email, then make email unique
+
+    The most recently updated row survives; screenings of the others move to
+    it, and their profile rows (experience, education, LSH bands, full-text
+    entries) are dropped.
+    """
+    emails = conn.execute(text(
+        "SELECT email FROM candidates WHERE email IS NOT NULL GROUP BY email HAVING COUNT(*) > 1"
+    )).scalars().all()
+    has_fts = _has_table(conn, "candidates_fts")
+    merged = 0
+    for email in emails:
+        ids = conn.execute(text(
+            "SELECT id FROM candidates WHERE email = :email ORDER BY updated_at DESC, id DESC"
+        ), {"email": email}).scalars().all()
+        keep, drop = ids[0], ids[1:]
+        for candidate_id in drop:
+            params = {"keep": keep, "drop": candidate_id}
+            conn.execute(text("UPDATE screening_records SET candidate_id = :keep WHERE candidate_id = :drop"), params)
+            for table in ("experiences", "educations", "resume_lsh_bands"):
+                conn.execute(text(f"DELETE FROM {table} WHERE candidate_id = :drop"), params)
+            if has_fts:  # before the row goes: FTS5 reads it back to find the tokens
+                conn.execute(text("DELETE FROM candidates_fts WHERE rowid = :drop"), params)
+            conn.execute(text("DELETE FROM candidates WHERE id = :drop"), params)
+            merged += 1
+    if merged:
+        logger.info(f"Merged {merged} duplicate candidates across {len(emails)} emails")
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_candidates_email")
+    conn.exec_driver_sql("CREATE UNIQUE INDEX ix_candidates_email ON candidates (email)")
+
+
+def _screening_rollups(conn) -> None:
+    """job_hash on screenings, and the per-job daily rollups built from them"""
+    from backend import analytics
+    if "job_hash" not in {col["name"] for col in inspect(conn).get_columns("screening_records")}:
+        conn.exec_driver_sql("ALTER TABLE screening_records ADD COLUMN job_hash VARCHAR(64)")
+    Base.metadata.tables["screening_rollups"].create(bind=conn, checkfirst=True)
+    rows = analytics.rebuild(conn)
+    logger.info(f"Built {rows} screening rollup rows")
+
+
+CASCADE_TABLES = ("experiences", "educations", "screening_records", "resume_lsh_bands")
+
+
+def _cascade_foreign_keys(conn) -> None:
+    """
+    ON DELETE CASCADE on every candidates.id foreign key
+
+    Rows whose candidate no longer exists are dropped first (SQLite never
+    enforced the keys before). SQLite cannot alter a constraint, so each
+    table is rebuilt from the model: created under a temporary name, filled,
+    swapped in and re-indexed. PostgreSQL replaces the constraint in place.
+    """
+    from backend import analytics
+    inspector = inspect(conn)
+    orphans = {}
+    for table in CASCADE_TABLES:
+        keys = [fk for fk in inspector.get_foreign_keys(table) if fk["referred_table"] == "candidates"]
+        if keys and all((fk.get("options") or {}).get("ondelete", "").upper() == "CASCADE" for fk in keys):
+            continue
+        orphans[table] = conn.execute(text(
+            f"DELETE FROM {table} WHERE candidate_id NOT IN (SELECT id FROM candidates)"
+        )).rowcount
+        if conn.dialect.name == "sqlite":
+            model = Base.metadata.tables[table]
+            scratch = MetaData()
+            Base.metadata.tables["candidates"].to_metadata(scratch)  # so the copied foreign key resolves
+            rebuilt = model.to_metadata(scratch, name=f"{table}_rebuild")
+            existing = {col["name"] for col in inspector.get_columns(table)}
+            columns = ", ".join(col.name for col in model.columns if col.name in existing)
+            conn.execute(CreateTable(rebuilt))
+            conn.exec_driver_sql(f"INSERT INTO {table}_rebuild ({columns}) SELECT {columns} FROM {table}")
+            conn.exec_driver_sql(f"DROP TABLE {table}")
+            conn.exec_driver_sql(f"ALTER TABLE {table}_rebuild RENAME TO {table}")
+            for index in model.indexes:
+                index.create(bind=conn, checkfirst=True)
+        else:
+            for fk in keys:
+                conn.exec_driver_sql(f'ALTER TABLE {table} DROP CONSTRAINT "{fk["name"]}"')
+            conn.exec_driver_sql(
+                f"ALTER TABLE {table} ADD CONSTRAINT {table}_candidate_id_fkey "
+                f"FOREIGN KEY (candidate_id) REFERENCES candidates (id) ON DELETE CASCADE"
+            )
+    if orphans.get("screening_records"):
+        analytics.rebuild(conn)  # the dropped screenings were counted
+    dropped = sum(orphans.values())
+    if dropped:
+        logger.info(f"Dropped {dropped} rows of deleted candidates: {orphans}")
+
+
+def _change_events(conn) -> None:
+    """Change feed table (backend/events.py); the feed starts empty"""
+    Base.metadata.tables["change_events"].create(bind=conn, checkfirst=True)
+
+
+def _maintenance_runs(conn) -> None:
+    """Finished retention purges, so every worker sees when the last one ran"""
+    Base.metadata.tables["maintenance_runs"].create(bind=conn, checkfirst=True)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline", _baseline),
+    Migration(2, "composite_indexes", _composite_indexes),
+    Migration(3, "unique_candidate_email", _unique_candidate_email),
+    Migration(4, "screening_rollups", _screening_rollups),
+    Migration(5, "cascade_foreign_keys", _cascade_foreign_keys),
+    Migration(6, "change_events", _change_events),
+    Migration(7, "maintenance_runs", _maintenance_runs),
+]
+LATEST = MIGRATIONS[-1].version
+
+
+def _lock(conn) -> None:
+    """Serialize migrating workers for the rest of this transaction"""
+    if conn.dialect.name == "sqlite":
+        if not conn.connection.dbapi_connection.in_transaction:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+    elif conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _PG_LOCK_KEY})
+
+
+def _ensure_version_table(conn) -> None:
+    conn.exec_driver_sql(
+        f"CREATE TABLE IF NOT EXISTS {SCHEMA_TABLE} "
+        f"(version INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, applied_at TIMESTAMP NOT NULL)"
+    )
+
+
+def _applied(conn) -> set:
+    return set(conn.execute(text(f"SELECT version FROM {SCHEMA_TABLE}")).scalars())
+
+
+def _record(conn, migration: Migration) -> None:
+    conn.execute(
+        text(f"INSERT INTO {SCHEMA_TABLE} (version, name, applied_at) VALUES (:version, :name, :applied_at)"),
+        {"version": migration.version, "name": migration.name, "applied_at": datetime.utcnow()}
+    )
+
+
+def applied_versions(engine) -> set:
+    with engine.begin() as conn:
+        _ensure_version_table(conn)
+        return _applied(conn)
+
+
+def migrate(engine) -> List[Migration]:
+    """Bring the database to LATEST; returns the migrations that were applied"""
+    import backend.models  # noqa: F401  (registers the tables on Base.metadata)
+
+    with engine.begin() as conn:
+        _lock(conn)
+        _ensure_version_table(conn)
+        if not _applied(conn) and not _has_table(conn, "candidates"):
+            # New database: the models already describe the latest schema
+            Base.metadata.create_all(bind=conn)
+            for migration in MIGRATIONS:
+                _record(conn, migration)
+            logger.info(f"Created schema at version {LATEST}")
+            return []
+
+    applied = []
+    for migration in MIGRATIONS:
+        with engine.begin() as conn:
+            _lock(conn)
+            if migration.version in _applied(conn):
+                continue
+            logger.info(f"Applying migration {migration.version}: {migration.name}")
+            migration.upgrade(conn)
+            _record(conn, migration)
+        applied.append(migration)
+    return applied
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply schema migrations to DATABASE_URL")
+    parser.add_argument("--status", action="store_true", help="List applied and pending migrations only")
+    args = parser.parse_args(argv)
+
+    from backend.database import engine
+    if args.status:
+        done = applied_versions(engine)
+        for migration in MIGRATIONS:
+            print(f"  {migration.version:>3}  {migration.name:<28} {'applied' if migration.version in done else 'pending'}")
+        return
+    applied = migrate(engine)
+    print(f"Applied {len(applied)} migration(s); schema at version {LATEST}")
+    for migration in applied:
+        print(f"  {migration.version:>3}  {migration.name}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
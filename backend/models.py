@@ -1,9 +1,10 @@
 """
 SQLAlchemy database models for storing screening results
 """
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Text, Date, DateTime, ForeignKey, JSON, LargeBinary, Index
+from sqlalchemy.orm import relationship, deferred
 from backend.database import Base
+from backend.compression import CompressedText
 from datetime import datetime
 
 
@@ -13,7 +14,7 @@ class Candidate(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), index=True)
-    email = Column(String(255), index=True)
+    email = Column(String(255), unique=True, index=True)  # save_screening_result updates by email
     phone = Column(String(50))
     location = Column(String(255))
     
@@ -22,16 +23,19 @@ class Candidate(Base):
     summary = Column(Text)
     
     total_experience_years = Column(Float)
-    resume_text = Column(Text)  # Store original resume text
+    resume_text = deferred(Column(CompressedText("resume_text")))  # Original resume text, compressed; loaded on access
     resume_filename = Column(String(255))
+    resume_sha256 = Column(String(64), index=True)  # Hash of the uploaded PDF bytes (exact-repeat dedup)
+    minhash_signature = Column(LargeBinary)  # MinHash of resume_text (near-duplicate detection)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Relationships
-    experiences = relationship("Experience", back_populates="candidate", cascade="all, delete-orphan")
-    educations = relationship("Education", back_populates="candidate", cascade="all, delete-orphan")
-    screening_records = relationship("ScreeningRecord", back_populates="candidate", cascade="all, delete-orphan")
+    # Relationships (child rows go with the candidate: ON DELETE CASCADE in the database)
+    experiences = relationship("Experience", back_populates="candidate", cascade="all, delete-orphan", passive_deletes=True)
+    educations = relationship("Education", back_populates="candidate", cascade="all, delete-orphan", passive_deletes=True)
+    screening_records = relationship("ScreeningRecord", back_populates="candidate", cascade="all, delete-orphan", passive_deletes=True)
+    lsh_bands = relationship("ResumeLSHBand", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self):
         return f"<Candidate(id={self.id}, name='{self.name}', email='{self.email}')>"
@@ -42,7 +46,7 @@ class Experience(Base):
     __tablename__ = "experiences"
     
     id = Column(Integer, primary_key=True, index=True)
-    candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False)
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False, index=True)
     
     role = Column(String(255))
     company = Column(String(255))
@@ -62,7 +66,7 @@ class Education(Base):
     __tablename__ = "educations"
     
     id = Column(Integer, primary_key=True, index=True)
-    candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False)
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False, index=True)
     
     degree = Column(String(255))
     institution = Column(String(255))
@@ -81,22 +85,131 @@ class ScreeningRecord(Base):
     __tablename__ = "screening_records"
     
     id = Column(Integer, primary_key=True, index=True)
-    candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False)
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False)
     
-    job_description = Column(Text)
+    job_description = deferred(Column(CompressedText("job_description")))  # Compressed; loaded on access
     job_title = Column(String(255), index=True)  # Extracted from job description
+    job_hash = Column(String(64))  # SHA-256 of the job description (analytics rollup key)
     
     # Match scoring
     match_score = Column(Integer)  # 1-10
     justification = Column(Text)
     strengths = Column(JSON)  # Store as JSON array
     concerns = Column(JSON)  # Store as JSON array
-    recommended_action = Column(String(50), index=True)  # Shortlist/Maybe/Reject
+    recommended_action = Column(String(50))  # Shortlist/Maybe/Reject
     
     screened_at = Column(DateTime, default=datetime.utcnow, index=True)
     
     # Relationships
     candidate = relationship("Candidate", back_populates="screening_records")
     
+    # Composite indexes for the list/filter queries (added by backend/migrations.py on existing databases)
+    __table_args__ = (
+        # action filter + score filter, newest first; also covers the per-action counts
+        Index("ix_screening_records_action_screened_score", "recommended_action", "screened_at", "match_score"),
+        # one candidate's history, newest first
+        Index("ix_screening_records_candidate_screened", "candidate_id", "screened_at"),
+        # latest shortlisted screening per candidate (GROUP BY candidate_id)
+        Index("ix_screening_records_action_candidate", "recommended_action", "candidate_id"),
+    )
+    
     def __repr__(self):
         return f"<ScreeningRecord(id={self.id}, score={self.match_score}, action='{self.recommended_action}')>"
+
+
+class ScreeningRollup(Base):
+    """Screening counts and score histogram per job description and day (see backend/analytics.py)"""
+    __tablename__ = "screening_rollups"
+    
+    id = Column(Integer, primary_key=True)
+    job_hash = Column(String(64), nullable=False)
+    job_title = Column(String(255))
+    day = Column(Date, nullable=False)  # UTC date of screened_at
+    
+    screenings = Column(Integer, nullable=False, default=0)
+    shortlisted = Column(Integer, nullable=False, default=0)
+    maybe = Column(Integer, nullable=False, default=0)
+    rejected = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_sq_sum = Column(Float, nullable=False, default=0.0)
+    
+    # Score histogram: score_N counts match scores in [N, N+1); score_10 counts 10.0
+    score_1 = Column(Integer, nullable=False, default=0)
+    score_2 = Column(Integer, nullable=False, default=0)
+    score_3 = Column(Integer, nullable=False, default=0)
+    score_4 = Column(Integer, nullable=False, default=0)
+    score_5 = Column(Integer, nullable=False, default=0)
+    score_6 = Column(Integer, nullable=False, default=0)
+    score_7 = Column(Integer, nullable=False, default=0)
+    score_8 = Column(Integer, nullable=False, default=0)
+    score_9 = Column(Integer, nullable=False, default=0)
+    score_10 = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        Index("ix_screening_rollups_job_day", "job_hash", "day", unique=True),  # upsert target
+        Index("ix_screening_rollups_day", "day"),
+    )
+    
+    def __repr__(self):
+        return f"<ScreeningRollup(job_hash='{self.job_hash[:8]}', day={self.day}, screenings={self.screenings})>"
+
+
+class ResumeLSHBand(Base):
+    """LSH band buckets of a candidate's MinHash signature (near-duplicate lookup)"""
+    __tablename__ = "resume_lsh_bands"
+    
+    id = Column(Integer, primary_key=True)
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False, index=True)
+    band = Column(Integer, nullable=False)
+    bucket = Column(BigInteger, nullable=False)
+    
+    __table_args__ = (Index("ix_resume_lsh_bands_band_bucket", "band", "bucket"),)
+    
+    def __repr__(self):
+        return f"<ResumeLSHBand(candidate_id={self.candidate_id}, band={self.band})>"
+
+
+class CompressionDictionary(Base):
+    """Trained zstd dictionaries for compressed text columns (never deleted)"""
+    __tablename__ = "compression_dictionaries"
+    
+    id = Column(Integer, primary_key=True)
+    column_name = Column(String(64), nullable=False, index=True)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<CompressionDictionary(id={self.id}, column='{self.column_name}')>"
+
+
+class ChangeEvent(Base):
+    """Change feed entry written with each DatabaseService write (see backend/events.py)"""
+    __tablename__ = "change_events"
+    
+    seq = Column(Integer, primary_key=True)  # AUTOINCREMENT: never reused after pruning
+    entity = Column(String(32), nullable=False)  # candidate | screening
+    op = Column(String(8), nullable=False)  # insert | update | delete
+    entity_id = Column(Integer, nullable=False)
+    data = Column(Text)  # compact JSON payload, sent to clients as is
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    def __repr__(self):
+        return f"<ChangeEvent(seq={self.seq}, {self.entity} {self.op} {self.entity_id})>"
+
+
+class MaintenanceRun(Base):
+    """A finished maintenance task with its report (retention purges; see services/retention_service.py)"""
+    __tablename__ = "maintenance_runs"
+    
+    id = Column(Integer, primary_key=True)
+    task = Column(String(32), nullable=False)  # retention
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=False)
+    report = Column(Text)  # JSON, as returned by the task
+    
+    __table_args__ = (Index("ix_maintenance_runs_task_finished", "task", "finished_at"),)
+    
+    def __repr__(self):
+        return f"<MaintenanceRun(id={self.id}, task='{self.task}', finished_at={self.finished_at})>"
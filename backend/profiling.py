@@ -0,0 +1,233 @@
+"""
+On-demand request profiling with stored flame data
+
+A request is profiled when it carries the profiling token header, or when the
+admin toggle is on and the request falls inside the configured sample rate.
+Profiled requests get a sampling profiler thread (collapsed "folded" stacks,
+ready for flamegraph.pl or speedscope) plus span timings for every pipeline
+stage timed with ``metrics.stage_timer``. Results are written as JSON files
+so any worker can serve them from /api/debug/profiles.
+
+The sampler follows the thread that started the request (the event loop)
+until work is handed to a worker thread: code running there wraps itself in
+``follow_thread()`` and is sampled instead while it runs.
+
+When profiling is off the only cost per request is a set lookup on the path.
+"""
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile-token"
+
+# Endpoints worth profiling: the screening pipeline and the list pages
+PROFILED_PATHS = {"/api/analyze/", "/api/analyze/multi", "/api/candidates/", "/api/screenings/", "/api/shortlisted/"}
+
+current_profile: ContextVar[Optional["Profile"]] = ContextVar("current_profile", default=None)
+
+
+class ProfilingState:
+    """Runtime toggle (per worker), initialised from settings"""
+
+    def __init__(self):
+        self.enabled = settings.PROFILING_ENABLED
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+
+    def to_dict(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "header_trigger": bool(settings.PROFILING_TOKEN),
+            "interval_ms": settings.PROFILING_INTERVAL_MS,
+        }
+
+
+state = ProfilingState()
+
+
+class Profile:
+    """Spans and stack samples collected for one request"""
+
+    def __init__(self, method: str, path: str, trigger: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.started_at = datetime.utcnow()
+        self.status: Optional[int] = None
+        self.duration_ms: Optional[float] = None
+        self.spans: List[dict] = []
+        self.samples: Dict[str, int] = {}
+        self.worker_threads: Set[int] = set()  # threads running this request's work (follow_thread)
+        self._t0 = time.perf_counter()
+
+    def add_span(self, name: str, started: float, duration: float, error: bool = False) -> None:
+        self.spans.append({
+            "name": name,
+            "start_ms": round((started - self._t0) * 1000, 3),
+            "duration_ms": round(duration * 1000, 3),
+            "error": error,
+        })
+
+    def finish(self, status: int) -> None:
+        self.status = status
+        self.duration_ms = round((time.perf_counter() - self._t0) * 1000, 3)
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "trigger": self.trigger,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "sample_count": sum(self.samples.values()),
+        }
+
+    def to_dict(self) -> dict:
+        data = self.summary()
+        data["spans"] = self.spans
+        data["samples"] = self.samples
+        return data
+
+
+class SamplingProfiler(threading.Thread):
+    """Periodically sample the request's threads into folded-stack counts"""
+
+    def __init__(self, profile: Profile, thread_id: int, interval: float):
+        super().__init__(name=f"profiler-{profile.id}", daemon=True)
+        self.profile = profile
+        self.thread_id = thread_id
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        samples = self.profile.samples
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in list(self.profile.worker_threads) or [self.thread_id]:
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < 128:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                key = ";".join(reversed(stack))
+                samples[key] = samples.get(key, 0) + 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def should_profile(request) -> Optional[str]:
+    """Return the trigger ("header"/"sampled") if this request should be profiled"""
+    if request.url.path not in PROFILED_PATHS:
+        return None
+    token = settings.PROFILING_TOKEN
+    if token and request.headers.get(PROFILE_HEADER) == token:
+        return "header"
+    if state.enabled and random.random() < state.sample_rate:
+        return "sampled"
+    return None
+
+
+def start(request, trigger: str):
+    """Begin profiling the current request; returns (profile, sampler, context token)"""
+    profile = Profile(request.method, request.url.path, trigger)
+    sampler = SamplingProfiler(profile, threading.get_ident(), settings.PROFILING_INTERVAL_MS / 1000.0)
+    sampler.start()
+    return profile, sampler, current_profile.set(profile)
+
+
+@contextmanager
+def follow_thread() -> Iterator[None]:
+    """Sample the calling worker thread, instead of the event loop, while the block runs"""
+    profile = current_profile.get()  # copied into the thread by asyncio.to_thread / copy_context
+    if profile is None:
+        yield
+        return
+    thread_id = threading.get_ident()
+    profile.worker_threads.add(thread_id)
+    try:
+        yield
+    finally:
+        profile.worker_threads.discard(thread_id)
+
+
+def stop(profile: Profile, sampler: SamplingProfiler, token, status: int) -> None:
+    sampler.stop()
+    current_profile.reset(token)
+    profile.finish(status)
+
+
+# ----------------------------------------------------------------------
+# Storage (one JSON file per profile, shared by all workers)
+# ----------------------------------------------------------------------
+def _profile_path(profile_id: str) -> str:
+    return os.path.join(settings.PROFILING_DIR, f"{profile_id}.json")
+
+
+def save(profile: Profile) -> None:
+    """Persist a finished profile and prune the oldest beyond the retention limit"""
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    with open(_profile_path(profile.id), "w", encoding="utf-8") as f:
+        json.dump(profile.to_dict(), f)
+
+    files = sorted(
+        (os.path.join(settings.PROFILING_DIR, name) for name in os.listdir(settings.PROFILING_DIR) if name.endswith(".json")),
+        key=os.path.getmtime
+    )
+    for stale in files[:-settings.PROFILING_MAX_STORED]:
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
+    logger.info(f"Stored profile {profile.id} for {profile.method} {profile.path} ({profile.duration_ms} ms)")
+
+
+def list_profiles() -> List[dict]:
+    """Summaries of stored profiles, newest first"""
+    if not os.path.isdir(settings.PROFILING_DIR):
+        return []
+    summaries = []
+    for name in os.listdir(settings.PROFILING_DIR):
+        if not name.endswith(".json"):
+            continue
+        data = load(name[:-5])
+        if data:
+            data.pop("spans", None)
+            data.pop("samples", None)
+            summaries.append(data)
+    return sorted(summaries, key=lambda p: p["started_at"], reverse=True)
+
+
+def load(profile_id: str) -> Optional[dict]:
+    if not profile_id.isalnum():
+        return None
+    try:
+        with open(_profile_path(profile_id), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def to_folded(data: dict) -> str:
+    """Collapsed-stack text ("frame;frame;frame count" per line)"""
+    return "\n".join(f"{stack} {count}" for stack, count in sorted(data.get("samples", {}).items())) + "\n"
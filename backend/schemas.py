@@ -2,8 +2,8 @@
 Pydantic schemas for structured resume data
 """
 from pydantic import BaseModel, EmailStr, Field
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import date, datetime
 
 
 class Experience(BaseModel):
@@ -60,3 +60,217 @@ class ScreeningResult(BaseModel):
         json_encoders = {
             datetime: lambda v: v.isoformat() if v else None
         }
+
+
+class RescreenFilter(BaseModel):
+    """Which stored candidates to re-score (all candidates when empty)"""
+    candidate_ids: Optional[List[int]] = Field(None, description="Explicit candidate IDs")
+    skill: Optional[str] = Field(None, description="Only candidates listing this skill")
+    min_experience_years: Optional[float] = Field(None, description="Minimum total experience")
+    created_after: Optional[datetime] = Field(None, description="Only candidates added after this time")
+    limit: Optional[int] = Field(None, ge=1, description="Maximum number of candidates")
+
+
+class BulkDeleteRequest(RescreenFilter):
+    """Candidates to delete: explicit IDs and/or filters (at least one is required)"""
+    created_before: Optional[datetime] = Field(None, description="Only candidates added before this time")
+    dry_run: bool = Field(False, description="Only count the matching candidates")
+
+
+class RetentionRequest(BaseModel):
+    """On-demand retention purge (defaults: RETENTION_DAYS, RETENTION_VACUUM)"""
+    days: Optional[int] = Field(None, ge=1, description="Purge screenings older than this many days")
+    vacuum: Optional[bool] = Field(None, description="VACUUM after deleting")
+
+
+class RescreenRequest(BaseModel):
+    """Re-score stored candidates against a (new) job description"""
+    job_description: str = Field(..., min_length=10, description="Job requirements")
+    filter: RescreenFilter = Field(default_factory=RescreenFilter)
+
+
+# ----------------------------------------------------------------------
+# API response models (documented in OpenAPI; rendered by serializers.py)
+# ----------------------------------------------------------------------
+class DedupInfo(BaseModel):
+    """How an upload matched previously stored resumes"""
+    exact_match: bool = False  # same PDF bytes seen before
+    email_match: Optional[int] = None  # candidate ID found by the locally extracted email (before any LLM call)
+    near_duplicate_of: Optional[int] = None  # candidate ID of a near-identical resume
+    similarity: Optional[float] = None  # estimated Jaccard similarity to that resume
+    reused: Optional[str] = None  # "screening", "extraction" or None
+    coalesced: bool = False  # shared the result of an identical upload that was already in flight
+
+
+class AnalyzeResponse(ScreeningResult):
+    """Screening result plus the stored candidate ID"""
+    candidate_id: int
+    dedup: DedupInfo = Field(default_factory=DedupInfo)
+
+
+class JobMatch(BaseModel):
+    """Score of the uploaded resume against one of several job descriptions"""
+    job_description: str
+    match_score: MatchScore
+    reused: bool = False  # an earlier screening of this resume for this job
+
+
+class MultiAnalyzeResponse(BaseModel):
+    """One resume scored against several job descriptions (results in request order)"""
+    candidate: CandidateProfile
+    candidate_id: int
+    resume_filename: str
+    results: List[JobMatch]
+    screened_at: datetime = Field(default_factory=datetime.now)
+    dedup: DedupInfo = Field(default_factory=DedupInfo)
+
+
+class CandidateSummary(BaseModel):
+    id: int
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    location: Optional[str] = None
+    skills: Optional[List[str]] = None
+    total_experience_years: Optional[float] = None
+    created_at: Optional[datetime] = None
+
+
+class CandidateListResponse(BaseModel):
+    candidates: List[CandidateSummary]
+    skip: int
+    limit: int
+    count: int
+
+
+class ExperienceOut(BaseModel):
+    role: Optional[str] = None
+    company: Optional[str] = None
+    duration: Optional[str] = None
+    years: Optional[float] = None
+    responsibilities: Optional[List[str]] = None
+
+
+class EducationOut(BaseModel):
+    degree: Optional[str] = None
+    institution: Optional[str] = None
+    year: Optional[str] = None
+    gpa: Optional[str] = None
+
+
+class CandidateDetail(CandidateSummary):
+    certifications: Optional[List[str]] = None
+    summary: Optional[str] = None
+    resume_filename: Optional[str] = None
+    experiences: List[ExperienceOut] = Field(default_factory=list)
+    educations: List[EducationOut] = Field(default_factory=list)
+
+
+class ScreeningSummary(BaseModel):
+    id: int
+    candidate_id: int
+    candidate_name: Optional[str] = None
+    candidate_email: Optional[str] = None
+    job_title: Optional[str] = None
+    match_score: Optional[float] = None
+    recommended_action: Optional[str] = None
+    justification: Optional[str] = None
+    strengths: Optional[List[str]] = None
+    concerns: Optional[List[str]] = None
+    screened_at: Optional[datetime] = None
+
+
+class ScreeningListResponse(BaseModel):
+    screenings: List[ScreeningSummary]
+    skip: int
+    limit: int
+    count: int
+
+
+class ShortlistedCandidate(BaseModel):
+    candidate_id: int
+    name: Optional[str] = None
+    email: Optional[str] = None
+    skills: Optional[List[str]] = None
+    total_experience_years: Optional[float] = None
+    match_score: Optional[float] = None
+    job_title: Optional[str] = None
+    strengths: Optional[List[str]] = None
+    screened_at: Optional[datetime] = None
+
+
+class ShortlistedResponse(BaseModel):
+    shortlisted_candidates: List[ShortlistedCandidate]
+    count: int
+
+
+class StatsResponse(BaseModel):
+    total_candidates: int
+    total_screenings: int
+    shortlisted: int
+    maybe: int
+    rejected: int
+
+
+class ScoreBucket(BaseModel):
+    score: int  # scores in [score, score + 1)
+    count: int
+
+
+class AnalyticsDay(BaseModel):
+    day: date
+    screenings: int
+    shortlisted: int
+    maybe: int
+    rejected: int
+    mean_score: Optional[float] = None
+
+
+class AnalyticsResponse(BaseModel):
+    job_hash: Optional[str] = None
+    job_title: Optional[str] = None
+    start: date
+    end: date
+    screenings: int
+    shortlisted: int
+    maybe: int
+    rejected: int
+    mean_score: Optional[float] = None
+    stddev_score: Optional[float] = None
+    percentiles: Dict[str, Optional[float]]  # p10 ... p90
+    histogram: List[ScoreBucket]
+    trend: List[AnalyticsDay]
+
+
+class AnalyticsJob(BaseModel):
+    job_hash: str
+    job_title: Optional[str] = None
+    screenings: int
+    shortlisted: int
+    mean_score: Optional[float] = None
+    last_day: date
+
+
+class AnalyticsJobsResponse(BaseModel):
+    jobs: List[AnalyticsJob]
+    days: int
+
+
+class SearchHit(BaseModel):
+    candidate_id: int
+    name: Optional[str] = None
+    email: Optional[str] = None
+    location: Optional[str] = None
+    skills: Optional[List[str]] = None
+    total_experience_years: Optional[float] = None
+    score: float  # BM25 relevance, higher is better
+    snippet: str  # matched excerpt, terms wrapped in <mark></mark>
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchHit]
+    total: int
+    ranked: bool  # False: query matches most resumes, so results are newest first
+    limit: int
+    offset: int
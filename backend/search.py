@@ -0,0 +1,183 @@
+"""
+Full-text resume search (SQLite FTS5, BM25 ranking)
+
+``candidates_fts`` is an external-content FTS5 index over candidate name,
+summary, skills and resume text. Its content table is a view that decompresses
+``resume_text`` through the ``decompress_text()`` SQL function registered on
+every SQLite connection (see backend/database.py), so the index stores only
+tokens and snippets are cut from the stored resume on demand.
+
+The index is maintained by the application write paths, not triggers:
+``remove()`` must run while the candidate row still holds its old values
+(FTS5 reads them back to find the tokens to delete) and ``add()`` after the
+new values are flushed.
+
+Query syntax accepted by /api/search:
+    python django          both terms (any column)
+    "machine learning"     exact phrase
+    kube*                  prefix
+    python OR golang       either term
+    skills:rust            term restricted to one column (name, summary, skills, resume)
+"""
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+FTS_TABLE = "candidates_fts"
+SOURCE_VIEW = "candidates_fts_source"
+COLUMNS = ("name", "summary", "skills", "resume_text")
+COLUMN_ALIASES = {"name": "name", "summary": "summary", "skills": "skills", "resume": "resume_text"}
+
+# bm25 column weights, in COLUMNS order: a hit in the name or skills list
+# outranks one buried in the resume body
+RANK_WEIGHTS = (10.0, 2.0, 4.0, 1.0)
+
+SNIPPET_TOKENS = 16
+HIGHLIGHT = ("<mark>", "</mark>")
+
+_DDL = [
+    f"""CREATE VIEW IF NOT EXISTS {SOURCE_VIEW} AS
+        SELECT id, name, summary, skills, decompress_text(resume_text) AS resume_text FROM candidates""",
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {", ".join(COLUMNS)},
+        content='{SOURCE_VIEW}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+
+]
+_BM25 = f"bm25({FTS_TABLE}, {', '.join(map(str, RANK_WEIGHTS))})"
+
+_TOKEN_RE = re.compile(r'(?:(\w+):)?(?:"([^"]*)"(\*?)|(\S+))')
+_WORD_RE = re.compile(r"\w", re.UNICODE)
+
+_available: Optional[bool] = None
+
+
+def available() -> bool:
+    """True once ensure_index() has set up the FTS5 index on this database"""
+    return bool(_available)
+
+
+def ensure_index(engine) -> bool:
+    """
+    Create the FTS5 index if missing and build it from existing candidates
+
+    Returns False (search disabled) on non-SQLite databases or SQLite builds
+    without FTS5.
+    """
+    global _available
+    if engine.dialect.name != "sqlite":
+        _available = False
+        return False
+    with engine.begin() as conn:
+        if not conn.exec_driver_sql("SELECT sqlite_compileoption_used('ENABLE_FTS5')").scalar():
+            _available = False
+            return False
+        exists = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+        ).first()
+        if not exists:
+            for statement in _DDL:
+                conn.exec_driver_sql(statement)
+            conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')")
+    _available = True
+    return True
+
+
+def rebuild(engine) -> None:
+    """Re-index every candidate (after bulk loads that bypass the write paths)"""
+    if available():
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')")
+
+
+def remove(db: Session, candidate_id: int) -> None:
+    """Drop a candidate from the index; call before its row is changed or deleted"""
+    if available():
+        db.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": candidate_id})
+
+
+def remove_many(db: Session, candidate_ids: List[int]) -> None:
+    """remove() for several candidates in one statement"""
+    if available() and candidate_ids:
+        db.execute(
+            text(f"DELETE FROM {FTS_TABLE} WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True)),
+            {"ids": list(candidate_ids)}
+        )
+
+
+def add(db: Session, candidate_id: int) -> None:
+    """Index a candidate from its flushed row"""
+    if available():
+        db.execute(
+            text(f"INSERT INTO {FTS_TABLE}(rowid, {', '.join(COLUMNS)}) "
+                 f"SELECT id, {', '.join(COLUMNS)} FROM {SOURCE_VIEW} WHERE id = :id"),
+            {"id": candidate_id}
+        )
+
+
+def _quote(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def to_match_expression(query: str) -> Optional[str]:
+    """
+    Translate user query syntax into an FTS5 MATCH expression
+
+    Every term is quoted, so FTS5 operators and punctuation typed by users
+    are treated as text rather than syntax. Returns None if nothing searchable
+    is left.
+    """
+    parts: List[str] = []
+    for column, phrase, phrase_prefix, word in _TOKEN_RE.findall(query or ""):
+        if word == "OR" and not column:
+            if parts and parts[-1] != "OR":
+                parts.append("OR")
+            continue
+        if phrase:
+            term = _quote(phrase) + phrase_prefix
+        else:
+            prefix = word.endswith("*")
+            word = word.rstrip("*")
+            term = _quote(word) + ("*" if prefix else "")
+        if not _WORD_RE.search(phrase or word):
+            continue
+        if column and column.lower() in COLUMN_ALIASES:
+            term = f"{COLUMN_ALIASES[column.lower()]} : {term}"
+        elif column:
+            term = _quote(f"{column}:") + " " + term  # unknown prefix: search it as text
+        parts.append(term)
+    while parts and parts[-1] == "OR":
+        parts.pop()
+    return " ".join(parts) or None
+
+
+def search(db: Session, query: str, limit: int, offset: int) -> Tuple[int, bool, List[Tuple[int, float, str]]]:
+    """
+    Ranked matches for ``query``
+
+    Scoring every match is what makes broad queries slow. When the query has
+    no OR and matches more than half of all resumes, every term does too, and
+    FTS5 clamps the IDF of such terms to ~0: BM25 cannot tell the matches apart,
+    so scoring is skipped and the newest candidates are returned instead.
+
+    Returns:
+        (total matches, ranked, [(candidate_id, score, snippet), ...]) for the
+        page; higher scores are better (0 when not ranked)
+    """
+    expression = to_match_expression(query)
+    if expression is None:
+        raise ValueError("Query has no searchable terms")
+    params = {"q": expression}
+    total = db.execute(text(f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :q"), params).scalar()
+    indexed = db.execute(text(f"SELECT count(*) FROM {FTS_TABLE}_docsize")).scalar()
+    ranked = " OR " in f" {expression} " or total * 2 <= indexed
+    score, order = (_BM25, _BM25) if ranked else ("0", "rowid DESC")
+    page = db.execute(
+        text(f"SELECT rowid, {score}, snippet({FTS_TABLE}, -1, :open, :close, '…', {SNIPPET_TOKENS}) "
+             f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :q ORDER BY {order} LIMIT :limit OFFSET :offset"),
+        {**params, "open": HIGHLIGHT[0], "close": HIGHLIGHT[1], "limit": limit, "offset": offset}
+    ).all()
+    return total, ranked, [(row[0], round(-row[1], 6), row[2]) for row in page]
@@ -0,0 +1,122 @@
+"""
+Fast JSON responses and pre-built row serializers
+
+Endpoints return plain dicts built by the serializers below (reading loaded
+column values straight from the ORM instance) and rendered with orjson, which encodes datetimes natively (no per-row ``isoformat()``) and is
+several times faster than the stdlib encoder. The endpoints still declare
+typed ``response_model``s for the OpenAPI schema; returning a Response object
+directly skips FastAPI's per-field validation on the way out.
+"""
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Iterable, List, Sequence
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _values_getter(attrs: Sequence[str]) -> Callable[[Any], tuple]:
+    """
+    Return a function fetching ``attrs`` from an ORM instance as a tuple
+
+    Loaded column values live in the instance ``__dict__``, so one C-level
+    ``itemgetter`` call reads them all without going through SQLAlchemy's
+    attribute descriptors. Deferred or expired attributes are missing from
+    ``__dict__``; those rows fall back to normal attribute access (which loads
+    them).
+    """
+    attrs = tuple(attrs)
+    fast = itemgetter(*attrs)
+    slow = attrgetter(*attrs)
+    if len(attrs) == 1:
+        fast_one, slow_one = fast, slow
+        fast = lambda d: (fast_one(d),)
+        slow = lambda obj: (slow_one(obj),)
+
+    def values(obj) -> tuple:
+        try:
+            return fast(obj.__dict__)
+        except KeyError:
+            return slow(obj)
+    return values
+
+
+def row_serializer(fields: Sequence[str], attrs: Sequence[str] = None) -> Callable[[Any], dict]:
+    """Build a serializer mapping ORM attributes ``attrs`` to dict keys ``fields``"""
+    keys = tuple(fields)
+    values = _values_getter(attrs or keys)
+    return lambda obj: dict(zip(keys, values(obj)))
+
+
+candidate_summary = row_serializer(
+    ("id", "name", "email", "phone", "location", "skills", "total_experience_years", "created_at")
+)
+
+candidate_detail_fields = row_serializer(
+    ("id", "name", "email", "phone", "location", "skills", "certifications", "summary",
+     "total_experience_years", "resume_filename")
+)
+
+experience_row = row_serializer(("role", "company", "duration", "years", "responsibilities"))
+
+education_row = row_serializer(("degree", "institution", "year", "gpa"))
+
+_SCREENING_KEYS = (
+    "id", "candidate_id", "candidate_name", "candidate_email", "job_title", "match_score",
+    "recommended_action", "justification", "strengths", "concerns", "screened_at"
+)
+_screening_head = _values_getter(("id", "candidate_id"))
+_screening_tail = _values_getter(
+    ("job_title", "match_score", "recommended_action", "justification", "strengths", "concerns", "screened_at")
+)
+_candidate_contact = _values_getter(("name", "email"))
+
+_shortlisted_candidate = row_serializer(
+    ("candidate_id", "name", "email", "skills", "total_experience_years"),
+    ("id", "name", "email", "skills", "total_experience_years")
+)
+_shortlisted_screening = row_serializer(("match_score", "job_title", "strengths", "screened_at"))
+
+
+_search_candidate = row_serializer(
+    ("candidate_id", "name", "email", "location", "skills", "total_experience_years"),
+    ("id", "name", "email", "location", "skills", "total_experience_years")
+)
+
+
+def screening_summary(screening) -> dict:
+    values = _screening_head(screening) + _candidate_contact(screening.candidate) + _screening_tail(screening)
+    return dict(zip(_SCREENING_KEYS, values))
+
+
+def candidate_detail(candidate) -> dict:
+    data = candidate_detail_fields(candidate)
+    data["experiences"] = [experience_row(e) for e in candidate.experiences]
+    data["educations"] = [education_row(e) for e in candidate.educations]
+    data["created_at"] = candidate.created_at
+    return data
+
+
+def shortlisted_row(pair) -> dict:
+    candidate, screening = pair
+    data = _shortlisted_candidate(candidate)
+    data.update(_shortlisted_screening(screening))
+    return data
+
+
+def search_hit(hit) -> dict:
+    candidate, score, snippet = hit
+    data = _search_candidate(candidate)
+    data["score"] = score
+    data["snippet"] = snippet
+    return data
+
+
+def serialize_all(serializer: Callable[[Any], dict], rows: Iterable[Any]) -> List[dict]:
+    return list(map(serializer, rows))
@@ -0,0 +1,100 @@
+"""
+Benchmark: cache hit rate and lookup latency with several worker processes
+
+    python benchmarks/bench_cache.py --workers 4 --lookups 20000
+
+Each worker process looks up Zipf-distributed keys (like repeated LLM
+prompts) and fills misses itself. Run once with only the per-process memory
+tier and once with the shared SQLite tier behind it, to show how hit rates
+fall as workers are added without a shared tier. Also reports the latency of
+a hit in each tier.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import multiprocessing
+import random
+import shutil
+import tempfile
+import time
+
+
+def worker(directory: str, shared: bool, seed: int, args) -> tuple:
+    from backend import cache
+    from backend.config import settings
+    settings.CACHE_SHARED_ENABLED = shared
+    settings.CACHE_MEMORY_ENTRIES = args.memory_entries
+    tiered = cache.configure(directory, redis_url="")
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(args.keys)]
+    keys = rng.choices(range(args.keys), weights=weights, k=args.lookups)
+    value = b"x" * args.value_bytes
+    hits = 0
+    for key in keys:
+        if tiered.get("llm_score", str(key)) is not None:
+            hits += 1
+        else:
+            tiered.set("llm_score", str(key), value)
+    return hits, len(keys)
+
+
+def run(directory: str, shared: bool, args) -> float:
+    with multiprocessing.get_context("spawn").Pool(args.workers) as pool:
+        results = pool.starmap(worker, [(directory, shared, seed, args) for seed in range(args.workers)])
+    return sum(h for h, _ in results) / sum(n for _, n in results)
+
+
+def tier_latency(directory: str, args) -> dict:
+    from backend import cache
+    value = b"x" * args.value_bytes
+    memory = cache.MemoryTier(args.memory_entries)
+    shared = cache.SQLiteTier(os.path.join(directory, "latency.db"), args.keys * 2)
+    generation = cache.FileGeneration(os.path.join(directory, "latency.gen"))
+    result = {}
+    for tier in (memory, shared):
+        tier.set("k", value, 3600)
+        started = time.perf_counter()
+        for _ in range(args.latency_reads):
+            tier.get("k")
+        result[tier.name] = (time.perf_counter() - started) / args.latency_reads * 1e6
+    started = time.perf_counter()
+    for _ in range(args.latency_reads):
+        generation.value()
+    result["generation read"] = (time.perf_counter() - started) / args.latency_reads * 1e6
+    started = time.perf_counter()
+    for _ in range(args.latency_reads // 10):
+        generation.bump()
+    result["generation bump"] = (time.perf_counter() - started) / (args.latency_reads // 10) * 1e6
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--lookups", type=int, default=20000, help="per worker")
+    parser.add_argument("--keys", type=int, default=20000)
+    parser.add_argument("--memory-entries", type=int, default=1024)
+    parser.add_argument("--value-bytes", type=int, default=600)
+    parser.add_argument("--latency-reads", type=int, default=20000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_cache_")
+    try:
+        print(f"{args.workers} workers x {args.lookups:,} lookups, {args.keys:,} Zipf keys, "
+              f"memory tier {args.memory_entries} entries/process")
+        print("=" * 60)
+        memory_only = run(os.path.join(workdir, "memory"), False, args)
+        tiered = run(os.path.join(workdir, "tiered"), True, args)
+        print(f"  {'memory tier only':<28} hit rate {memory_only:>7.1%}")
+        print(f"  {'memory + shared SQLite tier':<28} hit rate {tiered:>7.1%}")
+        print("\n  Latency per operation (us)")
+        for name, micros in tier_latency(workdir, args).items():
+            print(f"  {name:<28} {micros:>9.2f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Benchmark: storage size and read/write throughput of resume text and job
+descriptions stored plain vs compressed (zlib, zstd, zstd + trained dictionary)
+
+    python benchmarks/bench_compression.py --candidates 20000
+
+Each variant bulk-loads the same seeded synthetic dataset into its own
+temporary SQLite file. Also times the in-place migration of the plain
+database (``python -m backend.compression --train-dictionaries``).
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import Session, defer, undefer
+
+from backend import compression
+from backend.config import settings
+from backend.database import Base
+from backend.models import Candidate, CompressionDictionary, Education, Experience, ScreeningRecord
+from sample_data.synthetic import SyntheticGenerator
+
+VARIANTS = [
+    ("plain", "none", False),
+    ("zlib", "zlib", False),
+    ("zstd", "zstd", False),
+    ("zstd + dictionary", "zstd", True),
+]
+
+
+def train_dictionaries(seed: int) -> dict:
+    """Dictionaries trained on a separate sample (different seed than the benchmark data)"""
+    import zstandard
+    generator = SyntheticGenerator(seed=seed + 1)
+    resumes, jds = [], []
+    for idx in range(1, compression.DICTIONARY_SAMPLES + 1):
+        data = generator.candidate(idx)
+        resumes.append(data["candidate"]["resume_text"].encode("utf-8"))
+        jds.append(generator.screening(data)["job_description"].encode("utf-8"))
+    return {
+        "resume_text": zstandard.train_dictionary(compression.DICTIONARY_SIZE, resumes).as_bytes(),
+        "job_description": zstandard.train_dictionary(compression.DICTIONARY_SIZE, jds).as_bytes(),
+    }
+
+
+def load(engine, args) -> dict:
+    generator = SyntheticGenerator(seed=args.seed)
+    text_bytes = rows = 0
+    started = time.perf_counter()
+    for candidates, experiences, educations, screenings in generator.iter_batches(args.candidates, 1, 1000, 2.0):
+        with engine.begin() as conn:
+            conn.execute(insert(Candidate), candidates)
+            conn.execute(insert(Experience), experiences)
+            conn.execute(insert(Education), educations)
+            conn.execute(insert(ScreeningRecord), screenings)
+        text_bytes += sum(len(c["resume_text"]) for c in candidates) + sum(len(s["job_description"]) for s in screenings)
+        rows += len(candidates) + len(screenings)
+    elapsed = time.perf_counter() - started
+    return {"write_rows_s": rows / elapsed, "write_mb_s": text_bytes / elapsed / 1e6, "text_bytes": text_bytes}
+
+
+def stored_bytes(engine) -> int:
+    with engine.connect() as conn:
+        return sum(
+            conn.execute(text(f"SELECT COALESCE(SUM(LENGTH(CAST({col} AS BLOB))), 0) FROM {table}")).scalar()
+            for table, col in compression.COMPRESSED_COLUMNS
+        )
+
+
+def read(engine, args) -> dict:
+    table = Candidate.__table__
+    started = time.perf_counter()
+    decoded = 0
+    with engine.connect() as conn:
+        for (value,) in conn.execute(select(table.c.resume_text)):
+            decoded += len(value)
+    scan = time.perf_counter() - started
+
+    ids = random.Random(args.seed).sample(range(1, args.candidates + 1), min(args.point_reads, args.candidates))
+    with Session(engine) as db:
+        started = time.perf_counter()
+        for candidate_id in ids:
+            db.query(Candidate).options(undefer(Candidate.resume_text)).filter(Candidate.id == candidate_id).one().resume_text
+            db.expunge_all()
+        point = (time.perf_counter() - started) / len(ids)
+
+        started = time.perf_counter()
+        for page in range(args.pages):
+            db.query(Candidate).options(defer(Candidate.summary)).order_by(Candidate.id).offset(page * 100).limit(100).all()
+            db.expunge_all()
+        page_time = (time.perf_counter() - started) / args.pages
+    return {"scan_mb_s": decoded / scan / 1e6, "point_ms": point * 1000, "page_ms": page_time * 1000}
+
+
+def run_variant(path: str, codec: str, dictionaries, args) -> dict:
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    Base.metadata.create_all(engine)
+    if dictionaries:
+        with engine.begin() as conn:
+            for column, data in dictionaries.items():
+                conn.execute(insert(CompressionDictionary).values(column_name=column, data=data))
+    compression.use_engine(engine)
+    settings.COMPRESSION_CODEC = codec
+    result = load(engine, args)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    result["stored_bytes"] = stored_bytes(engine)
+    result["file_bytes"] = os.path.getsize(path)
+    result.update(read(engine, args))
+    engine.dispose()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--point-reads", type=int, default=2000)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    variants = VARIANTS if compression.zstd_available() else [v for v in VARIANTS if v[1] != "zstd"]
+    dictionaries = train_dictionaries(args.seed) if compression.zstd_available() else None
+    workdir = tempfile.mkdtemp(prefix="bench_compression_")
+    original_codec = settings.COMPRESSION_CODEC
+    try:
+        print(f"{args.candidates:,} candidates (~2 screenings each), SQLite, {workdir}")
+        print("=" * 112)
+        print(f"  {'variant':<18} {'text stored':>14} {'ratio':>6} {'db file':>14} {'write rows/s':>13} "
+              f"{'write MB/s':>11} {'scan MB/s':>10} {'point ms':>9} {'page ms':>8}")
+        results = {}
+        for name, codec, use_dictionary in variants:
+            path = os.path.join(workdir, name.replace(" ", "").replace("+", "_") + ".db")
+            r = run_variant(path, codec, dictionaries if use_dictionary else None, args)
+            results[name] = (r, path)
+            print(f"  {name:<18} {r['stored_bytes']:>14,} {r['text_bytes'] / r['stored_bytes']:>5.1f}x "
+                  f"{r['file_bytes']:>14,} {r['write_rows_s']:>13,.0f} {r['write_mb_s']:>11.1f} "
+                  f"{r['scan_mb_s']:>10.1f} {r['point_ms']:>9.3f} {r['page_ms']:>8.2f}")
+
+        # In-place migration of the plain database
+        plain_path = results["plain"][1]
+        migrated = os.path.join(workdir, "migrated.db")
+        shutil.copy(plain_path, migrated)
+        settings.COMPRESSION_CODEC = original_codec
+        engine = create_engine(f"sqlite:///{migrated}")
+        started = time.perf_counter()
+        reports = compression.migrate(engine, train_dictionaries=compression.zstd_available(), vacuum=True)
+        elapsed = time.perf_counter() - started
+        converted = sum(r["rows_converted"] for r in reports)
+        print(f"\n  Migration of the plain database ({original_codec}"
+              f"{' + dictionaries' if compression.zstd_available() else ''}): {converted:,} rows in {elapsed:.1f}s "
+              f"({converted / elapsed:,.0f} rows/s), file {os.path.getsize(plain_path):,} -> {os.path.getsize(migrated):,} bytes")
+        engine.dispose()
+    finally:
+        settings.COMPRESSION_CODEC = original_codec
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
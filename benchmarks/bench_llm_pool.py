@@ -0,0 +1,238 @@
+"""
+Benchmark: LLM call latency with and without pooled keep-alive connections
+
+    python benchmarks/bench_llm_pool.py --tls --setup-delay-ms 40 --concurrency 4 --calls 25
+    python benchmarks/bench_llm_pool.py --serve 8081      # stand-in only, for the app:
+        LLM_BACKEND=rest LLM_BASE_URL=http://127.0.0.1:8081 uvicorn backend.main:app
+
+Starts a local stand-in for the Gemini REST API that answers generateContent
+like LLM_BACKEND=fake (after --llm-latency-ms), optionally over TLS with a
+throwaway self-signed certificate. --setup-delay-ms holds each new connection
+before its handshake, standing in for the network round trips of reaching a
+remote endpoint. Then runs the same calls through services.llm_backend.RestModel
+three ways:
+
+    no reuse     every call opens a new connection (keep-alive expiry 0)
+    pooled       keep-alive pool, connections opened on demand
+    warmed       keep-alive pool, --concurrency connections opened by warm_up()
+
+and reports call latency, the first call of each client, the connection
+reuse rate and the mean connection setup time.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import datetime
+import ipaddress
+import json
+import shutil
+import ssl
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backend import metrics
+from sample_data.synthetic import SyntheticGenerator
+from services.llm_backend import FakeModel, RestModel
+
+MODEL_NAME = "models/gemini-2.0-flash"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Gemini-shaped responses to generateContent and model lookups, over keep-alive HTTP/1.1"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    fake = FakeModel()
+    setup_delay = 0.0
+
+    def setup(self):
+        if self.setup_delay:
+            time.sleep(self.setup_delay)
+        if isinstance(self.request, ssl.SSLSocket):
+            self.request.do_handshake()
+        super().setup()
+
+    def _reply(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._reply(200, {"name": self.path.split("/v1beta/", 1)[-1]})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        if not self.path.endswith(":generateContent"):
+            return self._reply(404, {"error": {"message": "not found"}})
+        prompt = "".join(part.get("text", "") for part in body["contents"][0]["parts"])
+        response = self.fake.generate_content(prompt)
+        self._reply(200, {
+            "candidates": [{"content": {"role": "model", "parts": [{"text": response.text}]}}],
+            "usageMetadata": {
+                "promptTokenCount": response.usage_metadata.prompt_token_count,
+                "candidatesTokenCount": response.usage_metadata.candidates_token_count,
+            },
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    tls_context = None
+
+    def get_request(self):
+        sock, address = super().get_request()
+        if self.tls_context is not None:  # handshake in the connection's thread, after the setup delay
+            sock = self.tls_context.wrap_socket(sock, server_side=True, do_handshake_on_connect=False)
+        return sock, address
+
+
+def self_signed_certificate(directory: str) -> tuple:
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5)).not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), True)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path, key_path = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ))
+    return cert_path, key_path
+
+
+def start_server(args, workdir: str, port: int = 0) -> tuple:
+    StandInHandler.fake = FakeModel(args.llm_latency_ms)
+    StandInHandler.setup_delay = args.setup_delay_ms / 1000
+    server = StandInServer(("127.0.0.1", port), StandInHandler)
+    client_context = True
+    if args.tls:
+        cert_path, key_path = self_signed_certificate(workdir)
+        server.tls_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        server.tls_context.load_cert_chain(cert_path, key_path)
+        client_context = ssl.create_default_context(cafile=cert_path)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    scheme = "https" if args.tls else "http"
+    return server, f"{scheme}://127.0.0.1:{server.server_address[1]}", client_context
+
+
+def connection_counts() -> tuple:
+    setup = metrics.LLM_CONNECT_SECONDS.labels()
+    return (
+        metrics.LLM_CONNECTIONS.labels("new").value,
+        metrics.LLM_CONNECTIONS.labels("reused").value,
+        setup.sum,
+    )
+
+
+def run_mode(name: str, base_url: str, verify, prompts: list, args) -> dict:
+    model = RestModel(
+        MODEL_NAME, base_url, api_key=None, pool_size=args.concurrency,
+        keepalive_seconds=0 if name == "no reuse" else 120, http2=False, verify=verify
+    )
+    new_before, _, setup_before = connection_counts()
+    warm_ms = 0.0
+    if name == "warmed":
+        started = time.perf_counter()
+        model.warm_up(args.concurrency)
+        warm_ms = (time.perf_counter() - started) * 1000
+    # Requests made by warm_up() count as connections too; report the screening calls only
+    new_after_warm, reused_after_warm, _ = connection_counts()
+
+    def client(index: int) -> list:
+        latencies = []
+        for call in range(args.calls):
+            started = time.perf_counter()
+            model.generate_content(prompts[(index * args.calls + call) % len(prompts)])
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        per_client = list(pool.map(client, range(args.concurrency)))
+    model.close()
+
+    new, reused, setup = connection_counts()
+    new_calls, reused_calls = new - new_after_warm, reused - reused_after_warm
+    opened = new - new_before
+    latencies = sorted(latency for client_latencies in per_client for latency in client_latencies)
+    return {
+        "mode": name,
+        "calls": len(latencies),
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "first_ms": statistics.mean(client_latencies[0] for client_latencies in per_client) * 1000,
+        "reuse_rate": reused_calls / max(1, new_calls + reused_calls),
+        "setup_ms": (setup - setup_before) / max(1, opened) * 1000,
+        "warm_ms": warm_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=4, help="client threads (and pool size)")
+    parser.add_argument("--calls", type=int, default=25, help="calls per client thread")
+    parser.add_argument("--llm-latency-ms", type=float, default=20, help="stand-in model time per call")
+    parser.add_argument("--setup-delay-ms", type=float, default=0, help="delay before each new connection's handshake")
+    parser.add_argument("--tls", action="store_true", help="serve HTTPS with a self-signed certificate")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="only run the stand-in server on PORT")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_llm_pool_")
+    try:
+        if args.serve is not None:
+            server, base_url, _ = start_server(args, workdir, args.serve)
+            print(f"stand-in Gemini API at {base_url} (Ctrl+C to stop)")
+            try:
+                threading.Event().wait()
+            except KeyboardInterrupt:
+                server.shutdown()
+            return
+
+        server, base_url, verify = start_server(args, workdir)
+        generator = SyntheticGenerator(seed=3)
+        prompts = [
+            f"Extract structured information from the following resume and return it as a JSON object.\n\n"
+            f"Resume:\n{generator.candidate(i)['candidate']['resume_text']}\n\nReturn a JSON object"
+            for i in range(50)
+        ]
+        print(f"{base_url}: {args.concurrency} clients x {args.calls} calls, model {args.llm_latency_ms:g} ms, "
+              f"connection setup delay {args.setup_delay_ms:g} ms")
+        print("=" * 78)
+        print(f"  {'mode':<10} {'p50 ms':>8} {'p99 ms':>8} {'first call':>11} {'reuse':>7} {'setup ms':>9} {'warm-up ms':>11}")
+        for name in ("no reuse", "pooled", "warmed"):
+            row = run_mode(name, base_url, verify, prompts, args)
+            print(
+                f"  {row['mode']:<10} {row['p50_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['first_ms']:>11.1f}"
+                f" {row['reuse_rate']:>7.1%} {row['setup_ms']:>9.2f} {row['warm_ms']:>11.1f}"
+            )
+        server.shutdown()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
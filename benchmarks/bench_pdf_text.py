@@ -0,0 +1,99 @@
+"""
+Benchmark: PDF text engines, pages/sec and extraction quality
+
+    python benchmarks/bench_pdf_text.py --resumes 60
+
+Renders generated resumes in three layouts (sample_data.synthetic.render_pdf):
+plain lines, words positioned one by one without space characters, and two
+columns drawn row by row. Each installed engine of services.pdf_text, and
+"auto", extracts every PDF. Quality is measured against the source text:
+
+    words   share of the source words found as whitespace-separated tokens
+            (words run together or broken apart are missed)
+    order   share of adjacent source word pairs that are still adjacent
+            (interleaved columns break it)
+    score   the engine-independent text_quality() heuristic auto mode uses
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+from collections import Counter
+from typing import Dict, List
+
+from sample_data.synthetic import SyntheticGenerator, render_pdf
+from services import pdf_text
+
+LAYOUTS = ("plain", "positioned", "columns")
+
+
+def word_recall(source: List[str], extracted: List[str]) -> float:
+    found = Counter(extracted)
+    return sum(min(count, found[word]) for word, count in Counter(source).items()) / max(1, len(source))
+
+
+def order_kept(source: List[str], extracted: List[str]) -> float:
+    pairs = Counter(zip(extracted, extracted[1:]))
+    wanted = Counter(zip(source, source[1:]))
+    return sum(min(count, pairs[pair]) for pair, count in wanted.items()) / max(1, sum(wanted.values()))
+
+
+def run(engine: str, corpus: List[tuple]) -> Dict[str, dict]:
+    pdf_text.extract(corpus[0][2], engine)  # import the engine outside the timing
+    results = {}
+    for layout in LAYOUTS:
+        docs = [(words, pdf) for doc_layout, words, pdf in corpus if doc_layout == layout]
+        pages = 0
+        recall = order = score = 0.0
+        chosen = Counter()
+        started = time.perf_counter()
+        extractions = [pdf_text.extract(pdf, engine) for _, pdf in docs]
+        elapsed = time.perf_counter() - started
+        for (words, _), extraction in zip(docs, extractions):
+            tokens = extraction.text.split()
+            pages += extraction.pages
+            recall += word_recall(words, tokens)
+            order += order_kept(words, tokens)
+            score += extraction.quality
+            chosen[extraction.engine] += 1
+        results[layout] = {
+            "pages_per_sec": pages / elapsed,
+            "words": recall / len(docs),
+            "order": order / len(docs),
+            "score": score / len(docs),
+            "chosen": ", ".join(f"{name} {count}" for name, count in chosen.most_common()),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resumes", type=int, default=60, help="resumes per layout")
+    parser.add_argument("--lines-per-page", type=int, default=40, help="smaller values give multi-page PDFs")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    generator = SyntheticGenerator(seed=args.seed)
+    texts = [generator.candidate(i)["candidate"]["resume_text"] for i in range(1, args.resumes + 1)]
+    corpus = [
+        (layout, text.split(), render_pdf(text, lines_per_page=args.lines_per_page, layout=layout))
+        for layout in LAYOUTS for text in texts
+    ]
+    engines = pdf_text.installed()
+    missing = [engine for engine in pdf_text.ENGINES if engine not in engines]
+    print(f"{args.resumes} resumes x {len(LAYOUTS)} layouts; engines: {', '.join(engines)}"
+          + (f" (not installed: {', '.join(missing)})" if missing else ""))
+    print("=" * 86)
+    print(f"  {'engine':<9} {'layout':<11} {'pages/s':>9} {'words':>7} {'order':>7} {'score':>7}  chosen")
+    for engine in engines + ["auto"]:
+        for layout, row in run(engine, corpus).items():
+            print(
+                f"  {engine:<9} {layout:<11} {row['pages_per_sec']:>9.0f} {row['words']:>7.1%}"
+                f" {row['order']:>7.1%} {row['score']:>7.3f}  {row['chosen'] if engine == 'auto' else ''}"
+            )
+
+
+if __name__ == "__main__":
+    main()
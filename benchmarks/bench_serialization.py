@@ -0,0 +1,84 @@
+"""
+Microbenchmark: list-page serialization, hand-built dicts + stdlib JSON vs
+pre-built serializers + orjson
+
+    python benchmarks/bench_serialization.py --rows 1000 --repeat 50
+
+Rows are transient ORM objects (no database), so only the serialization
+cost is measured.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from fastapi.responses import JSONResponse
+
+from backend.models import Candidate, ScreeningRecord
+from backend.serializers import FastJSONResponse, screening_summary, serialize_all
+from sample_data.synthetic import SyntheticGenerator
+
+
+def build_rows(count: int):
+    generator = SyntheticGenerator(seed=1)
+    rows = []
+    for idx in range(1, count + 1):
+        data = generator.candidate(idx)
+        candidate_row = dict(data["candidate"])
+        candidate = Candidate(**candidate_row)
+        screening = ScreeningRecord(id=idx, **{k: v for k, v in generator.screening(data).items() if k != "job_description"})
+        screening.candidate = candidate
+        rows.append(screening)
+    return rows
+
+
+def legacy(screenings):
+    """The list comprehension /api/screenings/ used before typed serializers"""
+    body = {"screenings": [{"id": s.id, "candidate_id": s.candidate_id, "candidate_name": s.candidate.name, "candidate_email": s.candidate.email, "job_title": s.job_title, "match_score": s.match_score, "recommended_action": s.recommended_action, "justification": s.justification, "strengths": s.strengths, "concerns": s.concerns, "screened_at": s.screened_at.isoformat() if s.screened_at else None} for s in screenings], "skip": 0, "limit": len(screenings), "count": len(screenings)}
+    return JSONResponse(content=body).body
+
+
+def fast(screenings):
+    body = {"screenings": serialize_all(screening_summary, screenings), "skip": 0, "limit": len(screenings), "count": len(screenings)}
+    return FastJSONResponse(content=body).body
+
+
+def measure(fn, rows, repeat):
+    fn(rows)  # warm-up
+    gc.collect()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(rows)
+    per_call = (time.perf_counter() - started) / repeat
+
+    tracemalloc.start()
+    fn(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_call, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    print(f"Serializing a {args.rows}-row /api/screenings/ page, {args.repeat} iterations")
+    print("=" * 60)
+    results = {}
+    for name, fn in (("dict + json (legacy)", legacy), ("serializers + orjson", fast)):
+        per_call, peak = measure(fn, rows, args.repeat)
+        results[name] = per_call
+        print(f"  {name:<24} {per_call * 1000:8.2f} ms/page   peak alloc {peak / 1024:8.1f} KiB")
+    speedup = results["dict + json (legacy)"] / results["serializers + orjson"]
+    print(f"\n  Speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Check: local GPA matches and LLM GPAs combine per education entry
+
+    python benchmarks/check_gpa_extraction.py
+
+Runs ``ResumeExtractor.extract_candidate_data`` on small resumes with a stub
+LLM that returns a GPA only when the extraction prompt asks for one (as a
+real model would). Each case lists the GPA every education entry must end
+up with: labelled GPAs come from the regex pass, unlabelled ones only from
+the LLM. Exits non-zero on any failure.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import tempfile
+
+os.environ.update(
+    LLM_BACKEND="fake",
+    CACHE_DIR=tempfile.mkdtemp(prefix="check_gpa_"),
+    CACHE_LLM_TTL_SECONDS="0",
+)
+
+import json
+import types
+from typing import List, NamedTuple, Optional
+
+import services.resume_extractor as resume_extractor
+from services.resume_extractor import ResumeExtractor
+
+
+class Case(NamedTuple):
+    name: str
+    text: str
+    llm_education: List[dict]  # what the model reads off the resume, GPA included
+    expected: List[Optional[str]]  # GPA per entry after extraction
+
+
+CASES = [
+    Case(
+        "labelled + unlabelled GPA",
+        "Jane Doe\njane@example.com\n\nEDUCATION\n"
+        "M.S. Computer Science, Stanford University, 2022\nGPA: 3.9/4.0\n"
+        "B.S. Computer Science, UCLA, 2020, 3.6/4.0\n",
+        [{"degree": "M.S. Computer Science", "institution": "Stanford University", "year": "2022", "gpa": "3.9/4.0"},
+         {"degree": "B.S. Computer Science", "institution": "UCLA", "year": "2020", "gpa": "3.6/4.0"}],
+        ["3.9/4", "3.6/4.0"],
+    ),
+    Case(
+        "labelled GPA the model missed",
+        "John Roe\njohn@example.com\n\nEDUCATION\n"
+        "M.Tech, IIT Bombay, 2021\nCGPA: 8.7/10\n"
+        "B.Tech, NIT Trichy, 2019\n",
+        [{"degree": "M.Tech", "institution": "IIT Bombay", "year": "2021", "gpa": None},
+         {"degree": "B.Tech", "institution": "NIT Trichy", "year": "2019", "gpa": None}],
+        ["8.7/10", None],
+    ),
+    Case(
+        "institutions worded differently",
+        "Ann Poe\nann@example.com\n\nEDUCATION\n"
+        "Massachusetts Inst. of Technology, Ph.D.\nGPA: 4.8/5.0\n"
+        "Univ. of Calif., Berkeley, B.A.\nGPA: 3.7/4.0\n",
+        [{"degree": "Ph.D.", "institution": "MIT", "year": None, "gpa": None},
+         {"degree": "B.A.", "institution": "UC Berkeley", "year": None, "gpa": "3.7"}],
+        ["4.8/5", "3.7/4"],
+    ),
+]
+
+
+class StubModel:
+    """Answers extraction prompts with ``education``, dropping GPAs the prompt does not ask for"""
+
+    def __init__(self, education: List[dict]):
+        self.education = education
+
+    def generate_content(self, prompt, **kwargs):
+        asks_gpa = '"gpa"' in prompt
+        education = [{k: v for k, v in entry.items() if k != "gpa" or asks_gpa} for entry in self.education]
+        body = {"name": "Candidate", "location": None, "skills": [], "experience": [], "education": education,
+                "total_experience_years": 0, "certifications": [], "summary": ""}
+        return types.SimpleNamespace(text=json.dumps(body), usage_metadata=None)
+
+
+def main():
+    failures = 0
+    for case in CASES:
+        resume_extractor.model = StubModel(case.llm_education)
+        profile = ResumeExtractor.extract_candidate_data(case.text)
+        got = [entry.gpa for entry in profile.education]
+        ok = got == case.expected
+        print(f"  {'ok  ' if ok else 'FAIL'}  {case.name}")
+        if not ok:
+            print(f"          expected {case.expected}, got {got}")
+        failures += not ok
+    if failures:
+        print(f"\n{failures} check(s) failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Check: a profiled upload's flame data shows the screening pipeline
+
+    python benchmarks/check_profiling.py
+
+Posts one resume to /api/analyze/ and /api/analyze/multi with the profiling
+token header, through the app on a temporary database, with
+``LLM_BACKEND=fake`` (a blocking 300 ms delay per LLM call). The pipeline runs
+on worker threads, so the stored samples must come from there: a check fails
+if no sample has a resume_extractor or llm_backend frame, or if most samples
+are the idle event loop. Exits non-zero on any failure.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import tempfile
+
+_workdir = tempfile.mkdtemp(prefix="check_profiling_")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(_workdir, 'profiling.db')}",
+    CACHE_DIR=os.path.join(_workdir, "cache"),
+    PROFILING_DIR=os.path.join(_workdir, "profiles"),
+    PROFILING_TOKEN="check-profiling",
+    PROFILING_INTERVAL_MS="5",
+    LLM_BACKEND="fake",
+    LLM_FAKE_LATENCY_MS="300",
+    LLM_FAKE_JITTER_MS="0",
+    LOG_FILE=os.path.join(_workdir, "app.log"),
+)
+
+import shutil
+from typing import List
+
+from fastapi.testclient import TestClient
+
+from backend import profiling
+from backend.main import app
+from sample_data.synthetic import SyntheticGenerator, render_pdf
+
+PIPELINE_FRAMES = ("resume_extractor.py:", "llm_backend.py:")
+IDLE_FRAMES = ("selectors.py:select",)
+
+
+def check_profile(profile_id: str) -> List[str]:
+    """Problems with one stored profile (empty when it is fine)"""
+    data = profiling.load(profile_id)
+    if data is None:
+        return ["profile was not stored"]
+    samples = data["samples"]
+    total = sum(samples.values())
+    pipeline = sum(count for stack, count in samples.items() if any(frame in stack for frame in PIPELINE_FRAMES))
+    idle = sum(count for stack, count in samples.items() if any(frame in stack for frame in IDLE_FRAMES))
+    print(f"        {total} samples: {pipeline} in the pipeline, {idle} idle event loop")
+    problems = []
+    if not pipeline:
+        problems.append("no sample has a resume_extractor/llm_backend frame")
+    if idle * 2 > total:
+        problems.append("most samples are the idle event loop")
+    return problems
+
+
+def main():
+    generator = SyntheticGenerator(seed=11)
+    jobs = [job["description"] for job in generator.job_descriptions][:3]
+    headers = {"X-Profile-Token": "check-profiling"}
+    failures = 0
+    try:
+        with TestClient(app) as client:
+            requests = [
+                ("/api/analyze/", {"job_description": jobs[0]}, 1),
+                ("/api/analyze/multi", {"job_descriptions": jobs}, 2),
+            ]
+            for path, form, seed in requests:
+                pdf = render_pdf(generator.candidate(seed)["candidate"]["resume_text"])
+                response = client.post(path, files={"file": ("resume.pdf", pdf, "application/pdf")}, data=form, headers=headers)
+                profile_id = response.headers.get("X-Profile-Id")
+                problems = [f"status {response.status_code}"] if response.status_code != 200 else []
+                if profile_id is None:
+                    problems.append("request was not profiled")
+                else:
+                    problems += check_profile(profile_id)
+                print(f"  {'ok  ' if not problems else 'FAIL'}  {path}")
+                for problem in problems:
+                    print(f"          {problem}")
+                failures += bool(problems)
+    finally:
+        shutil.rmtree(_workdir, ignore_errors=True)
+    if failures:
+        print(f"\n{failures} check(s) failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Check: every DatabaseService list/lookup query is served by an index
+
+    python benchmarks/check_query_plans.py --candidates 5000
+
+Builds a temporary SQLite database through ``backend.migrations``, loads a
+seeded synthetic dataset and runs ANALYZE. Each check calls one
+DatabaseService method, captures the SELECTs it emits and runs
+``EXPLAIN QUERY PLAN`` on them with the same parameters. A check fails if
+its expected index is not used, or if the plan full-scans a table or sorts
+through a temporary B-tree where the index should provide the order. Exits
+non-zero on any failure, so it can run in CI after schema changes.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("GEMINI_API_KEY", "unused")  # services import the LLM client at module load
+
+import argparse
+import hashlib
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from typing import Callable, List, NamedTuple, Tuple
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session
+
+from backend import analytics, cache, migrations
+from backend.db_service import DatabaseService
+from backend.models import Candidate, Education, Experience, ResumeLSHBand, ScreeningRecord
+from sample_data.synthetic import SyntheticGenerator
+from services import near_duplicate
+
+
+class Check(NamedTuple):
+    name: str
+    call: Callable  # (session, sample) -> None
+    indexes: Tuple[str, ...]  # each must appear in some captured plan ("a|b": either one)
+    forbid: Tuple[str, ...] = ("SCAN screening_records", "SCAN candidates", "USE TEMP B-TREE FOR ORDER BY")
+
+
+def checks() -> List[Check]:
+    db = DatabaseService
+    return [
+        Check("get_screening_records(action, min_score)",
+              lambda s, x: db.get_screening_records(s, limit=50, min_score=7, recommended_action="Shortlist"),
+              ("ix_screening_records_action_screened_score",)),
+        Check("get_screening_records(action)",
+              lambda s, x: db.get_screening_records(s, limit=50, recommended_action="Reject"),
+              ("ix_screening_records_action_screened_score",)),
+        Check("get_screening_records()",
+              lambda s, x: db.get_screening_records(s, limit=50, min_score=5),
+              ("ix_screening_records_screened_at",),
+              forbid=("SCAN candidates", "USE TEMP B-TREE FOR ORDER BY")),
+        Check("get_candidate_screening_history",
+              lambda s, x: db.get_candidate_screening_history(s, x["candidate_id"]),
+              ("ix_screening_records_candidate_screened",)),
+        Check("get_screening_for_job",
+              lambda s, x: db.get_screening_for_job(s, x["candidate_id"], x["job_description"]),
+              ("ix_screening_records_candidate_screened",)),
+        Check("get_shortlisted_candidates",
+              lambda s, x: db.get_shortlisted_candidates(s, limit=50),
+              ("ix_screening_records_action_candidate",),
+              forbid=("SCAN screening_records", "SCAN candidates")),  # ordering by score is over the grouped rows
+        Check("get_database_stats",
+              lambda s, x: db.get_database_stats(s),
+              ("ix_screening_records_action_candidate|ix_screening_records_action_screened_score",),
+              forbid=()),  # total counts scan the narrowest covering index, which is expected
+        Check("get_candidate_by_email",
+              lambda s, x: db.get_candidate_by_email(s, x["email"]),
+              ("ix_candidates_email",)),
+        Check("get_candidate_by_resume_hash",
+              lambda s, x: db.get_candidate_by_resume_hash(s, x["resume_sha256"]),
+              ("ix_candidates_resume_sha256", "ix_experiences_candidate_id", "ix_educations_candidate_id"),
+              forbid=("SCAN candidates", "SCAN experiences", "SCAN educations")),
+        Check("get_candidate_by_id",
+              lambda s, x: db.get_candidate_by_id(s, x["candidate_id"]),
+              ("ix_experiences_candidate_id", "ix_educations_candidate_id"),
+              forbid=("SCAN candidates", "SCAN experiences", "SCAN educations")),
+        # A bounded created_at range; an open-ended one ordered by id (find_candidate_ids) is
+        # cheaper as a rowid scan without STAT4 range statistics, and SQLite picks that
+        Check("iter_candidates_export(start, end)",
+              lambda s, x: list(db.iter_candidates_export(s, start=x["recent"], end=x["recent"] + timedelta(days=1))),
+              ("ix_candidates_created_at",),
+              forbid=("SCAN candidates",)),
+        Check("analytics.summary(job_hash)",
+              lambda s, x: analytics.summary(s, job_hash=x["job_hash"], days=analytics.MAX_DAYS),
+              ("ix_screening_rollups_job_day",),
+              forbid=("SCAN screening_rollups",)),
+        Check("find_near_duplicate",
+              lambda s, x: db.find_near_duplicate(s, x["signature"], 0.8),
+              ("ix_resume_lsh_bands_band_bucket",),
+              forbid=("SCAN resume_lsh_bands", "SCAN candidates")),
+    ]
+
+
+def load(engine, args) -> dict:
+    generator = SyntheticGenerator(seed=args.seed)
+    sample = None
+    for candidates, experiences, educations, screenings in generator.iter_batches(args.candidates, 1, 1000, 2.0):
+        bands = []
+        for candidate in candidates:
+            candidate["resume_sha256"] = hashlib.sha256(candidate["resume_text"].encode("utf-8")).hexdigest()
+            candidate["minhash_signature"] = None
+        for candidate in candidates[:args.lsh_per_batch]:
+            signature = near_duplicate.signature(candidate["resume_text"])
+            candidate["minhash_signature"] = near_duplicate.signature_to_bytes(signature)
+            bands.extend(
+                {"candidate_id": candidate["id"], "band": band, "bucket": bucket}
+                for band, bucket in enumerate(near_duplicate.band_buckets(signature))
+            )
+        with engine.begin() as conn:
+            conn.execute(insert(Candidate), candidates)
+            conn.execute(insert(Experience), experiences)
+            conn.execute(insert(Education), educations)
+            conn.execute(insert(ScreeningRecord), screenings)
+            if bands:
+                conn.execute(insert(ResumeLSHBand), bands)
+        if sample is None:
+            first = candidates[0]
+            sample = {
+                "candidate_id": first["id"],
+                "email": first["email"],
+                "resume_sha256": first["resume_sha256"],
+                "job_description": next(s["job_description"] for s in screenings if s["candidate_id"] == first["id"]),
+                "signature": near_duplicate.signature(first["resume_text"]),
+            }
+    sample["recent"] = datetime.utcnow() - timedelta(days=3)
+    sample["job_hash"] = analytics.job_hash(sample["job_description"])
+    analytics.rebuild(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return sample
+
+
+def run_check(engine, check: Check, sample: dict) -> Tuple[bool, List[str]]:
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with Session(engine) as session:
+            check.call(session, sample)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    plan_lines = []
+    with engine.connect() as conn:
+        for statement, parameters in captured:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            plan_lines.extend(row[-1] for row in rows)
+    plan = "\n".join(plan_lines)
+    problems = [
+        f"missing index {name}" for name in check.indexes
+        if not any(alternative in plan for alternative in name.split("|"))
+    ]
+    problems += [
+        f"plan has '{line}'" for line in plan_lines
+        if any(line == bad or line.startswith(bad + " ") for bad in check.forbid)
+    ]
+    return not problems, problems + [f"    {line}" for line in plan_lines] if problems else plan_lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=5000)
+    parser.add_argument("--lsh-per-batch", type=int, default=100, help="candidates per 1000 given LSH bands")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="check_plans_")
+    try:
+        cache.configure(os.path.join(workdir, "cache"), redis_url="")
+        engine = create_engine(f"sqlite:///{os.path.join(workdir, 'plans.db')}")
+        migrations.migrate(engine)
+        sample = load(engine, args)
+        print(f"{args.candidates:,} candidates, schema version {max(migrations.applied_versions(engine))}")
+        print("=" * 60)
+        failures = 0
+        for check in checks():
+            ok, lines = run_check(engine, check, sample)
+            failures += not ok
+            print(f"  {'ok  ' if ok else 'FAIL'}  {check.name}")
+            if not ok or args.verbose:
+                for line in lines:
+                    print(f"          {line}")
+        engine.dispose()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if failures:
+        print(f"\n{failures} check(s) failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
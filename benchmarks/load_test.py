@@ -0,0 +1,325 @@
+"""
+Load test: throughput and latency percentiles of the API under a request mix
+
+    python benchmarks/load_test.py --spawn --workers 1 --concurrency 1,2,4,8,16,32
+    python benchmarks/load_test.py --spawn --workers 4 --concurrency 32 --duration 60
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --rate 20 --duration 60
+
+Drives /api/analyze/ (generated resume PDFs x job descriptions, each pair
+uploaded once), /api/screenings/, /api/candidates/{id} and /api/stats/ in the
+proportions given by --mix, and reports requests/s and p50/p95/p99 latency
+per endpoint, the share of errors and of 503s from admission control.
+
+Closed loop (default): --concurrency clients each send their next request as
+soon as the previous one returns; running several levels shows where one
+server saturates (throughput stops rising while latency climbs). Open loop
+(--rate): requests arrive as a Poisson process whatever the server does, with
+at most --concurrency outstanding; latency is measured from the scheduled
+arrival, so time spent waiting for a connection counts against the server.
+
+--spawn starts ``uvicorn backend.main:app --workers N`` on a temporary
+database with LLM_BACKEND=fake, so screening costs --llm-latency-ms of
+simulated model time and no API quota. Against --url, the server's own
+configuration applies.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import asyncio
+import json
+import random
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional
+
+import httpx
+
+from sample_data.synthetic import SyntheticGenerator, render_pdf
+
+ENDPOINTS = ("analyze", "screenings", "candidate", "stats")
+DEFAULT_MIX = "analyze=1,screenings=4,candidate=4,stats=1"
+ADMIN_PASSWORD = "load-test"
+
+
+class Sample(NamedTuple):
+    endpoint: str
+    status: int  # 0: connection error / timeout
+    latency: float  # seconds
+    started: float
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint {name!r} (expected {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+
+class Workload:
+    """Request bodies and ids shared by all clients"""
+
+    def __init__(self, resumes: int, seed: int):
+        generator = SyntheticGenerator(seed=seed)
+        self.pdfs = [
+            render_pdf(generator.candidate(candidate_id)["candidate"]["resume_text"])
+            for candidate_id in range(1, resumes + 1)
+        ]
+        self.jobs = [job["description"] for job in generator.job_descriptions]
+        self.candidate_ids: List[int] = []
+        self.rng = random.Random(seed)
+        self._uploads = 0
+
+    def next_upload(self) -> tuple:
+        """(filename, pdf, job description); every resume/job pair is new until all are used"""
+        index = self._uploads
+        self._uploads += 1
+        resume, job = index % len(self.pdfs), (index // len(self.pdfs)) % len(self.jobs)
+        return f"load_{resume}.pdf", self.pdfs[resume], self.jobs[job]
+
+    def pick(self, mix: Dict[str, float]) -> str:
+        return self.rng.choices(list(mix), weights=list(mix.values()))[0]
+
+
+async def request(client: httpx.AsyncClient, workload: Workload, endpoint: str) -> int:
+    if endpoint == "analyze":
+        filename, pdf, job = workload.next_upload()
+        response = await client.post(
+            "/api/analyze/", files={"file": (filename, pdf, "application/pdf")}, data={"job_description": job}
+        )
+        if response.status_code == 200:
+            candidate_id = response.json().get("candidate_id")
+            if candidate_id and candidate_id not in workload.candidate_ids:
+                workload.candidate_ids.append(candidate_id)
+    elif endpoint == "screenings":
+        response = await client.get("/api/screenings/", params={"limit": 50})
+    elif endpoint == "candidate":
+        if not workload.candidate_ids:
+            return await request(client, workload, "stats")
+        response = await client.get(f"/api/candidates/{workload.rng.choice(workload.candidate_ids)}")
+    else:
+        response = await client.get("/api/stats/")
+    return response.status_code
+
+
+async def timed(client, workload, endpoint: str, samples: List[Sample], started: float) -> None:
+    try:
+        status = await request(client, workload, endpoint)
+    except httpx.HTTPError:
+        status = 0
+    samples.append(Sample(endpoint, status, time.perf_counter() - started, started))
+
+
+async def closed_loop(client, workload, mix, concurrency: int, duration: float) -> List[Sample]:
+    samples: List[Sample] = []
+    deadline = time.perf_counter() + duration
+
+    async def user():
+        while time.perf_counter() < deadline:
+            await timed(client, workload, workload.pick(mix), samples, time.perf_counter())
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return samples
+
+
+async def open_loop(client, workload, mix, rate: float, concurrency: int, duration: float) -> List[Sample]:
+    samples: List[Sample] = []
+    slots = asyncio.Semaphore(concurrency)
+    tasks = []
+
+    async def arrival(endpoint: str, scheduled: float):
+        async with slots:
+            await timed(client, workload, endpoint, samples, scheduled)
+
+    now = start = time.perf_counter()
+    scheduled = start
+    while scheduled < start + duration:
+        if scheduled > now:
+            await asyncio.sleep(scheduled - now)
+        tasks.append(asyncio.ensure_future(arrival(workload.pick(mix), scheduled)))
+        scheduled += workload.rng.expovariate(rate)
+        now = time.perf_counter()
+    await asyncio.gather(*tasks)
+    return samples
+
+
+def summarize(samples: List[Sample], since: float) -> Dict[str, dict]:
+    """Per-endpoint (and "all") stats of the samples that started at or after ``since``"""
+    by_endpoint: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in samples:
+        if sample.started >= since:
+            by_endpoint[sample.endpoint].append(sample)
+            by_endpoint["all"].append(sample)
+    if not by_endpoint:
+        return {}
+    window = max(s.started + s.latency for s in by_endpoint["all"]) - since
+    report = {}
+    for endpoint in [*ENDPOINTS, "all"]:
+        rows = by_endpoint.get(endpoint)
+        if not rows:
+            continue
+        latencies = sorted(s.latency for s in rows)
+        report[endpoint] = {
+            "requests": len(rows),
+            "rps": len(rows) / window,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "error_rate": sum(not 200 <= s.status < 300 for s in rows) / len(rows),
+            "overload_rate": sum(s.status == 503 for s in rows) / len(rows),
+        }
+    return report
+
+
+def print_report(title: str, report: Dict[str, dict]) -> None:
+    print(f"\n{title}")
+    print(f"  {'endpoint':<11} {'requests':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'503s':>6}")
+    for endpoint, row in report.items():
+        print(
+            f"  {endpoint:<11} {row['requests']:>8} {row['rps']:>8.1f} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f}"
+            f" {row['p99_ms']:>8.1f} {row['error_rate']:>7.1%} {row['overload_rate']:>6.1%}"
+        )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn_server(workdir: str, args) -> tuple:
+    port = free_port()
+    env = dict(
+        os.environ,
+        LLM_BACKEND="fake",
+        LLM_FAKE_LATENCY_MS=str(args.llm_latency_ms),
+        LLM_FAKE_JITTER_MS=str(args.llm_latency_ms / 4),
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'load.db')}",
+        CACHE_DIR=os.path.join(workdir, "cache"),
+        LOG_FILE=os.path.join(workdir, "load.log"),
+        PROFILING_DIR=os.path.join(workdir, "profiles"),
+        ADMIN_PASSWORD=ADMIN_PASSWORD,
+        LOG_LEVEL="WARNING",
+    )
+    command = [
+        sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(args.workers), "--log-level", "warning", "--no-access-log",
+    ]
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    process = subprocess.Popen(command, cwd=root, env=env)
+    return process, f"http://127.0.0.1:{port}"
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 60.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            if (await client.get("/api/auth/check")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        if time.perf_counter() > deadline:
+            raise SystemExit("server did not become ready")
+        await asyncio.sleep(0.2)
+
+
+async def run(base_url: str, args) -> dict:
+    mix = parse_mix(args.mix)
+    levels = [int(level) for level in str(args.concurrency).split(",")]
+    workload = Workload(args.resumes, args.seed)
+    limits = httpx.Limits(max_connections=max(levels) + 4, max_keepalive_connections=max(levels) + 4)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        await wait_ready(client)
+        login = await client.post("/api/login", data={"username": args.username, "password": args.password})
+        if login.status_code != 200:
+            raise SystemExit(f"login failed ({login.status_code})")
+        for _ in range(args.seed_uploads):  # something for the read endpoints to return
+            await request(client, workload, "analyze")
+
+        results = {}
+        for level in levels:
+            started = time.perf_counter()
+            if args.rate:
+                samples = await open_loop(client, workload, mix, args.rate, level, args.warmup + args.duration)
+                title = f"open loop: {args.rate:g} req/s, at most {level} outstanding"
+            else:
+                samples = await closed_loop(client, workload, mix, level, args.warmup + args.duration)
+                title = f"closed loop: {level} concurrent clients"
+            report = summarize(samples, started + args.warmup)
+            print_report(title, report)
+            results[level] = report
+
+    if len(levels) > 1:
+        print("\nscaling (all endpoints)")
+        print(f"  {'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'analyze/s':>9} {'analyze p99':>11} {'errors':>7}")
+        for level, report in results.items():
+            total, analyze = report.get("all", {}), report.get("analyze", {})
+            print(
+                f"  {level:>7} {total.get('rps', 0):>8.1f} {total.get('p50_ms', 0):>8.1f} {total.get('p99_ms', 0):>8.1f}"
+                f" {analyze.get('rps', 0):>9.2f} {analyze.get('p99_ms', 0):>11.1f} {total.get('error_rate', 0):>7.1%}"
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="server to load, e.g. http://127.0.0.1:8000")
+    target.add_argument("--spawn", action="store_true", help="start a local server with the fake LLM backend")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --spawn")
+    parser.add_argument("--llm-latency-ms", type=float, default=800, help="simulated LLM call time with --spawn")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"endpoint weights (default {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", default="8", help="clients (closed loop) or max outstanding (--rate); "
+                                                          "a comma-separated list runs each level in turn")
+    parser.add_argument("--rate", type=float, help="open loop: mean arrivals per second")
+    parser.add_argument("--duration", type=float, default=20, help="measured seconds per level")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds before each level")
+    parser.add_argument("--timeout", type=float, default=60, help="per-request timeout, seconds")
+    parser.add_argument("--resumes", type=int, default=200, help="distinct generated resume PDFs")
+    parser.add_argument("--seed-uploads", type=int, default=10, help="uploads before measuring")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", help="admin password (default: ADMIN_PASSWORD, or the spawned server's)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    process = workdir = None
+    if args.spawn:
+        workdir = tempfile.mkdtemp(prefix="load_test_")
+        process, base_url = spawn_server(workdir, args)
+        args.password = args.password or ADMIN_PASSWORD
+        print(f"spawned {base_url} with {args.workers} worker(s), fake LLM at {args.llm_latency_ms:g} ms")
+    else:
+        base_url = args.url
+        args.password = args.password or os.getenv("ADMIN_PASSWORD", "admin123")
+    try:
+        results = asyncio.run(run(base_url, args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+            shutil.rmtree(workdir, ignore_errors=True)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import { useNavigate } from "react-router-dom";
 import { motion, AnimatePresence } from "framer-motion";
 import Navbar from "../components/Navbar";
@@ -7,6 +7,24 @@ import { API_ENDPOINTS, STATUS } from "../utils/constants";
 import { cn } from "../utils/cn";
 import { ExpandableCard } from "../components/ui/ExpandableCardOptimized";
 
+// Snapshot size (/api/dashboard default); live inserts keep the list at this length
+const SCREENING_LIMIT = 100;
+const ACTION_STATS = { Shortlist: "shortlisted", Maybe: "maybe", Reject: "rejected" };
+
+const adjustStats = (stats, changes) => {
+  const next = { ...stats };
+  for (const [key, delta] of Object.entries(changes)) {
+    next[key] = (next[key] || 0) + delta;
+  }
+  return next;
+};
+
+const screeningChanges = (action, step) => {
+  const changes = { total_screenings: step };
+  if (ACTION_STATS[action]) changes[ACTION_STATS[action]] = step;
+  return changes;
+};
+
 export default function Dashboard() {
   const [stats, setStats] = useState({});
   const [screenings, setScreenings] = useState([]);
@@ -14,69 +32,98 @@ export default function Dashboard() {
   const [loading, setLoading] = useState(true);
   const [isAuthenticated, setIsAuthenticated] = useState(false);
   const navigate = useNavigate();
+  const seqRef = useRef(0); // change feed position of what is on screen
+  const sourceRef = useRef(null);
 
   useEffect(() => {
     checkAuthAndFetchData();
+    return () => sourceRef.current?.close();
   }, []);
 
   const checkAuthAndFetchData = async () => {
-    try {
-      console.log("Dashboard: Checking authentication...");
-      
-      // First, check authentication with a lightweight request
-      const authCheckRes = await fetch(API_ENDPOINTS.GET_STATS, { 
-        credentials: "include",
-        method: "HEAD" // Use HEAD to avoid fetching full data
-      });
+    // The snapshot endpoint answers 401 when not logged in, so it doubles as the auth check
+    const authenticated = await fetchData();
+    if (authenticated) {
+      setIsAuthenticated(true);
+      subscribe();
+    }
+  };
 
-      // If not authenticated, redirect immediately before loading any UI
-      if (authCheckRes.status === 401) {
-        console.log("Dashboard: Not authenticated - redirecting to login");
-        navigate("/login", { replace: true });
-        return;
+  // Live updates: change events from /api/events are applied to the snapshot
+  // instead of refetching it. EventSource reconnects on its own and resumes
+  // from the last event it saw (Last-Event-ID).
+  const subscribe = () => {
+    sourceRef.current?.close();
+    const source = new EventSource(`${API_ENDPOINTS.EVENTS}?after=${seqRef.current}`, {
+      withCredentials: true,
+    });
+    source.onmessage = (message) => applyChange(JSON.parse(message.data));
+    source.addEventListener("reset", async () => {
+      // The events we missed were pruned: reload the snapshot and follow on from it
+      source.close();
+      if (await fetchData()) {
+        subscribe();
       }
+    });
+    sourceRef.current = source;
+  };
 
-      // User is authenticated, now fetch data
-      setIsAuthenticated(true);
-      await fetchData();
-    } catch (error) {
-      console.error("Dashboard: Auth check error:", error);
-      navigate("/login", { replace: true });
+  const applyChange = ({ seq, entity, op, id, data }) => {
+    if (seq <= seqRef.current) return; // already applied
+    seqRef.current = seq;
+
+    if (entity === "screening" && op === "insert") {
+      setStats((prev) => adjustStats(prev, screeningChanges(data.recommended_action, 1)));
+      setScreenings((prev) => [data, ...prev.filter((s) => s.id !== id)].slice(0, SCREENING_LIMIT));
+    } else if (entity === "screening" && op === "delete") {
+      setStats((prev) => adjustStats(prev, screeningChanges(data.recommended_action, -1)));
+      setScreenings((prev) => prev.filter((s) => s.id !== id));
+    } else if (entity === "candidate" && op === "insert") {
+      setStats((prev) => adjustStats(prev, { total_candidates: 1 }));
+    } else if (entity === "candidate" && op === "update") {
+      setScreenings((prev) =>
+        prev.map((s) => (s.candidate_id === id ? { ...s, candidate_name: data.name, candidate_email: data.email } : s))
+      );
+    } else if (entity === "candidate" && op === "delete") {
+      // Its screenings arrive as screening deletes just before this
+      setStats((prev) => adjustStats(prev, { total_candidates: -1 }));
     }
   };
 
   const fetchData = async () => {
     try {
-      console.log("Dashboard: Fetching data with credentials...");
-      
-      const [statsRes, screeningsRes] = await Promise.all([
-        fetch(API_ENDPOINTS.GET_STATS, { credentials: "include" }),
-        fetch(API_ENDPOINTS.GET_SCREENINGS, { credentials: "include" }),
-      ]);
+      console.log("Dashboard: Fetching snapshot with credentials...");
+
+      // Single stats + screenings snapshot; the browser revalidates it with
+      // If-None-Match, so repeat views cost a 304 when nothing has changed.
+      const response = await fetch(API_ENDPOINTS.GET_DASHBOARD, {
+        credentials: "include",
+        cache: "no-cache",
+      });
 
-      console.log("Dashboard: Stats response status:", statsRes.status);
-      console.log("Dashboard: Screenings response status:", screeningsRes.status);
+      console.log("Dashboard: Snapshot response status:", response.status);
 
-      // Check if user is authenticated
-      if (statsRes.status === 401 || screeningsRes.status === 401) {
+      if (response.status === 401) {
         console.log("Dashboard: 401 Unauthorized - redirecting to login");
         navigate("/login", { replace: true });
-        return;
+        return false;
       }
 
-      if (!statsRes.ok || !screeningsRes.ok) {
+      if (!response.ok) {
         throw new Error("Failed to fetch data");
       }
 
-      const statsData = await statsRes.json();
-      const screeningsData = await screeningsRes.json();
+      const snapshot = await response.json();
 
       console.log("Dashboard: Data fetched successfully");
-      setStats(statsData);
-      setScreenings(screeningsData.screenings || []); // Extract screenings array from response
+      seqRef.current = snapshot.seq || 0;
+      setStats(snapshot.stats);
+      setScreenings(snapshot.screenings || []);
+      return true;
     } catch (error) {
       console.error("Dashboard: Error fetching data:", error);
       navigate("/login", { replace: true });
+      return false;
     } finally {
       setLoading(false);
     }
@@ -94,8 +141,8 @@ export default function Dashboard() {
       });
 
       if (response.ok) {
+        // The list and counters update from the change feed
         alert("Candidate deleted successfully!");
-        fetchData();
       }
     } catch (error) {
       console.error("Error deleting candidate:", error);
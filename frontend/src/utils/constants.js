@@ -11,6 +11,8 @@ export const API_ENDPOINTS = {
   UPLOAD_RESUME: `${API_BASE_URL}/api/analyze/`,
   GET_STATS: `${API_BASE_URL}/api/stats/`,
   GET_SCREENINGS: `${API_BASE_URL}/api/screenings/`,
+  GET_DASHBOARD: `${API_BASE_URL}/api/dashboard`,
+  EVENTS: `${API_BASE_URL}/api/events`,
   DELETE_CANDIDATE: (id) => `${API_BASE_URL}/api/candidates/${id}`,
   LOGIN: `${API_BASE_URL}/api/login`,
   LOGOUT: `${API_BASE_URL}/api/logout`,
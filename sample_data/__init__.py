@@ -0,0 +1 @@
+# Sample data package
@@ -1,19 +1,33 @@
 """
 Generate sample screening data for testing the dashboard
 Run this to populate the database with test data
+
+    python sample_data/generate_sample_data.py
+        Insert the hand-written sample candidates below (dashboard demo)
+
+    python sample_data/generate_sample_data.py --candidates 1000000 --seed 7
+        Bulk-load a synthetic dataset for load and query-plan testing
+
+    python sample_data/generate_sample_data.py --candidates 500 --pdf-dir pdfs/ --pdf-only
+        Only render matching resume PDFs for upload load tests
+
+Point DATABASE_URL at a scratch database before generating large datasets.
 """
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from backend.database import SessionLocal, init_db
+from backend.database import SessionLocal, engine, init_db
+from backend import analytics, search
 from backend.db_service import DatabaseService
+from backend.models import Candidate, Experience as ExperienceRow, Education as EducationRow, ScreeningRecord
 from backend.schemas import CandidateProfile, Experience, Education, MatchScore, ScreeningResult
+from sample_data.synthetic import SyntheticGenerator, render_pdf
+from sqlalchemy import func, insert, select
 from datetime import datetime
+import argparse
 import random
-
-# Initialize database
-init_db()
+import time
 
 # Sample data
 sample_candidates = [
@@ -256,7 +270,8 @@ def generate_match_score(score, candidate_name, job_title):
         recommended_action=action
     )
 
-def main():
+def generate_sample_data():
+    """Insert the hand-written sample candidates through the normal save path"""
     db = SessionLocal()
     
     try:
@@ -315,5 +330,105 @@ def main():
     finally:
         db.close()
 
+def bulk_load(args):
+    """
+    Bulk-load a synthetic dataset with Core executemany inserts
+
+    Bypasses DatabaseService.save_screening_result (one ORM round-trip per
+    candidate) and writes each batch of candidates, experiences, educations and
+    screenings in a single transaction.
+    """
+    generator = SyntheticGenerator(seed=args.seed, days=args.days)
+
+    with engine.connect() as conn:
+        start_id = (conn.execute(select(func.max(Candidate.id))).scalar() or 0) + 1
+
+    if args.pdf_dir:
+        os.makedirs(args.pdf_dir, exist_ok=True)
+    pdfs_left = args.pdf_count if args.pdf_count is not None else args.candidates
+
+    totals = {"candidates": 0, "experiences": 0, "educations": 0, "screenings": 0, "pdfs": 0}
+    started = time.perf_counter()
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite" and not args.pdf_only:
+            # Scratch-database load: trade durability for insert throughput
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+
+    batches = generator.iter_batches(args.candidates, start_id, args.batch_size, args.screenings_per_candidate)
+    for candidates, experiences, educations, screenings in batches:
+        if args.pdf_dir and pdfs_left > 0:
+            for row in candidates[:pdfs_left]:
+                with open(os.path.join(args.pdf_dir, row["resume_filename"]), "wb") as f:
+                    f.write(render_pdf(row["resume_text"]))
+            totals["pdfs"] += min(pdfs_left, len(candidates))
+            pdfs_left -= min(pdfs_left, len(candidates))
+
+        if not args.pdf_only:
+            with engine.begin() as conn:
+                conn.execute(insert(Candidate), candidates)
+                if experiences:
+                    conn.execute(insert(ExperienceRow), experiences)
+                if educations:
+                    conn.execute(insert(EducationRow), educations)
+                conn.execute(insert(ScreeningRecord), screenings)
+
+        totals["candidates"] += len(candidates)
+        totals["experiences"] += len(experiences)
+        totals["educations"] += len(educations)
+        totals["screenings"] += len(screenings)
+
+        elapsed = time.perf_counter() - started
+        print(
+            f"  {totals['candidates']:>10,} candidates  {totals['screenings']:>10,} screenings  "
+            f"{totals['candidates'] / elapsed:>10,.0f} candidates/s",
+            flush=True
+        )
+        if args.pdf_only and pdfs_left <= 0:
+            break
+
+    if not args.pdf_only:
+        # Core inserts bypass the write paths that keep the full-text index and rollups current
+        search.rebuild(engine)
+        analytics.rebuild(engine)
+    
+    elapsed = time.perf_counter() - started
+    print("\n" + "=" * 60)
+    for key, value in totals.items():
+        print(f"  {key.capitalize():<12} {value:>12,}")
+    rows = totals["candidates"] + totals["experiences"] + totals["educations"] + totals["screenings"]
+    print(f"  Elapsed      {elapsed:>12.1f}s ({rows / elapsed:,.0f} rows/s)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate sample or synthetic screening data")
+    parser.add_argument("--candidates", type=int, default=0,
+                        help="Number of synthetic candidates to bulk-load (0 = hand-written samples only)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; same seed produces the same dataset")
+    parser.add_argument("--screenings-per-candidate", type=float, default=2.0,
+                        help="Mean screenings per candidate (at least one each)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Candidates per insert transaction")
+    parser.add_argument("--days", type=int, default=365, help="Spread created/screened timestamps over this many days")
+    parser.add_argument("--pdf-dir", help="Also render matching resume PDFs into this directory")
+    parser.add_argument("--pdf-count", type=int, help="Limit the number of rendered PDFs (default: all candidates)")
+    parser.add_argument("--pdf-only", action="store_true", help="Render PDFs without touching the database")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.pdf_only:
+        init_db()
+
+    if args.candidates <= 0:
+        generate_sample_data()
+        return
+
+    print(f"Generating {args.candidates:,} synthetic candidates (seed={args.seed})...")
+    print("=" * 60)
+    bulk_load(args)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,432 @@
+"""
+Synthetic candidate/screening generator for load and query-plan testing
+
+Produces realistic-looking candidates, experiences, educations and screening
+records as plain row dicts (ready for bulk inserts), plus matching resume text
+and minimal PDF renderings of it. Everything is driven by a seeded
+``random.Random`` so the same seed always produces the same dataset.
+"""
+import math
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+    "Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya", "Wei", "Mei",
+    "Hiroshi", "Yuki", "Carlos", "Sofia", "Mateo", "Valentina", "Ahmed", "Fatima", "Omar", "Layla",
+    "Lukas", "Emma", "Noah", "Olivia", "Liam", "Ava", "Ethan", "Chloe", "Daniel", "Grace",
+]
+
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Sharma", "Patel", "Singh", "Kumar", "Gupta", "Reddy", "Chen", "Wang", "Li", "Zhang",
+    "Tanaka", "Suzuki", "Kim", "Park", "Nguyen", "Silva", "Santos", "Müller", "Schmidt", "Rossi",
+]
+
+EMAIL_DOMAINS = ["gmail.com", "outlook.com", "yahoo.com", "proton.me", "email.com", "icloud.com"]
+
+LOCATIONS = [
+    "San Francisco, CA", "New York, NY", "Seattle, WA", "Austin, TX", "Boston, MA", "Chicago, IL",
+    "Denver, CO", "Atlanta, GA", "Bangalore, India", "Hyderabad, India", "Pune, India", "London, UK",
+    "Berlin, Germany", "Toronto, Canada", "Singapore", "Sydney, Australia", "Remote",
+]
+
+# Ordered roughly by real-world popularity; sampled with Zipf-like weights so a
+# handful of skills dominate and the long tail is rare (like production data).
+SKILLS = [
+    "Python", "SQL", "JavaScript", "Git", "Java", "Docker", "AWS", "React", "Linux", "TypeScript",
+    "PostgreSQL", "Node.js", "REST APIs", "Kubernetes", "C++", "HTML", "CSS", "MongoDB", "Agile",
+    "Communication", "Django", "FastAPI", "Flask", "Spring Boot", "Machine Learning", "TensorFlow",
+    "PyTorch", "Pandas", "NumPy", "Scikit-learn", "Go", "Rust", "C#", ".NET", "Azure", "GCP",
+    "Terraform", "Jenkins", "CI/CD", "Redis", "Kafka", "Microservices", "GraphQL", "MySQL", "Tableau",
+    "Power BI", "Excel", "Spark", "Hadoop", "Airflow", "Snowflake", "Leadership", "Problem Solving",
+    "Data Analysis", "Statistics", "NLP", "Computer Vision", "Deep Learning", "Vue.js", "Angular",
+    "Kotlin", "Swift", "Scala", "Ruby", "Rails", "PHP", "Elasticsearch", "RabbitMQ", "gRPC", "Ansible",
+]
+
+ROLES = [
+    "Software Engineer", "Senior Software Engineer", "Backend Developer", "Frontend Developer",
+    "Full Stack Developer", "Data Scientist", "Data Analyst", "Machine Learning Engineer",
+    "DevOps Engineer", "Site Reliability Engineer", "Staff Engineer", "Engineering Manager",
+    "QA Engineer", "Data Engineer", "Cloud Architect", "Software Intern",
+]
+
+COMPANIES = [
+    "Tech Giants Inc", "StartupXYZ", "Enterprise Solutions Corp", "DataCorp Analytics", "CloudNine Systems",
+    "FinEdge", "HealthStack", "RetailWorks", "Quantum Labs", "BlueOcean Software", "Nimbus AI",
+    "Orbit Logistics", "PixelForge", "Acme Corporation", "Infosys", "TCS", "Wipro", "Accenture",
+]
+
+RESPONSIBILITIES = [
+    "Designed and built RESTful APIs", "Led a team of engineers", "Optimized database queries",
+    "Implemented CI/CD pipelines", "Migrated services to Kubernetes", "Built data pipelines",
+    "Trained and deployed ML models", "Mentored junior developers", "Reduced infrastructure costs",
+    "Improved test coverage", "Designed microservices architecture", "Built analytics dashboards",
+    "Owned on-call rotation and incident response", "Collaborated with product and design",
+]
+
+DEGREES = [
+    "BS Computer Science", "BTech Computer Science", "BE Information Technology", "MS Computer Science",
+    "MS Data Science", "BS Mathematics", "BS Statistics", "MBA", "PhD Computer Science",
+    "BS Electrical Engineering",
+]
+
+INSTITUTIONS = [
+    "Stanford University", "MIT", "UC Berkeley", "Carnegie Mellon University", "University of Texas",
+    "IIT Delhi", "IIT Bombay", "BITS Pilani", "NIT Trichy", "University of Toronto",
+    "Boston University", "Georgia Tech", "University of Washington", "TU Munich", "NUS",
+]
+
+CERTIFICATIONS = [
+    "AWS Certified Developer", "AWS Solutions Architect", "Google Cloud Professional",
+    "Certified Kubernetes Administrator", "Azure Fundamentals", "PMP", "Scrum Master",
+    "TensorFlow Developer Certificate", "Red Hat Certified Engineer", "Oracle Certified Java Programmer",
+]
+
+JOB_TITLES = [
+    "Senior Python Developer", "Machine Learning Engineer", "Backend Developer", "Data Analyst",
+    "Frontend Engineer", "DevOps Engineer", "Data Engineer", "Full Stack Developer",
+    "Site Reliability Engineer", "Engineering Manager",
+]
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def _zipf_weights(n: int, s: float = 1.1) -> List[float]:
+    """Cumulative Zipf weights for random.choices(cum_weights=...)"""
+    total = 0.0
+    cumulative = []
+    for rank in range(1, n + 1):
+        total += 1.0 / (rank ** s)
+        cumulative.append(total)
+    return cumulative
+
+
+class SyntheticGenerator:
+    """Seeded generator of candidate/screening rows with realistic distributions"""
+
+    def __init__(self, seed: int = 42, days: int = 365, now: Optional[datetime] = None):
+        self.rng = random.Random(seed)
+        self.days = days
+        self.now = now or datetime(2025, 1, 1)
+        self._skill_weights = _zipf_weights(len(SKILLS))
+        self.job_descriptions = [self._job_description(title) for title in JOB_TITLES]
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+    def _job_description(self, title: str) -> Dict:
+        rng = self.rng
+        required = self._sample_skills(rng.randint(4, 7))
+        years = rng.choice([1, 2, 3, 5, 7])
+        lines = [
+            title,
+            "",
+            "We are looking for a motivated engineer to join our team.",
+            "",
+            "Requirements:",
+            f"- {years}+ years of professional experience",
+        ]
+        lines += [f"- Strong experience with {skill}" for skill in required]
+        lines += [
+            "- Bachelor's degree in Computer Science or related field",
+            "- Excellent communication and problem-solving skills",
+        ]
+        return {"title": title, "description": "\n".join(lines), "skills": set(required), "years": years}
+
+    # ------------------------------------------------------------------
+    # Candidates
+    # ------------------------------------------------------------------
+    def _sample_skills(self, k: int) -> List[str]:
+        picked = []
+        seen = set()
+        # Oversample then dedupe: cheaper than weighted sampling without replacement
+        for skill in self.rng.choices(SKILLS, cum_weights=self._skill_weights, k=k * 2):
+            if skill not in seen:
+                seen.add(skill)
+                picked.append(skill)
+                if len(picked) == k:
+                    break
+        return picked
+
+    def _gpa(self) -> Optional[str]:
+        rng = self.rng
+        roll = rng.random()
+        if roll < 0.25:
+            return None
+        if roll < 0.65:
+            return f"{min(4.0, max(2.0, rng.gauss(3.4, 0.35))):.2f}/4.0"
+        return f"{min(10.0, max(5.0, rng.gauss(8.1, 0.8))):.1f}/10"
+
+    def candidate(self, candidate_id: int) -> Dict:
+        """
+        Build one candidate profile as a plain dict
+
+        Returns a dict with the ``candidates`` row plus ``experiences`` and
+        ``educations`` lists (without ids) and the rendered ``resume_text``.
+        """
+        rng = self.rng
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        name = f"{first} {last}"
+        # Ids make emails unique, which is what the upsert-by-email path expects
+        email = f"{first.lower()}.{last.lower()}{candidate_id}@{rng.choice(EMAIL_DOMAINS)}"
+
+        # Experience is right-skewed: many juniors, a long tail of seniors
+        total_years = round(min(35.0, rng.lognormvariate(1.3, 0.75)), 1)
+        n_jobs = max(0 if total_years < 0.5 else 1, min(6, int(rng.gauss(1 + total_years / 4, 0.8))))
+        experiences = []
+        remaining = total_years
+        end_year = self.now.year
+        for idx in range(n_jobs):
+            years = round(remaining if idx == n_jobs - 1 else remaining * rng.uniform(0.3, 0.7), 1)
+            remaining = max(0.0, remaining - years)
+            start_year = end_year - max(1, int(math.ceil(years)))
+            end_label = "Present" if idx == 0 else f"{rng.choice(MONTHS)} {end_year}"
+            experiences.append({
+                "role": rng.choice(ROLES),
+                "company": rng.choice(COMPANIES),
+                "duration": f"{rng.choice(MONTHS)} {start_year} - {end_label}",
+                "years": years,
+                "responsibilities": rng.sample(RESPONSIBILITIES, rng.randint(2, 4)),
+            })
+            end_year = start_year
+
+        educations = []
+        for _ in range(1 if rng.random() < 0.7 else 2):
+            educations.append({
+                "degree": rng.choice(DEGREES),
+                "institution": rng.choice(INSTITUTIONS),
+                "year": str(self.now.year - int(total_years) - rng.randint(0, 3)),
+                "gpa": self._gpa(),
+            })
+
+        skills = self._sample_skills(max(3, min(25, int(rng.gauss(9, 4)))))
+        certifications = rng.sample(CERTIFICATIONS, rng.choice([0, 0, 1, 1, 2, 3]))
+        summary = (
+            f"{experiences[0]['role'] if experiences else 'Graduate'} with {total_years} years of experience "
+            f"in {', '.join(skills[:3])}."
+        )
+        created_at = self.now - timedelta(seconds=rng.randint(0, self.days * 86400))
+
+        row = {
+            "id": candidate_id,
+            "name": name,
+            "email": email,
+            "phone": f"+1-555-{rng.randint(0, 9999):04d}",
+            "location": rng.choice(LOCATIONS),
+            "skills": skills,
+            "certifications": certifications,
+            "summary": summary,
+            "total_experience_years": total_years,
+            "resume_filename": f"{first.lower()}_{last.lower()}_{candidate_id}.pdf",
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+        row["resume_text"] = resume_text(row, experiences, educations)
+        return {"candidate": row, "experiences": experiences, "educations": educations}
+
+    # ------------------------------------------------------------------
+    # Screenings
+    # ------------------------------------------------------------------
+    def screening(self, candidate: Dict) -> Dict:
+        """Build one screening row for a candidate dict produced by ``candidate()``"""
+        rng = self.rng
+        row = candidate["candidate"]
+        job = rng.choice(self.job_descriptions)
+
+        # Score is driven by actual skill overlap and experience, plus noise,
+        # so score/skill/action correlations look like real LLM output.
+        overlap = len(job["skills"].intersection(row["skills"])) / len(job["skills"])
+        experience_fit = min(1.0, row["total_experience_years"] / max(1, job["years"]))
+        raw = 2.0 + 5.5 * overlap + 2.0 * experience_fit + rng.gauss(0, 1.0)
+        score = round(min(10.0, max(1.0, raw)), 1)
+        action = "Shortlist" if score >= 7.0 else "Reject"
+
+        matched = sorted(job["skills"].intersection(row["skills"]))
+        missing = sorted(job["skills"].difference(row["skills"]))
+        strengths = [f"Hands-on experience with {skill}" for skill in matched[:3]] or ["Shows foundational technical skills"]
+        concerns = [f"No evidence of {skill} experience" for skill in missing[:3]]
+
+        screened_at = row["created_at"] + timedelta(seconds=rng.randint(0, 30 * 86400))
+        return {
+            "candidate_id": row["id"],
+            "job_description": job["description"],
+            "job_title": job["title"],
+            "match_score": score,
+            "justification": (
+                f"{row['name']} matches {len(matched)} of {len(job['skills'])} key skills for the "
+                f"{job['title']} role with {row['total_experience_years']} years of experience."
+            ),
+            "strengths": strengths,
+            "concerns": concerns,
+            "recommended_action": action,
+            "screened_at": min(screened_at, self.now),
+        }
+
+    def screenings_for(self, candidate: Dict, mean: float) -> List[Dict]:
+        """1 + Poisson(mean - 1) screenings per candidate"""
+        count = 1
+        if mean > 1:
+            # Knuth's method; lambda is small so this is a few iterations
+            threshold = math.exp(-(mean - 1))
+            product = self.rng.random()
+            while product > threshold:
+                count += 1
+                product *= self.rng.random()
+        return [self.screening(candidate) for _ in range(count)]
+
+    def iter_batches(
+        self, count: int, start_id: int, batch_size: int, screenings_per_candidate: float
+    ) -> Iterator[Tuple[List[Dict], List[Dict], List[Dict], List[Dict]]]:
+        """
+        Yield (candidates, experiences, educations, screenings) row batches
+
+        Candidate ids are assigned here (starting at ``start_id``) so child rows
+        can reference them without a round-trip per candidate.
+        """
+        for batch_start in range(0, count, batch_size):
+            candidates, experiences, educations, screenings = [], [], [], []
+            for offset in range(batch_start, min(count, batch_start + batch_size)):
+                data = self.candidate(start_id + offset)
+                candidate_id = data["candidate"]["id"]
+                candidates.append(data["candidate"])
+                experiences.extend(dict(e, candidate_id=candidate_id) for e in data["experiences"])
+                educations.extend(dict(e, candidate_id=candidate_id) for e in data["educations"])
+                screenings.extend(self.screenings_for(data, screenings_per_candidate))
+            yield candidates, experiences, educations, screenings
+
+
+def resume_text(candidate: Dict, experiences: List[Dict], educations: List[Dict]) -> str:
+    """Render a plain-text resume (what PyPDF2 would hand to the extractor)"""
+    lines = [
+        candidate["name"],
+        f"Email: {candidate['email']} | Phone: {candidate['phone']} | {candidate['location']}",
+        "",
+        "SUMMARY",
+        candidate["summary"],
+        "",
+        "SKILLS",
+        ", ".join(candidate["skills"]),
+        "",
+        "EXPERIENCE",
+    ]
+    for exp in experiences:
+        lines.append(f"{exp['role']} - {exp['company']} ({exp['duration']})")
+        lines += [f"  * {item}" for item in exp["responsibilities"]]
+    lines += ["", "EDUCATION"]
+    for edu in educations:
+        line = f"{edu['degree']}, {edu['institution']}, {edu['year']}"
+        if edu["gpa"]:
+            line += f" - CGPA: {edu['gpa']}"
+        lines.append(line)
+    if candidate["certifications"]:
+        lines += ["", "CERTIFICATIONS"] + list(candidate["certifications"])
+    return "\n".join(lines)
+
+
+def _pdf_escape(line: str) -> str:
+    line = line.encode("latin-1", "replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _wrap(text: str, width: int) -> List[str]:
+    wrapped = []
+    for line in text.split("\n"):
+        while len(line) > width:
+            cut = line.rfind(" ", 0, width)
+            cut = cut if cut > 0 else width
+            wrapped.append(line[:cut])
+            line = line[cut:].lstrip()
+        wrapped.append(line)
+    return wrapped
+
+
+_WIDE = set("mwMW@%")
+
+
+def _word_width(word: str, size: float) -> float:
+    """Generous Helvetica advance estimate, so positioned words never overlap"""
+    return sum(0.9 if char in _WIDE else 0.6 for char in word) * size
+
+
+def _positioned_line(line: str, x: float, y: float) -> List[str]:
+    ops = []
+    for word in line.split():
+        ops.append(f"1 0 0 1 {x:.1f} {y:.1f} Tm ({_pdf_escape(word)}) Tj")
+        x += _word_width(word, 10) + 4
+    return ops
+
+
+def _page_ops(page_lines: List[str], layout: str) -> List[str]:
+    if layout == "plain":
+        return ["/F1 10 Tf", "12 TL", "50 770 Td"] + [f"({_pdf_escape(line)}) Tj T*" for line in page_lines]
+    ops = ["/F1 10 Tf"]
+    if layout == "positioned":
+        for row, line in enumerate(page_lines):
+            ops += _positioned_line(line, 50, 770 - 12 * row)
+        return ops
+    # columns: left column then right column, but drawn row by row as table-based layouts are
+    half = (len(page_lines) + 1) // 2
+    left, right = page_lines[:half], page_lines[half:]
+    for row in range(len(left)):
+        y = 770 - 12 * row
+        ops.append(f"1 0 0 1 50 {y} Tm ({_pdf_escape(left[row])}) Tj")
+        if row < len(right):
+            ops.append(f"1 0 0 1 320 {y} Tm ({_pdf_escape(right[row])}) Tj")
+    return ops
+
+
+def render_pdf(text: str, lines_per_page: int = 60, width: int = 95, layout: str = "plain") -> bytes:
+    """
+    Render text as a minimal multi-page PDF (Helvetica, no dependencies)
+
+    Output is deliberately simple but valid, so PyPDF2 and other extractors
+    read it back line for line. Other layouts reproduce what makes real
+    resumes hard to extract: ``positioned`` places every word separately
+    with no space characters, ``columns`` sets the text in two columns
+    whose rows are interleaved in the content stream.
+    """
+    if layout not in ("plain", "positioned", "columns"):
+        raise ValueError(f"Unknown layout {layout!r}")
+    if layout == "columns":
+        lines = _wrap(text, width // 2 - 2)
+        per_page = 2 * lines_per_page
+    else:
+        lines = _wrap(text, width)
+        per_page = lines_per_page
+    pages = [lines[i:i + per_page] for i in range(0, len(lines), per_page)] or [[]]
+
+    objects = []  # 1-based PDF object bodies
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(b"")  # Pages placeholder, filled once kids are known
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    kids = []
+    for page_lines in pages:
+        ops = ["BT"] + _page_ops(page_lines, layout) + ["ET"]
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at)
+    return bytes(out)
@@ -0,0 +1,169 @@
+"""
+Server-Sent Events from the change feed (backend/events.py)
+
+A worker with open /api/events streams runs one poller. Every
+EVENTS_POLL_SECONDS it reads the shared data version, which every worker bumps
+after each committed write. Only when the version has changed does it query
+``change_events`` for the new rows and hand them to every stream. The database
+therefore sees about one small query per write per worker, however many
+dashboards are open.
+
+A stream that starts with Last-Event-ID (sent by EventSource on reconnect) or
+``?after=`` first replays the events it missed from the table, then goes live.
+If those events were already pruned it gets a ``reset`` event instead, and the
+client should reload its snapshot. A stream whose queue overflows (a slow
+client) falls back to reading the table from its last event. Idle streams get a
+comment line every EVENTS_HEARTBEAT_SECONDS, so proxies keep them open.
+
+Wire format, one event per change (default "message" type):
+
+    id: 42
+    data: {"seq": 42, "entity": "screening", "op": "insert", "id": 7, "data": {...}}
+"""
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, List, Optional, Set
+
+from backend import cache, events, metrics
+from backend.config import settings
+from backend.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+MAX_QUEUE = 1000  # live events buffered per stream before it falls back to the table
+PAGE_SIZE = 500
+FULL_POLL_SECONDS = 5.0  # query the table even without a version change (a writer that died before bumping it)
+RETRY_MS = 3000  # EventSource reconnect delay
+
+
+def _since(after: int) -> List:
+    with SessionLocal() as db:
+        return events.since(db, after, PAGE_SIZE)
+
+
+def _position() -> tuple:
+    """(head, oldest) sequence numbers"""
+    with SessionLocal() as db:
+        return events.head(db), events.oldest(db)
+
+
+def _message(rows) -> bytes:
+    return "".join(
+        f'id: {row.seq}\ndata: {{"seq":{row.seq},"entity":"{row.entity}","op":"{row.op}","id":{row.entity_id},"data":{row.data}}}\n\n'
+        for row in rows
+    ).encode()
+
+
+class _Stream:
+    __slots__ = ("queue", "lagged")
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(MAX_QUEUE)
+        self.lagged = False
+
+
+class ChangeFeed:
+    """Fan-out of new change events to this worker's streams (use from the event loop thread only)"""
+
+    def __init__(self):
+        self._streams: Set[_Stream] = set()
+        self._head: Optional[int] = None  # last sequence number fanned out
+        self._poller: Optional[asyncio.Task] = None
+
+    def subscribers(self) -> int:
+        return len(self._streams)
+
+    async def _start(self) -> None:
+        if self._poller is None:
+            head = (await asyncio.to_thread(_position))[0]
+            if self._poller is None:  # not started by another stream meanwhile
+                self._head = head  # what happened while nobody listened is not fanned out
+                self._poller = asyncio.create_task(self._poll())
+
+    async def _poll(self) -> None:
+        version, queried = None, 0.0
+        try:
+            while self._streams:
+                current = cache.data_version()
+                if current != version or time.monotonic() - queried >= FULL_POLL_SECONDS:
+                    version, queried = current, time.monotonic()
+                    try:
+                        await self._fetch()
+                    except Exception as e:
+                        version = None  # retry on the next tick
+                        logger.warning(f"Change feed poll failed: {e}")
+                await asyncio.sleep(settings.EVENTS_POLL_SECONDS)
+        finally:
+            self._poller = None
+
+    async def _fetch(self) -> None:
+        while True:
+            rows = await asyncio.to_thread(_since, self._head)
+            if not rows:
+                return
+            self._head = rows[-1].seq
+            for stream in self._streams:
+                if stream.lagged:
+                    continue
+                for row in rows:
+                    try:
+                        stream.queue.put_nowait(row)
+                    except asyncio.QueueFull:
+                        stream.lagged = True
+                        break
+            if len(rows) < PAGE_SIZE:
+                return
+
+    async def stream(self, after: Optional[int] = None) -> AsyncIterator[bytes]:
+        """
+        SSE body: events after ``after`` (from now on when None), then live ones
+
+        Registered before anything is read, so no event falls between the
+        backlog and the live queue; duplicates are dropped by sequence number.
+        """
+        stream = _Stream()
+        self._streams.add(stream)
+        metrics.CHANGE_FEED_SUBSCRIBERS.inc()
+        try:
+            await self._start()
+            yield f"retry: {RETRY_MS}\n\n".encode()
+            last = self._head if after is None else after
+            if after is not None:
+                head, oldest = await asyncio.to_thread(_position)
+                if (oldest is not None and after + 1 < oldest) or after > head:
+                    # Pruned (or from another database): the client must reload
+                    yield f'id: {head}\nevent: reset\ndata: {{"seq":{head}}}\n\n'.encode()
+                    last = head
+                stream.lagged = True  # replay the backlog from the table first
+            while True:
+                if stream.lagged:
+                    stream.lagged = False
+                    stream.queue = asyncio.Queue(MAX_QUEUE)
+                    while True:
+                        rows = await asyncio.to_thread(_since, last)
+                        if rows:
+                            last = rows[-1].seq
+                            metrics.CHANGE_FEED_EVENTS.labels("backlog").inc(len(rows))
+                            yield _message(rows)
+                        if len(rows) < PAGE_SIZE:
+                            break
+                try:
+                    row = await asyncio.wait_for(stream.queue.get(), settings.EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                rows = [row]
+                while not stream.queue.empty():
+                    rows.append(stream.queue.get_nowait())
+                rows = [row for row in rows if row.seq > last]
+                if rows:
+                    last = rows[-1].seq
+                    metrics.CHANGE_FEED_EVENTS.labels("live").inc(len(rows))
+                    yield _message(rows)
+        finally:
+            self._streams.discard(stream)
+            metrics.CHANGE_FEED_SUBSCRIBERS.dec()
+
+
+feed = ChangeFeed()
@@ -0,0 +1,256 @@
+"""
+LLM backends used by ResumeExtractor (selected with LLM_BACKEND)
+
+    gemini   Google Gemini through google-generativeai (needs GEMINI_API_KEY)
+    rest     The Gemini REST API (or a compatible server at LLM_BASE_URL) over
+             a pool of LLM_POOL_SIZE keep-alive connections per worker, HTTP/2
+             when the h2 package is installed; LLM_POOL_WARM of them are
+             opened at startup so the first screenings skip TCP/TLS setup
+    fake     Local stand-in for load tests and development: answers extraction
+             and scoring prompts from the resume text and skill taxonomy after
+             a simulated delay (LLM_FAKE_LATENCY_MS +/- LLM_FAKE_JITTER_MS)
+
+Every backend has ``generate_content(prompt)`` returning an object with
+``.text`` and ``.usage_metadata``, like a Gemini SDK response. The fake's
+answers depend only on the prompt, so repeated runs screen identically; its
+delay is a blocking sleep, which holds a worker thread the way a real call does.
+
+The rest backend counts each request as a new or reused connection, and the
+time spent opening new ones, in /metrics (resume_screener_llm_connections_total,
+resume_screener_llm_connect_seconds).
+"""
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Optional
+
+from backend import metrics
+from backend.config import settings
+from services import skill_taxonomy
+
+BACKENDS = ("gemini", "rest", "fake")
+
+_YEARS = re.compile(r"(\d+(?:\.\d+)?)\s+years", re.IGNORECASE)
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_JOB = re.compile(r"^=== JOB (\d+) ===\n(.*?)(?=\n\n=== JOB \d+ ===\n|\n\nTASK:)", re.MULTILINE | re.DOTALL)
+
+
+def _between(text: str, start: str, end: str) -> Optional[str]:
+    begin = text.find(start)
+    if begin < 0:
+        return None
+    begin += len(start)
+    stop = text.find(end, begin)
+    return text[begin:stop if stop >= 0 else len(text)].strip()
+
+
+class FakeModel:
+    """Deterministic answers to ResumeExtractor's prompts, with simulated latency"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+
+    def generate_content(self, prompt: str):
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+        job_description = _between(prompt, "JOB DESCRIPTION:\n", "\n\nCANDIDATE PROFILE:")
+        jobs = _JOB.findall(prompt)
+        if jobs:  # several jobs packed into one scoring prompt
+            resume_text = _between(prompt, "FULL RESUME:\n", "\n\n=== JOB 1 ===") or ""
+            data = [
+                {"job": int(number), **self._score(job.split("\n- Job Skills Matched:")[0], resume_text, resume_text + job)}
+                for number, job in jobs
+            ]
+        elif job_description is not None:
+            data = self._score(job_description, _between(prompt, "FULL RESUME:\n", "\n\nTASK:") or "", prompt)
+        else:
+            data = self._extract(_between(prompt, "Resume:\n", "\n\nReturn a JSON object") or "")
+        text = json.dumps(data)
+        usage = SimpleNamespace(prompt_token_count=len(prompt) // 4, candidates_token_count=len(text) // 4)
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+    @staticmethod
+    def _extract(resume_text: str) -> dict:
+        lines = [line.strip() for line in resume_text.splitlines() if line.strip()]
+        years = _YEARS.search(resume_text)
+        email = _EMAIL.search(resume_text)
+        return {
+            "name": lines[0] if lines else None,
+            "email": email.group(0) if email else None,
+            "phone": None,
+            "location": None,
+            "skills": skill_taxonomy.find_skills(resume_text),
+            "experience": [],
+            "education": [],
+            "total_experience_years": float(years.group(1)) if years else None,
+            "certifications": [],
+            "summary": lines[1][:200] if len(lines) > 1 else None,
+        }
+
+    @staticmethod
+    def _score(job_description: str, resume_text: str, prompt: str) -> dict:
+        wanted = skill_taxonomy.find_skills(job_description)
+        have = {skill.lower() for skill in skill_taxonomy.find_skills(resume_text)}
+        matched = [skill for skill in wanted if skill.lower() in have]
+        missing = [skill for skill in wanted if skill.lower() not in have]
+        coverage = len(matched) / len(wanted) if wanted else 0.5
+        # Spread equal coverages a little, deterministically per prompt
+        spread = int.from_bytes(hashlib.sha256(prompt.encode("utf-8")).digest()[:2], "big") / 65535 - 0.5
+        score = round(min(10.0, max(1.0, 1.5 + 8 * coverage + spread)), 1)
+        return {
+            "score": score,
+            "justification": f"Matches {len(matched)} of {len(wanted)} skills named in the job description.",
+            "strengths": matched[:3],
+            "concerns": [f"No {skill} experience" for skill in missing[:2]],
+            "recommended_action": "Shortlist" if score >= 7.0 else "Reject",
+        }
+
+
+class _ConnectionTrace:
+    """httpcore trace hook: whether a request opened a connection, and how long that took"""
+
+    __slots__ = ("connecting_since", "setup_seconds")
+
+    def __init__(self):
+        self.connecting_since = None
+        self.setup_seconds = None
+
+    def __call__(self, event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.started":
+            self.connecting_since = time.perf_counter()
+        elif event in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            self.setup_seconds = time.perf_counter() - self.connecting_since
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class RestModel:
+    """Gemini generateContent over a pooled keep-alive HTTP client (thread-safe)"""
+
+    def __init__(
+        self,
+        model_name: str,
+        base_url: str,
+        api_key: Optional[str],
+        pool_size: int = 8,
+        keepalive_seconds: float = 120.0,
+        timeout: float = 60.0,
+        http2: bool = True,
+        verify=True
+    ):
+        import httpx
+
+        self.model_name = model_name
+        self.http2 = http2 and _h2_available()
+        self.pool_size = max(1, pool_size)
+        self._client = httpx.Client(
+            base_url=base_url.rstrip("/"),
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+                keepalive_expiry=keepalive_seconds
+            ),
+            timeout=timeout,
+            headers={"x-goog-api-key": api_key} if api_key else None,
+            verify=verify
+        )
+
+    def _request(self, method: str, path: str, **kwargs):
+        trace = _ConnectionTrace()
+        response = self._client.request(method, path, extensions={"trace": trace}, **kwargs)
+        metrics.llm_connection(trace.setup_seconds)
+        return response, trace
+
+    def generate_content(self, prompt: str):
+        response, _ = self._request(
+            "POST", f"/v1beta/{self.model_name}:generateContent",
+            json={"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        )
+        response.raise_for_status()
+        data = response.json()
+        candidates = data.get("candidates") or [{}]
+        parts = (candidates[0].get("content") or {}).get("parts") or []
+        usage = data.get("usageMetadata") or {}
+        return SimpleNamespace(
+            text="".join(part.get("text", "") for part in parts),
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=usage.get("promptTokenCount", 0),
+                candidates_token_count=usage.get("candidatesTokenCount", 0)
+            )
+        )
+
+    def warm_up(self, connections: int) -> int:
+        """Open up to ``connections`` pooled connections with concurrent model lookups; returns how many"""
+        if connections <= 0:
+            return 0
+        connections = 1 if self.http2 else min(connections, self.pool_size)  # HTTP/2 multiplexes one
+
+        def ping(_):
+            _, trace = self._request("GET", f"/v1beta/{self.model_name}")
+            return trace.setup_seconds is not None
+
+        with ThreadPoolExecutor(connections) as pool:
+            return sum(pool.map(ping, range(connections)))
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def _api_key() -> str:
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key or api_key == "your_gemini_api_key_here":
+        raise ValueError("Please set a valid GEMINI_API_KEY in your .env file")
+    return api_key
+
+
+def _gemini(model_name: str):
+    import google.generativeai as genai
+
+    genai.configure(api_key=_api_key())
+    return genai.GenerativeModel(model_name)
+
+
+def _rest(model_name: str) -> RestModel:
+    # A stand-in server (LLM_BASE_URL) may not need a key
+    default_url = settings.LLM_BASE_URL.rstrip("/") == "https://generativelanguage.googleapis.com"
+    return RestModel(
+        model_name,
+        settings.LLM_BASE_URL,
+        _api_key() if default_url else os.getenv("GEMINI_API_KEY"),
+        pool_size=settings.LLM_POOL_SIZE,
+        keepalive_seconds=settings.LLM_KEEPALIVE_SECONDS,
+        timeout=settings.LLM_TIMEOUT_SECONDS,
+        http2=settings.LLM_HTTP2
+    )
+
+
+def create(model_name: str, backend: Optional[str] = None):
+    """Model object for ``backend`` (default: settings.LLM_BACKEND)"""
+    backend = (backend or settings.LLM_BACKEND).lower()
+    if backend == "fake":
+        return FakeModel(settings.LLM_FAKE_LATENCY_MS, settings.LLM_FAKE_JITTER_MS)
+    if backend == "gemini":
+        return _gemini(model_name)
+    if backend == "rest":
+        return _rest(model_name)
+    raise ValueError(f"Unknown LLM_BACKEND {backend!r} (expected one of {', '.join(BACKENDS)})")
+
+
+def warm_up(model) -> int:
+    """Pre-open LLM_POOL_WARM connections for backends that pool them; returns how many were opened"""
+    warm = getattr(model, "warm_up", None)
+    return warm(settings.LLM_POOL_WARM) if warm is not None else 0
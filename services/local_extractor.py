@@ -0,0 +1,220 @@
+"""
+Deterministic resume extraction (no LLM)
+
+Contact details, GPAs and section boundaries follow a handful of regular
+formats, so they are pulled out with precompiled regexes before any LLM call;
+skills come from the taxonomy matcher (services/skill_taxonomy.py). The
+results let analyze_resume find an existing candidate by email up front, and
+let the extraction prompt skip the fields that are already known.
+"""
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from backend.config import settings
+from backend.schemas import CandidateProfile
+from services import skill_taxonomy
+
+EMAIL_RE = re.compile(r"(?<![\w.%+-])[\w.%+-]+@[\w-]+(?:\.[\w-]+)*\.[^\W\d_]{2,}")  # \w: internationalized addresses
+
+# Runs of digits with phone punctuation; validated in _phone() because years
+# ("2018 - 2021") and ids look alike
+PHONE_RE = re.compile(r"(?<![\w+])\+?\(?\d[\d\s().-]{6,}\d(?!\w)")
+PHONE_LABEL_RE = re.compile(r"\b(?:phone|tel|mobile|mob|cell|contact|ph)\b\.?\s*(?:no\.?|number)?\s*[:#-]?\s*$", re.I)
+YEAR_RANGE_RE = re.compile(r"^(?:19|20)\d{2}\s*[-.–]\s*(?:19|20)\d{2}$")
+
+_NUMBER = r"\d{1,3}(?:\.\d{1,3})?"
+_GPA_LABEL = r"(?:c\.?g\.?p\.?a|g\.?p\.?a|sgpa|cpi|grade point average)"
+GPA_PATTERNS = [
+    # "CGPA: 8.5/10", "GPA of 3.6 out of 4", "GPA 3.8"
+    re.compile(rf"\b{_GPA_LABEL}\b[\s:=-]*(?:of\s+)?(?P<value>{_NUMBER})(?:\s*(?:/|out of)\s*(?P<scale>{_NUMBER}))?", re.I),
+    # "8.5/10 CGPA", "3.8 GPA"
+    re.compile(rf"(?<![\d.])(?P<value>{_NUMBER})(?:\s*(?:/|out of)\s*(?P<scale>{_NUMBER}))?\s*{_GPA_LABEL}\b", re.I),
+    # "Percentage: 85%", "Aggregate 78.5 %"
+    re.compile(rf"\b(?:percentage|aggregate|marks)\b[\s:=-]*(?P<value>{_NUMBER})\s*(?P<percent>%)", re.I),
+]
+# Bare values as stored in Education.gpa ("8.5/10", "3.6", "85%")
+GPA_VALUE_RE = re.compile(rf"(?P<value>{_NUMBER})\s*(?:(?:/|out of)\s*(?P<scale>{_NUMBER})|(?P<percent>%))?", re.I)
+
+SECTION_TITLES = {
+    "summary": ("summary", "professional summary", "profile", "objective", "about me"),
+    "skills": ("skills", "technical skills", "key skills", "core competencies"),
+    "experience": ("experience", "work experience", "professional experience", "employment history", "work history"),
+    "education": ("education", "academic background", "academics", "qualifications"),
+    "certifications": ("certifications", "certificates", "licenses & certifications"),
+    "projects": ("projects", "personal projects", "academic projects"),
+    "awards": ("awards", "achievements", "honors", "honours"),
+    "publications": ("publications",),
+    "languages": ("languages",),
+    "interests": ("interests", "hobbies"),
+}
+_SECTION_BY_TITLE = {title: key for key, titles in SECTION_TITLES.items() for title in titles}
+SECTION_RE = re.compile(
+    r"^[ \t]*(?P<title>" + "|".join(sorted(map(re.escape, _SECTION_BY_TITLE), key=len, reverse=True)) + r")[ \t]*:?[ \t]*$",
+    re.I | re.M
+)
+
+
+class Gpa(NamedTuple):
+    """A GPA as written: value, scale (None if not stated) and offset in the text"""
+    value: float
+    scale: Optional[float]
+    start: int = 0
+
+    def on_ten_scale(self) -> Optional[float]:
+        """Normalize to 0-10; an unstated scale is inferred from the value"""
+        scale = self.scale
+        if scale is None:
+            scale = 4.0 if self.value <= 4.0 else 10.0 if self.value <= 10.0 else 100.0
+        if scale <= 0 or self.value > scale:
+            return None
+        return round(self.value / scale * 10, 2)
+
+    def __str__(self) -> str:
+        if self.scale == 100.0:
+            return f"{self.value:g}%"
+        return f"{self.value:g}/{self.scale:g}" if self.scale else f"{self.value:g}"
+
+
+class LocalExtraction:
+    """Fields found by the regex pass; None/empty when not present"""
+
+    def __init__(
+        self,
+        email: Optional[str],
+        phone: Optional[str],
+        gpas: List[Gpa],
+        sections: Dict[str, Tuple[int, int]],
+        skills: Optional[List[str]] = None
+    ):
+        self.email = email
+        self.phone = phone
+        self.gpas = gpas
+        self.sections = sections  # name -> (start, end) offsets of the section body
+        self.skills = skills or []  # canonical taxonomy skills, in order of first mention
+
+    def section(self, text: str, name: str) -> Optional[str]:
+        bounds = self.sections.get(name)
+        return text[bounds[0]:bounds[1]] if bounds else None
+
+
+def _gpa_from_match(match: re.Match) -> Optional[Gpa]:
+    groups = match.groupdict()
+    value = float(groups["value"])
+    scale = 100.0 if groups.get("percent") else float(groups["scale"]) if groups.get("scale") else None
+    gpa = Gpa(value, scale, match.start())
+    return gpa if gpa.on_ten_scale() is not None else None
+
+
+def parse_gpa(value) -> Optional[Gpa]:
+    """Parse a GPA string such as "8.5/10", "CGPA: 3.6 / 4.0", "3.8" or "85%"; None if unparseable"""
+    if value is None:
+        return None
+    value = str(value)
+    for pattern in GPA_PATTERNS:
+        match = pattern.search(value)
+        if match:
+            return _gpa_from_match(match)
+    match = GPA_VALUE_RE.search(value)
+    return _gpa_from_match(match) if match else None
+
+
+def find_gpas(text: str) -> List[Gpa]:
+    """Labelled GPAs/percentages in text order (overlapping matches dropped)"""
+    found = []
+    for pattern in GPA_PATTERNS:
+        for match in pattern.finditer(text):
+            gpa = _gpa_from_match(match)
+            if gpa is not None:
+                found.append((match.start(), match.end(), gpa))
+    found.sort()
+    gpas, last_end = [], -1
+    for start, end, gpa in found:
+        if start >= last_end:
+            gpas.append(gpa)
+            last_end = end
+    return gpas
+
+
+def _phone(text: str) -> Optional[str]:
+    fallback = None
+    for match in PHONE_RE.finditer(text):
+        candidate = match.group().strip(" .-")
+        digits = sum(ch.isdigit() for ch in candidate)
+        if not 7 <= digits <= 15 or YEAR_RANGE_RE.match(candidate):
+            continue
+        line_start = text.rfind("\n", 0, match.start()) + 1
+        if PHONE_LABEL_RE.search(text[line_start:match.start()]):
+            return candidate
+        if fallback is None and (candidate.startswith("+") or "(" in candidate or digits >= 10):
+            fallback = candidate
+    return fallback
+
+
+def find_sections(text: str) -> Dict[str, Tuple[int, int]]:
+    """Section name -> (body start, body end); the first heading of each kind wins"""
+    headings = [(m.start(), m.end(), _SECTION_BY_TITLE[m.group("title").lower()]) for m in SECTION_RE.finditer(text)]
+    sections = {}
+    for idx, (_, body_start, name) in enumerate(headings):
+        body_end = headings[idx + 1][0] if idx + 1 < len(headings) else len(text)
+        sections.setdefault(name, (body_start, body_end))
+    return sections
+
+
+def extract(text: str) -> LocalExtraction:
+    email = EMAIL_RE.search(text)
+    return LocalExtraction(
+        email=email.group().rstrip(".") if email else None,
+        phone=_phone(text),
+        gpas=find_gpas(text),
+        sections=find_sections(text),
+        skills=skill_taxonomy.find_skills(text) if settings.SKILL_MATCH_MODE != "off" else [],
+    )
+
+
+def apply(profile: CandidateProfile, local: LocalExtraction, text: str) -> CandidateProfile:
+    """
+    Fill a (reduced-prompt) LLM profile with locally extracted fields
+
+    Regex matches win over LLM output for email, phone and GPA (the prompt
+    does not ask for an email or phone found locally; it always asks for GPAs,
+    since unlabelled ones are found only by the LLM). Skills are canonicalized and
+    merged with taxonomy matches per SKILL_MATCH_MODE. GPAs are attached to
+    education entries by position: each GPA goes to the nearest preceding
+    institution mention in the education section, or, when no institution
+    is found in the text, the i-th GPA to the i-th entry. Entries that get
+    no local GPA keep the LLM's.
+    """
+    profile.skills = skill_taxonomy.merge(profile.skills, local.skills)
+    if local.email:
+        profile.email = local.email
+    if local.phone:
+        profile.phone = local.phone
+    if not local.gpas or not profile.education:
+        return profile
+
+    start, end = local.sections.get("education", (0, len(text)))
+    gpas = [g for g in local.gpas if start <= g.start < end] or local.gpas
+    if len(profile.education) == 1:
+        profile.education[0].gpa = str(gpas[0])
+        return profile
+
+    lowered = text.lower()
+    anchors = sorted(
+        (lowered.find(e.institution.lower(), start, end), idx)
+        for idx, e in enumerate(profile.education) if e.institution
+    )
+    anchors = [(pos, idx) for pos, idx in anchors if pos >= 0]
+    matched = {}  # education index -> GPA
+    for gpa in gpas:
+        owner = None
+        for pos, idx in anchors:
+            if pos <= gpa.start:
+                owner = idx
+        if owner is not None:
+            matched.setdefault(owner, gpa)
+    if not matched:
+        # Institutions worded differently in the text: fall back to document order
+        matched = dict(enumerate(gpas[:len(profile.education)]))
+    for idx, gpa in matched.items():
+        profile.education[idx].gpa = str(gpa)
+    return profile
@@ -0,0 +1,69 @@
+"""
+MinHash signatures and LSH banding for near-duplicate resume detection
+
+A resume is reduced to the set of its word 5-gram shingles. Its MinHash
+signature (NUM_PERM 32-bit minimums) estimates Jaccard similarity between two
+resumes as the fraction of equal positions. The signature is split into
+BANDS bands of ROWS values; two resumes sharing any band bucket become
+candidates for an exact signature comparison. With 8 bands of 8 rows, pairs
+at 0.9 similarity are found ~99% of the time while pairs below 0.5 are almost
+never compared.
+"""
+import hashlib
+import random
+import re
+import zlib
+from array import array
+from typing import List, Sequence, Set
+
+NUM_PERM = 64
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+
+_PRIME = 4294967291  # largest prime below 2**32, so values fit array('I')
+_rng = random.Random(0x5EED)  # fixed: signatures must be comparable across processes and restarts
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """Hashed word n-grams of normalised text"""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode())} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode()) for i in range(len(words) - size + 1)}
+
+
+def signature(text: str) -> array:
+    """MinHash signature (array of NUM_PERM unsigned 32-bit ints)"""
+    hashed = shingles(text)
+    if not hashed:
+        return array("I", [_PRIME] * NUM_PERM)
+    return array("I", [min((a * x + b) % _PRIME for x in hashed) for a, b in _PERMUTATIONS])
+
+
+def signature_to_bytes(sig: array) -> bytes:
+    return sig.tobytes()
+
+
+def signature_from_bytes(data: bytes) -> array:
+    sig = array("I")
+    sig.frombytes(data)
+    return sig
+
+
+def band_buckets(sig: Sequence[int]) -> List[int]:
+    """One signed 63-bit bucket id per band (fits an SQL BIGINT)"""
+    buckets = []
+    for band in range(BANDS):
+        chunk = array("I", sig[band * ROWS:(band + 1) * ROWS]).tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=8, person=b"lsh-band").digest()
+        buckets.append(int.from_bytes(digest, "big") >> 1)
+    return buckets
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
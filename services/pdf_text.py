@@ -0,0 +1,209 @@
+"""
+PDF text extraction engines
+
+    pdfium     pypdfium2 (PDFium, as in Chrome): fastest; infers word spacing
+               from glyph positions, keeps content-stream order
+    pypdf      pypdf, the maintained successor of PyPDF2
+    pdfminer   pdfminer.six layout analysis: groups text into blocks, so
+               multi-column resumes come out column by column; slowest
+    pypdf2     PyPDF2 (the original engine; always installed)
+
+PDF_TEXT_ENGINE names one engine, or "auto" (default), which probes the
+first page of each document:
+
+1. Layout: if PDFium finds many text lines whose later segments start at
+   one shared x position after a gutter, the page is set in columns and
+   pdfminer reads the document (the others interleave the columns' lines).
+2. Spacing: otherwise the first installed engine of ``AUTO_ORDER`` extracts
+   the page and ``text_quality()`` scores it. Below PDF_TEXT_MIN_QUALITY
+   (words run together or broken into letters), the other installed
+   engines extract the same page and the best-scoring one reads the whole
+   document.
+
+AUTO_ORDER is fastest first, from benchmarks/bench_pdf_text.py. Engines are
+optional dependencies imported on first use; auto mode skips missing ones.
+"""
+import io
+import re
+from collections import Counter
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from backend import metrics
+from backend.config import settings
+
+AUTO_ORDER = ("pdfium", "pypdf2", "pypdf", "pdfminer")
+LAYOUT_ENGINE = "pdfminer"  # for multi-column pages
+
+_GUTTER = 18.0  # points between columns (1/4 inch)
+_COLUMN_MIN_LINES = 5
+
+_LETTERS = re.compile(r"[A-Za-z]+")
+_GLUED_NUMBER = re.compile(r"[A-Za-z]{2,}\d[\d.]*[A-Za-z]{2,}")
+_GLUED_RUN = 15  # letters; longer runs are rare in resumes unless spaces were lost
+_SINGLE_LETTERS_OK = {"a", "A", "I"}
+
+
+class Extraction(NamedTuple):
+    text: str
+    engine: str
+    pages: int
+    quality: float
+
+
+def _pypdf2_pages(data: bytes) -> Iterator[str]:
+    import PyPDF2
+    for page in PyPDF2.PdfReader(io.BytesIO(data)).pages:
+        yield page.extract_text() or ""
+
+
+def _pypdf_pages(data: bytes) -> Iterator[str]:
+    import pypdf
+    for page in pypdf.PdfReader(io.BytesIO(data)).pages:
+        yield page.extract_text() or ""
+
+
+def _pdfminer_pages(data: bytes) -> Iterator[str]:
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+    for layout in extract_pages(io.BytesIO(data)):
+        yield "".join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+
+
+def _pdfium_pages(data: bytes, first_page_rects: Optional[list] = None) -> Iterator[str]:
+    import pypdfium2
+    document = pypdfium2.PdfDocument(data)
+    try:
+        for index in range(len(document)):
+            page = document[index]
+            textpage = page.get_textpage()
+            try:
+                if index == 0 and first_page_rects is not None:  # for the layout probe
+                    first_page_rects.extend(textpage.get_rect(i) for i in range(textpage.count_rects()))
+                yield textpage.get_text_range().replace("\r\n", "\n")
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        document.close()
+
+
+ENGINES: Dict[str, Callable[[bytes], Iterator[str]]] = {
+    "pdfium": _pdfium_pages,
+    "pypdf": _pypdf_pages,
+    "pdfminer": _pdfminer_pages,
+    "pypdf2": _pypdf2_pages,
+}
+_MODULES = {"pdfium": "pypdfium2", "pypdf": "pypdf", "pdfminer": "pdfminer", "pypdf2": "PyPDF2"}
+_available: Dict[str, bool] = {}
+
+
+def available(engine: str) -> bool:
+    """Whether the engine's package is installed"""
+    if engine not in _available:
+        try:
+            __import__(_MODULES[engine])
+            _available[engine] = True
+        except ImportError:
+            _available[engine] = False
+    return _available[engine]
+
+
+def installed() -> List[str]:
+    return [engine for engine in AUTO_ORDER if available(engine)]
+
+
+def text_quality(text: str) -> float:
+    """
+    0..1 estimate of how cleanly words were separated
+
+    Whitespace-separated tokens count as bad when they look like several
+    words run together (a long letter run, weighted by the words it likely
+    holds, or letters-digits-letters as in "with4.9years") or like a word
+    broken into single letters.
+    """
+    good = bad = 0.0
+    for token in text.split():
+        runs = _LETTERS.findall(token)
+        if not runs:
+            continue
+        penalty = sum(len(run) / 6 for run in runs if len(run) >= _GLUED_RUN)
+        if _GLUED_NUMBER.search(token):
+            penalty += 1
+        if len(token) == 1 and token not in _SINGLE_LETTERS_OK:
+            penalty += 1
+        if penalty:
+            bad += penalty
+        else:
+            good += 1
+    return good / (good + bad) if good + bad else 0.0
+
+
+def _join(pages: List[str]) -> str:
+    return "\n".join(page.strip("\n") for page in pages if page)
+
+
+def _extract_with(engine: str, data: bytes) -> Extraction:
+    pages = list(ENGINES[engine](data))
+    text = _join(pages)
+    return Extraction(text, engine, len(pages), text_quality(text))
+
+
+def _multi_column(rects: List[tuple]) -> bool:
+    """Whether a page's text segments (left, bottom, right, top) look set in columns"""
+    lines: List[list] = []
+    line_middle = None
+    for rect in sorted(rects, key=lambda r: (r[1] + r[3]) / 2):
+        middle = (rect[1] + rect[3]) / 2
+        if line_middle is None or middle - line_middle >= 4:
+            lines.append([])
+            line_middle = middle
+        lines[-1].append(rect)
+    column_starts = Counter()
+    for line in lines:
+        line.sort()
+        line_right = line[0][2]
+        for left, _, right, _ in line[1:]:
+            if left - line_right >= _GUTTER:
+                column_starts[round(left / 4)] += 1
+            line_right = max(line_right, right)
+    shared = column_starts.most_common(1)[0][1] if column_starts else 0
+    return shared >= max(_COLUMN_MIN_LINES, len(lines) / 4)
+
+
+def _auto(data: bytes) -> Extraction:
+    candidates = installed()
+    probe_layout = LAYOUT_ENGINE in candidates
+    first_pages = {}
+    for engine in candidates:
+        rects = [] if engine == "pdfium" and probe_layout else None
+        try:
+            pages = ENGINES[engine](data) if rects is None else _pdfium_pages(data, rects)
+            first = next(pages, "")
+        except Exception:  # a damaged file one engine cannot open may still parse in another
+            continue
+        if rects and _multi_column(rects):
+            pages.close()
+            return _extract_with(LAYOUT_ENGINE, data)
+        quality = text_quality(first)
+        if quality >= settings.PDF_TEXT_MIN_QUALITY or not first_pages and engine == candidates[-1]:
+            rest = list(pages)
+            text = _join([first] + rest)
+            return Extraction(text, engine, 1 + len(rest), text_quality(text))
+        pages.close()
+        first_pages[engine] = quality
+    if not first_pages:
+        raise ValueError("No PDF engine could read the file")
+    return _extract_with(max(first_pages, key=first_pages.get), data)
+
+
+def extract(data: bytes, engine: Optional[str] = None) -> Extraction:
+    """Text of a PDF (pages joined by newlines) with the engine that produced it"""
+    engine = (engine or settings.PDF_TEXT_ENGINE).lower()
+    if engine == "auto":
+        result = _auto(data)
+    elif engine in ENGINES:
+        result = _extract_with(engine, data)
+    else:
+        raise ValueError(f"Unknown PDF_TEXT_ENGINE {engine!r} (expected auto or one of {', '.join(ENGINES)})")
+    metrics.PDF_EXTRACTIONS.labels(result.engine).inc()
+    return result
@@ -0,0 +1,156 @@
+"""
+Re-screen stored candidates against a job description
+
+Reuses each candidate's stored resume text and structured profile, so only
+the scoring LLM call runs (no PDF parsing, no extraction call). Scoring runs
+with bounded parallelism and results are written in batches; progress is
+tracked on an in-memory job record and published to the shared cache after
+every batch, so any worker can answer status queries.
+"""
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from backend import admission, cache
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.db_service import DatabaseService
+from backend.schemas import MatchScore, RescreenRequest
+from services.resume_extractor import ResumeExtractor
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept for status queries
+MAX_TRACKED_JOBS = 100
+# Errors kept per job (the first ones; later ones are only counted)
+MAX_ERRORS = 20
+
+
+class RescreenJob:
+    """Progress of one re-screening run"""
+
+    def __init__(self, request: RescreenRequest):
+        self.id = uuid.uuid4().hex[:12]
+        self.request = request
+        self.status = "pending"
+        self.total = 0
+        self.scored = 0
+        self.failed = 0
+        self.written = 0
+        self.skipped = 0  # scored, but the candidate was deleted before the result was saved
+        self.errors: List[dict] = []
+        self.errors_omitted = 0
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+
+    def add_error(self, candidate_id: Optional[int], error: Exception, keep: bool = False) -> None:
+        """Record an error; beyond MAX_ERRORS only counted, unless ``keep``"""
+        if keep or len(self.errors) < MAX_ERRORS:
+            self.errors.append({"candidate_id": candidate_id, "error": str(error)})
+        else:
+            self.errors_omitted += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "job_title": DatabaseService._extract_job_title(self.request.job_description),
+            "total": self.total,
+            "scored": self.scored,
+            "failed": self.failed,
+            "written": self.written,
+            "skipped": self.skipped,
+            "progress": round((self.scored + self.failed) / self.total, 4) if self.total else 0.0,
+            "errors": self.errors,
+            "errors_omitted": self.errors_omitted,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+_jobs: Dict[str, RescreenJob] = {}
+_jobs_lock = threading.Lock()
+
+
+def start_rescreen(request: RescreenRequest) -> RescreenJob:
+    """Create a job and run it on a background thread"""
+    job = RescreenJob(request)
+    with _jobs_lock:
+        _jobs[job.id] = job
+        finished = [j for j in _jobs.values() if j.finished_at is not None]
+        for stale in sorted(finished, key=lambda j: j.finished_at)[:-MAX_TRACKED_JOBS]:
+            _jobs.pop(stale.id, None)
+    _publish(job)
+    threading.Thread(target=_run, args=(job,), name=f"rescreen-{job.id}", daemon=True).start()
+    return job
+
+
+def get_job(job_id: str) -> Optional[RescreenJob]:
+    return _jobs.get(job_id)
+
+
+def job_status(job_id: str) -> Optional[dict]:
+    """Status of a job started by any worker: the live record if it runs here, else the published copy"""
+    job = _jobs.get(job_id)
+    return job.to_dict() if job is not None else cache.get_json("rescreen_job", job_id)
+
+
+def _publish(job: RescreenJob) -> None:
+    cache.set_json("rescreen_job", job.id, job.to_dict())
+
+
+def _score(resume_text: str, job_description: str, profile) -> MatchScore:
+    """Score one candidate in the bulk admission lane: interactive uploads go first"""
+    with admission.controller().hold_blocking("bulk"):
+        return ResumeExtractor.compute_match_score(resume_text, job_description, profile)
+
+
+def _run(job: RescreenJob) -> None:
+    request = job.request
+    job_description = request.job_description
+    db = SessionLocal()
+    try:
+        job.status = "running"
+        candidate_ids = DatabaseService.find_candidate_ids(db, **request.filter.model_dump())
+        job.total = len(candidate_ids)
+        logger.info(f"Re-screening {job.total} candidates (job {job.id})")
+
+        batch_size = max(1, settings.RESCREEN_BATCH_SIZE)
+        with ThreadPoolExecutor(max_workers=max(1, settings.RESCREEN_CONCURRENCY)) as pool:
+            for start in range(0, len(candidate_ids), batch_size):
+                candidates = DatabaseService.get_candidates_for_rescreen(db, candidate_ids[start:start + batch_size])
+                # Profiles are built here, on the session's thread; workers only see plain data
+                futures = [
+                    (c.id, pool.submit(
+                        _score, c.resume_text or "", job_description, DatabaseService.candidate_profile(c)
+                    ))
+                    for c in candidates
+                ]
+                results = []
+                for candidate_id, future in futures:
+                    try:
+                        results.append((candidate_id, future.result()))
+                        job.scored += 1
+                    except Exception as e:
+                        job.failed += 1
+                        job.add_error(candidate_id, e)
+                written = DatabaseService.save_rescreen_results(db, job_description, results)
+                job.written += written
+                job.skipped += len(results) - written
+                db.expunge_all()  # keep the session from accumulating the whole pool
+                _publish(job)
+
+        job.status = "completed"
+        logger.info(f"Re-screen {job.id} finished: {job.scored} scored, {job.failed} failed")
+    except Exception as e:
+        db.rollback()
+        job.status = "failed"
+        job.add_error(None, e, keep=True)
+        logger.error(f"Re-screen {job.id} failed: {e}")
+    finally:
+        job.finished_at = datetime.utcnow()
+        db.close()
+        _publish(job)
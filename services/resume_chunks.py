@@ -0,0 +1,160 @@
+"""
+Split long resumes for parallel extraction, and merge the partial profiles
+
+A resume longer than EXTRACTION_CHUNK_CHARS is cut at its section headings
+(local_extractor.SECTION_RE): the text before the first heading (name,
+contact) and each section become segments, packed in order into chunks of at
+most that size. A section that is too long by itself (a publication list) is
+cut at blank lines, then lines; its continuation pieces repeat the heading
+line. Resumes without recognizable headings are cut the same way.
+
+``merge()`` combines the chunk profiles in chunk order, so the result does
+not depend on which LLM call finished first: single fields take the first
+non-empty value, list fields are concatenated without duplicates, and the
+total experience is the sum of the merged roles (as the prompt asks).
+"""
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from backend.schemas import CandidateProfile, Education, Experience
+from services.local_extractor import SECTION_RE, _SECTION_BY_TITLE
+
+HEADER = "header"  # text before the first section heading
+
+
+class Chunk(NamedTuple):
+    text: str
+    sections: Tuple[str, ...]  # section kinds, in order
+
+
+def segments(text: str) -> List[Tuple[str, str]]:
+    """(kind, text) for the header and every section, headings included, in document order"""
+    headings = list(SECTION_RE.finditer(text))
+    if not headings:
+        return [(HEADER, text)]
+    parts = [(HEADER, text[:headings[0].start()])] if text[:headings[0].start()].strip() else []
+    for idx, match in enumerate(headings):
+        end = headings[idx + 1].start() if idx + 1 < len(headings) else len(text)
+        parts.append((_SECTION_BY_TITLE[match.group("title").lower()], text[match.start():end]))
+    return parts
+
+
+def _units(text: str, max_chars: int, separators: Tuple[str, ...] = ("\n\n", "\n")) -> List[str]:
+    """Pieces of at most max_chars: paragraphs, else lines, else cuts at the last space"""
+    if len(text) <= max_chars:
+        return [text]
+    for depth, separator in enumerate(separators):
+        pieces = text.split(separator)
+        if len(pieces) > 1:
+            return [
+                unit
+                for idx, piece in enumerate(pieces)
+                for unit in _units(piece + (separator if idx + 1 < len(pieces) else ""), max_chars, separators[depth + 1:])
+            ]
+    units = []
+    while len(text) > max_chars:
+        cut = text.rfind(" ", 0, max_chars)
+        cut = cut if cut > 0 else max_chars
+        units.append(text[:cut])
+        text = text[cut:]
+    return units + [text] if text else units
+
+
+def _pack(units: Iterable[str], max_chars: int, prefix: str = "") -> List[str]:
+    """Concatenate units greedily; pieces after the first start with ``prefix``"""
+    pieces: List[str] = []
+    current = ""
+    for unit in units:
+        if current and len(current) + len(unit) > max_chars:
+            pieces.append(current)
+            current = prefix
+        current += unit
+    if current.strip():
+        pieces.append(current)
+    return pieces
+
+
+def split(text: str, max_chars: int) -> List[Chunk]:
+    """Chunks of ``text`` of at most about ``max_chars`` (one chunk if it fits, or max_chars <= 0)"""
+    if max_chars <= 0 or len(text) <= max_chars:
+        return [Chunk(text, ())]
+    pieces: List[Tuple[str, str]] = []
+    for kind, segment in segments(text):
+        if len(segment) <= max_chars:
+            pieces.append((kind, segment))
+            continue
+        heading = segment.split("\n", 1)[0].strip() if kind != HEADER else ""
+        prefix = f"{heading} (continued)\n" if heading else ""
+        units = _units(segment, max_chars - len(prefix))
+        pieces.extend((kind, piece) for piece in _pack(units, max_chars, prefix))
+
+    chunks: List[Chunk] = []
+    current, kinds = "", []
+    for kind, piece in pieces:
+        if current and len(current) + len(piece) > max_chars:
+            chunks.append(Chunk(current, tuple(kinds)))
+            current, kinds = "", []
+        current += piece
+        if kind not in kinds:
+            kinds.append(kind)
+    if current.strip():
+        chunks.append(Chunk(current, tuple(kinds)))
+    return chunks
+
+
+def _key(*values: Optional[str]) -> Tuple[str, ...]:
+    return tuple(" ".join((value or "").lower().split()) for value in values)
+
+
+def _unique(values: Iterable[Optional[str]]) -> List[str]:
+    seen, result = set(), []
+    for value in values:
+        key = _key(value)
+        if value and key not in seen:
+            seen.add(key)
+            result.append(value)
+    return result
+
+
+def _first(parts: List[CandidateProfile], field: str):
+    return next((getattr(part, field) for part in parts if getattr(part, field)), None)
+
+
+def merge(parts: List[CandidateProfile]) -> CandidateProfile:
+    """One profile from the chunk profiles, given in chunk order"""
+    experience: dict = {}
+    for entry in (entry for part in parts for entry in part.experience):
+        key = _key(entry.role, entry.company, entry.duration)
+        kept = experience.get(key)
+        if kept is None:
+            experience[key] = Experience(**entry.model_dump())
+            continue
+        # A role split across chunks: keep one entry with every responsibility
+        kept.responsibilities = _unique([*(kept.responsibilities or []), *(entry.responsibilities or [])])
+        if entry.years and not kept.years:
+            kept.years = entry.years
+
+    education: dict = {}
+    for entry in (entry for part in parts for entry in part.education):
+        kept = education.setdefault(_key(entry.degree, entry.institution), Education(**entry.model_dump()))
+        kept.year = kept.year or entry.year
+        kept.gpa = kept.gpa or entry.gpa
+
+    roles = list(experience.values())
+    if any(role.years for role in roles):
+        total = round(sum(role.years or 0 for role in roles), 1)
+    else:
+        totals = [part.total_experience_years for part in parts if part.total_experience_years is not None]
+        total = max(totals) if totals else None
+
+    return CandidateProfile(
+        name=_first(parts, "name"),
+        email=_first(parts, "email"),
+        phone=_first(parts, "phone"),
+        location=_first(parts, "location"),
+        skills=_unique(skill for part in parts for skill in part.skills),
+        experience=roles,
+        education=list(education.values()),
+        total_experience_years=total,
+        certifications=_unique(cert for part in parts for cert in part.certifications or []),
+        summary=_first(parts, "summary"),
+    )
@@ -1,58 +1,74 @@
 """
-Resume data extraction service using LLM (Google Gemini)
+Resume data extraction service using LLM (Google Gemini, see services/llm_backend.py)
 """
-import google.generativeai as genai
+import contextvars
 import json
 import logging
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from backend import cache
+from backend.config import settings
 from backend.schemas import CandidateProfile, MatchScore, ScreeningResult
-import os
+from backend.metrics import record_llm_usage, stage_timer
+from backend.profiling import follow_thread
+from services import llm_backend, local_extractor, resume_chunks, skill_taxonomy
+from services.local_extractor import LocalExtraction, parse_gpa
 from dotenv import load_dotenv
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-# Validate API key
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key or api_key == "your_gemini_api_key_here":
-    logger.error("Gemini API key not configured properly")
-    raise ValueError("Please set a valid GEMINI_API_KEY in your .env file")
+# Gemini by default (needs GEMINI_API_KEY); LLM_BACKEND=fake answers locally for load tests
+MODEL_NAME = 'models/gemini-2.0-flash'
+try:
+    model = llm_backend.create(MODEL_NAME)
+except ValueError:
+    logger.error("LLM backend not configured properly")
+    raise
 
-# Configure Gemini - Use the correct model name with "models/" prefix
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel('models/gemini-2.0-flash')
 
+def _profiled(fn, *args):
+    """Run ``fn`` on a pool thread that the request's profiler (if any) samples meanwhile"""
+    with follow_thread():
+        return fn(*args)
 
 class ResumeExtractor:
     """Extract structured data from resumes using LLM"""
     
     @staticmethod
-    def extract_candidate_data(resume_text: str) -> CandidateProfile:
+    def _extraction_prompt(resume_text: str, local: LocalExtraction, part: Optional[Tuple[int, int]] = None) -> str:
         """
-        Extract structured candidate information from resume text
-        
-        Args:
-            resume_text: Raw text extracted from resume PDF
-            
-        Returns:
-            CandidateProfile: Structured candidate data
+        Extraction prompt (``part``: chunk n of m)
+
+        Email and phone are left out when the local pass found them. GPA is
+        always asked for: labelled GPAs found locally overwrite the LLM's per
+        education entry, but unlabelled ones only the LLM finds.
         """
-        prompt = f"""
+        skills_field = ""
+        skills_rule = ""
+        if settings.SKILL_MATCH_MODE != "replace":  # replace: skills come from the taxonomy only
+            skills_field = '\n    "skills": ["skill1", "skill2", ...],'
+            skills_rule = "\n- Extract all technical skills, tools, frameworks, and soft skills"
+        contact = ""
+        if not local.email:
+            contact += '\n    "email": "Email address or null",'
+        if not local.phone:
+            contact += '\n    "phone": "Phone number or null",'
+        scope = ""
+        if part:
+            scope = (f"\nThis is part {part[0]} of {part[1]} of a long resume. Extract only what appears in this part; "
+                     "use null or empty lists for anything that does not.\n")
+        return f"""
 Extract structured information from the following resume and return it as a JSON object.
-
+{scope}
 Resume:
 {resume_text}
 
 Return a JSON object with this exact structure:
 {{
-    "name": "Full name or null",
-    "email": "Email address or null",
-    "phone": "Phone number or null",
-    "location": "City/Location or null",
-    "skills": ["skill1", "skill2", ...],
+    "name": "Full name or null",{contact}
+    "location": "City/Location or null",{skills_field}
     "experience": [
         {{
             "role": "Job title",
@@ -75,52 +91,85 @@ Return a JSON object with this exact structure:
     "summary": "Brief professional summary"
 }}
 
-Important:
-- Extract all technical skills, tools, frameworks, and soft skills
+Important:{skills_rule}
 - Calculate total_experience_years by summing all work experience
 - For GPA: Look for CGPA, GPA, percentage, grade, or any academic score. Include the scale if mentioned (e.g., "8.5/10" or "85%")
 - For education year: Include "Expected" if it's a future graduation date, or "Final Year" if mentioned
 - If information is not found, use null or empty list
 - Return ONLY valid JSON, no additional text
 """
-
-        try:
-            logger.info("Extracting candidate data from resume")
+    
+    @staticmethod
+    def _extract_profile(prompt: str) -> CandidateProfile:
+        """Profile for one extraction prompt, from the LLM cache or the LLM"""
+        cache_key = cache.content_key(MODEL_NAME, prompt)
+        candidate_data = cache.get_json("llm_extract", cache_key)
+        if candidate_data is not None:
+            return CandidateProfile(**candidate_data)
+        logger.info("Extracting candidate data from resume")
+        with stage_timer("llm_extract"):
             response = model.generate_content(prompt)
-            json_str = response.text.strip()
-            
-            # Remove markdown code blocks if present
-            if json_str.startswith("```"):
-                json_str = json_str.split("```")[1]
-                if json_str.startswith("json"):
-                    json_str = json_str[4:]
+        record_llm_usage("extract", response)
+        candidate_data = ResumeExtractor._response_json(response)
+        profile = CandidateProfile(**candidate_data)
+        cache.set_json("llm_extract", cache_key, candidate_data)
+        return profile
+    
+    @staticmethod
+    def _extract_chunked(chunks: List[resume_chunks.Chunk], local: LocalExtraction) -> CandidateProfile:
+        """Extract every chunk concurrently and merge the partial profiles in chunk order"""
+        logger.info(f"Extracting candidate data from a long resume in {len(chunks)} chunks")
+        prompts = [
+            ResumeExtractor._extraction_prompt(chunk.text, local, part=(idx + 1, len(chunks)))
+            for idx, chunk in enumerate(chunks)
+        ]
+        workers = max(1, min(settings.EXTRACTION_CHUNK_CONCURRENCY, len(chunks)))
+        with stage_timer("llm_extract_chunked"), ThreadPoolExecutor(workers, thread_name_prefix="extract-chunk") as pool:
+            # Each call runs in a copy of this context, so stage timings and profiles still see it (and sample it)
+            futures = [
+                pool.submit(contextvars.copy_context().run, _profiled, ResumeExtractor._extract_profile, prompt)
+                for prompt in prompts
+            ]
+            return resume_chunks.merge([future.result() for future in futures])
+    
+    @staticmethod
+    def extract_candidate_data(resume_text: str, local: Optional[LocalExtraction] = None) -> CandidateProfile:
+        """
+        Extract structured candidate information from resume text
+        
+        Email, phone and GPA come from the local regex pass when present; the
+        LLM is only asked for the rest. Resumes longer than
+        EXTRACTION_CHUNK_CHARS are extracted in parallel chunks and merged
+        (services/resume_chunks.py).
+        
+        Args:
+            resume_text: Raw text extracted from resume PDF
+            local: Result of local_extractor.extract() if already computed
             
-            candidate_data = json.loads(json_str)
-            logger.info(f"Successfully extracted data for candidate: {candidate_data.get('name', 'Unknown')}")
-            return CandidateProfile(**candidate_data)
+        Returns:
+            CandidateProfile: Structured candidate data
+        """
+        local = local or local_extractor.extract(resume_text)
+        chunks = resume_chunks.split(resume_text, settings.EXTRACTION_CHUNK_CHARS)
+
+        try:
+            if len(chunks) > 1:
+                profile = ResumeExtractor._extract_chunked(chunks, local)
+            else:
+                profile = ResumeExtractor._extract_profile(ResumeExtractor._extraction_prompt(resume_text, local))
+            logger.info(f"Successfully extracted data for candidate: {profile.name or 'Unknown'}")
+            return local_extractor.apply(profile, local, resume_text)
             
         except json.JSONDecodeError as e:
             logger.error(f"JSON parsing error in candidate extraction: {e}")
-            logger.error(f"Received content: {json_str[:500] if 'json_str' in locals() else 'No content'}")
             raise ValueError(f"Failed to parse LLM response as JSON: {e}")
         except Exception as e:
             logger.error(f"Error extracting candidate data: {e}")
             raise ValueError(f"Candidate data extraction failed: {e}")
     
     @staticmethod
-    def compute_match_score(resume_text: str, job_description: str, candidate: CandidateProfile) -> MatchScore:
-        """
-        Compute semantic match score between candidate and job description
-        
-        Args:
-            resume_text: Raw resume text
-            job_description: Job requirements
-            candidate: Extracted candidate profile
-            
-        Returns:
-            MatchScore: Score (1-10) with detailed justification
-        """
-        # Build education details with GPA
+    def _education_summary(candidate: CandidateProfile) -> Tuple[List[str], str]:
+        """Education lines (with GPA) and the GPA category of the highest GPA"""
         education_details = []
         highest_gpa = None
         if candidate.education:
@@ -130,17 +179,10 @@ Important:
                     detail += f" ({e.year})"
                 if e.gpa:
                     detail += f" [GPA: {e.gpa}]"
-                    # Try to extract numeric GPA (on 10 scale)
-                    try:
-                        gpa_str = str(e.gpa).split('/')[0].strip()
-                        gpa_value = float(gpa_str)
-                        # Convert to 10 scale if on 4 scale
-                        if gpa_value <= 4.0:
-                            gpa_value = (gpa_value / 4.0) * 10
-                        if highest_gpa is None or gpa_value > highest_gpa:
-                            highest_gpa = gpa_value
-                    except:
-                        pass
+                    gpa = parse_gpa(e.gpa)
+                    gpa_value = gpa.on_ten_scale() if gpa else None
+                    if gpa_value is not None and (highest_gpa is None or gpa_value > highest_gpa):
+                        highest_gpa = gpa_value
                 education_details.append(detail)
         
         # Determine GPA category
@@ -156,6 +198,54 @@ Important:
                 gpa_category = "Below Average (6.0-7.0)"
             else:
                 gpa_category = "Poor (<6.0)"
+        return education_details, gpa_category
+    
+    @staticmethod
+    def _skill_coverage(job_description: str, candidate: CandidateProfile) -> str:
+        """Prompt line listing the job's required skills the candidate has and lacks ("" if none found)"""
+        job_skills = skill_taxonomy.find_skills(job_description) if settings.SKILL_MATCH_MODE != "off" else []
+        if not job_skills:
+            return ""
+        have = {skill.lower() for skill in skill_taxonomy.normalize(candidate.skills)}
+        matched = [skill for skill in job_skills if skill.lower() in have]
+        missing = [skill for skill in job_skills if skill.lower() not in have]
+        return (f"\n- Job Skills Matched: {len(matched)} of {len(job_skills)} "
+                f"({', '.join(matched) or 'none'}); missing: {', '.join(missing) or 'none'}")
+    
+    @staticmethod
+    def _response_json(response) -> Any:
+        """Parsed JSON of an LLM response, without a surrounding markdown code block"""
+        json_str = response.text.strip()
+        
+        # Remove markdown code blocks if present
+        if json_str.startswith("```"):
+            json_str = json_str.split("```")[1]
+            if json_str.startswith("json"):
+                json_str = json_str[4:]
+        
+        try:
+            return json.loads(json_str)
+        except json.JSONDecodeError:
+            logger.warning("Unparseable LLM response", extra={"verbose": True, "llm_output": json_str[:500]})
+            raise
+    
+    @staticmethod
+    def compute_match_score(resume_text: str, job_description: str, candidate: CandidateProfile) -> MatchScore:
+        """
+        Compute semantic match score between candidate and job description
+        
+        Args:
+            resume_text: Raw resume text
+            job_description: Job requirements
+            candidate: Extracted candidate profile
+            
+        Returns:
+            MatchScore: Score (1-10) with detailed justification
+        """
+        education_details, gpa_category = ResumeExtractor._education_summary(candidate)
+        
+        # Required skills named in the job description vs the candidate's skills
+        skill_coverage = ResumeExtractor._skill_coverage(job_description, candidate)
         
         prompt = f"""
 You are an expert technical recruiter. Compare the following resume with the job description and rate the candidate's fit on a scale of 1-10 with detailed justification.
@@ -165,7 +255,7 @@ JOB DESCRIPTION:
 
 CANDIDATE PROFILE:
 - Name: {candidate.name}
-- Skills: {', '.join(candidate.skills) if candidate.skills else 'Not specified'}
+- Skills: {', '.join(candidate.skills) if candidate.skills else 'Not specified'}{skill_coverage}
 - Total Experience: {candidate.total_experience_years} years
 - Education: {', '.join(education_details) if education_details else 'Not specified'}
 - Academic Performance: {gpa_category}
@@ -213,32 +303,166 @@ Decision Rule for recommended_action:
 Return ONLY valid JSON, no additional text or markdown.
 """
 
+        cache_key = cache.content_key(MODEL_NAME, prompt)
         try:
-            logger.info("Computing match score against job description")
-            response = model.generate_content(prompt)
-            json_str = response.text.strip()
-            
-            # Remove markdown code blocks if present
-            if json_str.startswith("```"):
-                json_str = json_str.split("```")[1]
-                if json_str.startswith("json"):
-                    json_str = json_str[4:]
-            
-            match_data = json.loads(json_str)
-            match_score = MatchScore(**match_data)
+            match_data = cache.get_json("llm_score", cache_key)
+            if match_data is None:
+                logger.info("Computing match score against job description")
+                with stage_timer("llm_score"):
+                    response = model.generate_content(prompt)
+                record_llm_usage("score", response)
+                match_data = ResumeExtractor._response_json(response)
+                match_score = MatchScore(**match_data)
+                cache.set_json("llm_score", cache_key, match_data)
+            else:
+                match_score = MatchScore(**match_data)
             logger.info(f"Match score computed: {match_score.score}/10 - {match_score.recommended_action}")
             return match_score
             
         except json.JSONDecodeError as e:
             logger.error(f"JSON parsing error in match scoring: {e}")
-            logger.error(f"Received content: {json_str[:500] if 'json_str' in locals() else 'No content'}")
             raise ValueError(f"Failed to parse match score response as JSON: {e}")
         except Exception as e:
             logger.error(f"Error computing match score: {e}")
             raise ValueError(f"Match score computation failed: {e}")
     
     @staticmethod
-    def screen_resume(resume_text: str, job_description: str, filename: str) -> ScreeningResult:
+    def _multi_score_prompt(resume_text: str, job_descriptions: List[str], candidate: CandidateProfile) -> str:
+        """One scoring prompt for several jobs: the resume once, then each job with its skill coverage"""
+        education_details, gpa_category = ResumeExtractor._education_summary(candidate)
+        jobs = "\n\n".join(
+            f"=== JOB {idx} ===\n{job_description}{ResumeExtractor._skill_coverage(job_description, candidate)}"
+            for idx, job_description in enumerate(job_descriptions, 1)
+        )
+        count = len(job_descriptions)
+        return f"""
+You are an expert technical recruiter. Compare the following resume with each of the {count} job descriptions below and rate the candidate's fit for each job on a scale of 1-10 with detailed justification. Score every job independently of the others.
+
+CANDIDATE PROFILE:
+- Name: {candidate.name}
+- Skills: {', '.join(candidate.skills) if candidate.skills else 'Not specified'}
+- Total Experience: {candidate.total_experience_years} years
+- Education: {', '.join(education_details) if education_details else 'Not specified'}
+- Academic Performance: {gpa_category}
+
+FULL RESUME:
+{resume_text}
+
+{jobs}
+
+TASK: Evaluate this candidate against the requirements of each job and provide a match score per job.
+
+Evaluation Criteria:
+1. Technical Skills Match (40%): How well do the candidate's technical skills align with job requirements?
+2. Experience Relevance (30%): Is the candidate's experience relevant and sufficient?
+3. Education & Qualifications (20%): Does education meet job requirements? Consider GPA if specified.
+4. Overall Fit (10%): Would this candidate succeed in this role?
+
+Scoring Scale (1.0 to 10.0):
+- 9.0-10.0: Exceptional candidate - exceeds all requirements significantly
+- 8.0-8.9: Strong candidate - exceeds most requirements
+- 7.0-7.9: Good candidate - meets all key requirements
+- 6.0-6.9: Adequate candidate - meets some requirements, gaps in others
+- 5.0-5.9: Weak candidate - significant gaps in requirements
+- 4.0-4.9: Poor candidate - lacks most requirements
+- 1.0-3.9: Unqualified - does not meet job requirements
+
+IMPORTANT INSTRUCTIONS:
+- Be objective and precise in scoring
+- Use ONE decimal place (e.g., 8.3, 6.7, 9.1)
+- Differentiate between candidates - avoid giving everyone the same score
+- Consider ALL criteria, not just one factor
+- Base your score on actual resume content vs job requirements
+
+Return a JSON array with exactly {count} objects, one per job in the order given, each with this EXACT structure:
+[
+    {{
+        "job": <job number>,
+        "score": <number between 1.0 and 10.0>,
+        "justification": "<detailed 2-3 sentence explanation of how candidate matches this job's requirements>",
+        "strengths": ["<specific strength 1>", "<specific strength 2>", "<specific strength 3>"],
+        "concerns": ["<specific concern or gap 1>", "<specific concern or gap 2>"],
+        "recommended_action": "<Shortlist or Reject>"
+    }}
+]
+
+Decision Rule for recommended_action:
+- Score >= 7.0 → "Shortlist"
+- Score < 7.0 → "Reject"
+
+Return ONLY valid JSON, no additional text or markdown.
+"""
+    
+    @staticmethod
+    def _score_batch(resume_text: str, job_descriptions: List[str], candidate: CandidateProfile) -> List[MatchScore]:
+        """Scores for a batch of jobs from one packed prompt; jobs the answer misses are scored one by one"""
+        if len(job_descriptions) == 1:  # same prompt (and cache entry) as compute_match_score
+            return [ResumeExtractor.compute_match_score(resume_text, job_descriptions[0], candidate)]
+        prompt = ResumeExtractor._multi_score_prompt(resume_text, job_descriptions, candidate)
+        cache_key = cache.content_key(MODEL_NAME, prompt)
+        items = cache.get_json("llm_score", cache_key)
+        if items is None:
+            logger.info(f"Computing match scores against {len(job_descriptions)} job descriptions")
+            try:
+                with stage_timer("llm_score_multi"):
+                    response = model.generate_content(prompt)
+                record_llm_usage("score_multi", response)
+                items = ResumeExtractor._response_json(response)
+            except Exception as e:
+                logger.warning(f"Packed scoring of {len(job_descriptions)} jobs failed: {e}")
+        
+        scores: Dict[int, MatchScore] = {}
+        for position, item in enumerate(items if isinstance(items, list) else []):
+            idx = item.get("job", position + 1) if isinstance(item, dict) else None
+            if not isinstance(idx, int) or not 1 <= idx <= len(job_descriptions) or idx in scores:
+                continue
+            try:
+                scores[idx] = MatchScore(**{k: v for k, v in item.items() if k != "job"})
+            except (TypeError, ValueError):  # one malformed entry does not discard the others
+                continue
+        if len(scores) == len(job_descriptions):
+            cache.set_json("llm_score", cache_key, items)
+        
+        # Jobs the answer missed or got wrong: the single-job prompt
+        missing = [idx for idx in range(1, len(job_descriptions) + 1) if idx not in scores]
+        if missing:
+            logger.warning(f"Packed scoring answer lacks jobs {missing} of {len(job_descriptions)}, scoring them one by one")
+        for idx in missing:
+            scores[idx] = ResumeExtractor.compute_match_score(resume_text, job_descriptions[idx - 1], candidate)
+        return [scores[idx] for idx in range(1, len(job_descriptions) + 1)]
+    
+    @staticmethod
+    def compute_match_scores(resume_text: str, job_descriptions: List[str], candidate: CandidateProfile) -> List[MatchScore]:
+        """
+        Match scores of one candidate against several job descriptions, in order
+        
+        Jobs are packed MULTI_SCORE_JOBS_PER_CALL to a prompt, so the resume is
+        sent once per batch instead of once per job; batches run concurrently
+        (MULTI_SCORE_CONCURRENCY).
+        
+        Raises:
+            ValueError: If a job cannot be scored
+        """
+        per_call = max(1, settings.MULTI_SCORE_JOBS_PER_CALL)
+        batches = [job_descriptions[start:start + per_call] for start in range(0, len(job_descriptions), per_call)]
+        if len(batches) == 1:
+            return ResumeExtractor._score_batch(resume_text, batches[0], candidate)
+        workers = max(1, min(settings.MULTI_SCORE_CONCURRENCY, len(batches)))
+        with ThreadPoolExecutor(workers, thread_name_prefix="score-batch") as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, _profiled, ResumeExtractor._score_batch, resume_text, batch, candidate)
+                for batch in batches
+            ]
+            return [score for future in futures for score in future.result()]
+    
+    @staticmethod
+    def screen_resume(
+        resume_text: str,
+        job_description: str,
+        filename: str,
+        candidate: Optional[CandidateProfile] = None,
+        local: Optional[LocalExtraction] = None
+    ) -> ScreeningResult:
         """
         Complete screening pipeline: extract data + compute match score
         
@@ -246,6 +470,8 @@ Return ONLY valid JSON, no additional text or markdown.
             resume_text: Raw resume text
             job_description: Job requirements
             filename: Original resume filename
+            candidate: Previously extracted profile of the same resume; skips extraction
+            local: Local regex extraction of resume_text, if already computed
             
         Returns:
             ScreeningResult: Complete screening result with candidate data and match score
@@ -263,8 +489,9 @@ Return ONLY valid JSON, no additional text or markdown.
             raise ValueError("Job description is too short or empty")
         
         try:
-            # Step 1: Extract structured candidate data
-            candidate = ResumeExtractor.extract_candidate_data(resume_text)
+            # Step 1: Extract structured candidate data (unless reused from a duplicate)
+            if candidate is None:
+                candidate = ResumeExtractor.extract_candidate_data(resume_text, local)
             
             # Step 2: Compute match score
             match_score = ResumeExtractor.compute_match_score(resume_text, job_description, candidate)
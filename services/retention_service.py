@@ -0,0 +1,198 @@
+"""
+Retention purge: drop old screenings and the candidates left without any
+
+With RETENTION_DAYS set, each worker checks every few minutes whether a purge
+is due (RETENTION_INTERVAL_HOURS since the last one recorded in
+``maintenance_runs``, or by this process if it could not be recorded there);
+a non-blocking lock file in CACHE_DIR lets one worker per host run it.
+POST /api/maintenance/retention runs one on demand. A purge:
+
+1. deletes screenings older than the cutoff, oldest first, DELETE_BATCH_SIZE
+   per transaction (analytics rollups kept in step),
+2. deletes candidates added before the cutoff that have no screening left;
+   their experiences, educations and LSH bands go by ON DELETE CASCADE,
+3. runs ANALYZE and, with RETENTION_VACUUM, VACUUM first so the file
+   shrinks. VACUUM rewrites the whole database and blocks writers meanwhile.
+
+The report (rows deleted, seconds per step, database and free-page bytes
+before and after) is logged and stored in ``maintenance_runs`` for
+GET /api/maintenance/retention.
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+import orjson
+from sqlalchemy import select
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process exclusion
+    fcntl = None
+
+from backend.config import settings
+from backend.database import SessionLocal, engine
+from backend.db_service import DatabaseService
+from backend.models import MaintenanceRun
+
+logger = logging.getLogger(__name__)
+
+CHECK_SECONDS = 300  # how often workers check whether a purge is due
+
+TASK = "retention"  # maintenance_runs.task
+
+_scheduler: Optional[threading.Thread] = None
+_last_finished: Optional[datetime] = None  # this process's last purge, in case recording or reading it fails
+
+
+class PurgeRunning(Exception):
+    """Another worker on this host is purging"""
+
+
+@contextmanager
+def _host_lock() -> Iterator[None]:
+    """Exclusive lock shared by this host's workers; raises PurgeRunning instead of waiting"""
+    os.makedirs(settings.CACHE_DIR, exist_ok=True)
+    with open(os.path.join(settings.CACHE_DIR, "retention.lock"), "a") as lock_file:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                raise PurgeRunning("A retention purge is already running")
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def storage_stats(bind) -> dict:
+    """Database size and reusable free space in bytes (SQLite; empty elsewhere)"""
+    if bind.dialect.name != "sqlite":
+        return {}
+    with bind.connect() as conn:
+        page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+        return {
+            "database_bytes": conn.exec_driver_sql("PRAGMA page_count").scalar() * page_size,
+            "free_bytes": conn.exec_driver_sql("PRAGMA freelist_count").scalar() * page_size,
+        }
+
+
+def optimize(bind, vacuum: bool = False) -> dict:
+    """VACUUM (optional) and ANALYZE; returns the seconds each took"""
+    timings = {}
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if vacuum:
+            started = time.perf_counter()
+            conn.exec_driver_sql("VACUUM")
+            timings["vacuum_seconds"] = round(time.perf_counter() - started, 3)
+        started = time.perf_counter()
+        conn.exec_driver_sql("ANALYZE")
+        timings["analyze_seconds"] = round(time.perf_counter() - started, 3)
+    return timings
+
+
+def purge(days: Optional[int] = None, vacuum: Optional[bool] = None) -> dict:
+    """
+    Run one purge now (see the module docstring) and return its report
+
+    Raises:
+        ValueError: If no positive retention period is given or configured
+        PurgeRunning: If another worker is purging
+    """
+    days = settings.RETENTION_DAYS if days is None else days
+    vacuum = settings.RETENTION_VACUUM if vacuum is None else vacuum
+    if days <= 0:
+        raise ValueError("Retention period must be at least one day")
+    with _host_lock():
+        started_at = datetime.utcnow()
+        cutoff = started_at - timedelta(days=days)
+        report = {"days": days, "cutoff": cutoff, "started_at": started_at, "storage_before": storage_stats(engine)}
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            report["screenings_deleted"] = DatabaseService.delete_screenings_before(db, cutoff, settings.DELETE_BATCH_SIZE)
+            report["screenings_seconds"] = round(time.perf_counter() - started, 3)
+            started = time.perf_counter()
+            candidate_ids = DatabaseService.find_unscreened_candidate_ids(db, cutoff)
+            report["candidates_deleted"] = DatabaseService.delete_candidates(db, candidate_ids, settings.DELETE_BATCH_SIZE)
+            report["candidates_seconds"] = round(time.perf_counter() - started, 3)
+        report.update(optimize(engine, vacuum))
+        report["storage_after"] = storage_stats(engine)
+        report["finished_at"] = datetime.utcnow()
+        report["seconds"] = round((report["finished_at"] - started_at).total_seconds(), 3)
+    _record(report)
+    logger.info(
+        f"Retention purge (>{days} days): {report['screenings_deleted']} screenings, "
+        f"{report['candidates_deleted']['candidates']} candidates deleted in {report['seconds']}s",
+        extra={"verbose": True, "retention": report}
+    )
+    return report
+
+
+def _record(report: dict) -> None:
+    global _last_finished
+    _last_finished = report["finished_at"]
+    try:
+        with SessionLocal() as db:
+            db.add(MaintenanceRun(
+                task=TASK, started_at=report["started_at"], finished_at=report["finished_at"],
+                report=orjson.dumps(report).decode(),
+            ))
+            db.commit()
+    except Exception as e:
+        logger.error(f"Could not record the retention purge: {e}")
+
+
+def _latest() -> Optional[MaintenanceRun]:
+    with SessionLocal() as db:
+        return db.execute(
+            select(MaintenanceRun).where(MaintenanceRun.task == TASK)
+            .order_by(MaintenanceRun.finished_at.desc()).limit(1)
+        ).scalar_one_or_none()
+
+
+def last_report() -> Optional[dict]:
+    """Report of the latest purge on any worker"""
+    run = _latest()
+    return orjson.loads(run.report) if run is not None else None
+
+
+def _due() -> bool:
+    finished = [_last_finished] if _last_finished is not None else []
+    try:
+        run = _latest()
+        if run is not None:
+            finished.append(run.finished_at)
+    except Exception as e:
+        logger.warning(f"Could not read the last retention purge: {e}")
+    if not finished:
+        return True
+    finished_at = max(finished)
+    return datetime.utcnow() - finished_at >= timedelta(hours=settings.RETENTION_INTERVAL_HOURS)
+
+
+def _schedule() -> None:
+    while True:
+        try:
+            if _due():
+                purge()
+        except PurgeRunning:
+            pass
+        except Exception as e:
+            logger.error(f"Retention purge failed: {e}")
+        time.sleep(CHECK_SECONDS)
+
+
+def start_scheduler() -> bool:
+    """Start the periodic purge thread if RETENTION_DAYS is set; returns whether it runs"""
+    global _scheduler
+    if settings.RETENTION_DAYS <= 0:
+        return False
+    if _scheduler is None:
+        _scheduler = threading.Thread(target=_schedule, name="retention", daemon=True)
+        _scheduler.start()
+    return True
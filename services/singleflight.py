@@ -0,0 +1,53 @@
+"""
+Single-flight: concurrent identical calls share one execution
+
+When the same resume is uploaded for the same job twice at once (a double
+click, two recruiters), both requests would parse the PDF, call the LLM and
+write a screening. ``Group.do(key, fn)`` runs ``fn`` for the first caller of
+a key; callers arriving while it is still running await that call's result
+(or exception) instead of starting their own. The key is dropped as soon as
+the call finishes, so a later upload goes through the normal dedup path and
+finds the stored screening.
+
+The shared call runs as its own task, so a first caller whose client
+disconnects does not cancel it for the others. Coalescing is per process;
+across uvicorn workers the shared LLM cache (backend/cache.py) absorbs
+repeated prompts instead.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from backend import metrics
+
+
+class Group:
+    """In-flight calls of one operation, by key (use from the event loop thread only)"""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Result of ``fn()``, shared with concurrent callers using the same key
+
+        Returns (result, coalesced): coalesced is True when this caller
+        joined a call that was already in flight.
+        """
+        call = self._calls.get(key)
+        coalesced = call is not None
+        if call is None:
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            call.add_done_callback(lambda done: self._finished(key, done))
+        metrics.singleflight_call(self.operation, coalesced)
+        return await asyncio.shield(call), coalesced
+
+    def _finished(self, key: Hashable, call: asyncio.Future) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.cancelled():
+            call.exception()  # mark retrieved: every waiter may have gone away
+
+    def in_flight(self) -> int:
+        return len(self._calls)
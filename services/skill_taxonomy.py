@@ -0,0 +1,355 @@
+"""
+Skill taxonomy and linear-time skill matching (no LLM)
+
+TAXONOMY maps each canonical skill name to its aliases ("Postgres", "psql" ->
+"PostgreSQL"). All aliases are compiled into one Aho-Corasick automaton over
+word tokens, so a resume or job description is scanned in a single pass no
+matter how many aliases there are. Matching on tokens rather than characters
+gives word boundaries for free ("Java" never matches inside "JavaScript") and
+keeps the per-resume work to a few hundred dictionary lookups.
+
+Tokens are runs of word characters with trailing "+"/"#" kept ("C++", "C#"),
+plus the dotted suffixes ".js" and ".net" ("Node.js", "ASP.NET"). Aliases in
+CASE_SENSITIVE only match when written exactly so ("Go" the language, not
+"go" the verb) and names in CONTEXT_ONLY are never taken from free text;
+everything else is case-insensitive. Overlapping matches resolve
+leftmost-longest ("React Native" is not also "React").
+
+SKILL_TAXONOMY_FILE may point to a JSON object {canonical: [aliases]} that
+extends or overrides the built-in entries.
+"""
+import json
+import logging
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+TAXONOMY: Dict[str, Tuple[str, ...]] = {
+    # Languages
+    "Python": ("python3", "python 3", "py3"),
+    "Java": ("java 8", "java 11", "java 17", "core java"),
+    "JavaScript": ("js", "ecmascript", "es6", "vanilla js"),
+    "TypeScript": (),
+    "C": ("ansi c",),
+    "C++": ("cpp", "c plus plus", "modern c++"),
+    "C#": ("c sharp", "csharp"),
+    "Go": ("golang",),
+    "Rust": ("rustlang",),
+    "Kotlin": (),
+    "Swift": ("swiftui",),
+    "Scala": (),
+    "Ruby": (),
+    "PHP": ("php7", "php8"),
+    "R": ("rstudio", "r programming"),
+    "MATLAB": (),
+    "Perl": (),
+    "Bash": ("shell scripting", "bash scripting", "shell script"),
+    "SQL": ("t-sql", "tsql", "pl/sql", "plsql", "ansi sql"),
+    "HTML": ("html5",),
+    "CSS": ("css3",),
+    "Sass": ("scss",),
+    "Dart": (),
+    "Elixir": (),
+    "Haskell": (),
+    "Objective-C": ("objective c", "objc"),
+    "Solidity": (),
+    # Web frameworks and runtimes
+    "React": ("react.js", "reactjs", "react js"),
+    "React Native": ("react-native",),
+    "Angular": ("angularjs", "angular.js", "angular js"),
+    "Vue.js": ("vue", "vuejs", "vue js", "vue 3"),
+    "Svelte": ("sveltekit",),
+    "Next.js": ("nextjs", "next js"),
+    "Node.js": ("node", "nodejs", "node js"),
+    "Express": ("express.js", "expressjs"),
+    "Django": ("django rest framework", "drf"),
+    "Flask": (),
+    "FastAPI": ("fast api",),
+    "Spring Boot": ("springboot", "spring-boot"),
+    "Spring": ("spring framework", "spring mvc"),
+    "Rails": ("ruby on rails", "ror"),
+    "Laravel": (),
+    ".NET": ("dotnet", "dot net", ".net core", "asp.net", "asp.net core", ".net framework"),
+    "jQuery": (),
+    "Redux": (),
+    "Tailwind CSS": ("tailwind", "tailwindcss"),
+    "Bootstrap": (),
+    "Flutter": (),
+    # APIs and architecture
+    "REST APIs": ("rest", "rest api", "restful", "restful api", "restful apis", "restful services", "rest services"),
+    "GraphQL": (),
+    "gRPC": (),
+    "Microservices": ("microservice", "micro-services", "microservices architecture"),
+    "WebSockets": ("websocket", "web sockets"),
+    "OAuth": ("oauth2", "oauth 2.0", "openid connect", "oidc"),
+    # Databases and storage
+    "PostgreSQL": ("postgres", "postgresql", "psql", "postgre sql"),
+    "MySQL": ("my sql", "mariadb"),
+    "SQLite": ("sqlite3",),
+    "SQL Server": ("mssql", "ms sql", "microsoft sql server", "ms sql server"),
+    "Oracle Database": ("oracle db", "oracle sql", "oracle 19c"),
+    "MongoDB": ("mongo", "mongo db"),
+    "Redis": (),
+    "Cassandra": ("apache cassandra",),
+    "DynamoDB": ("dynamo db", "amazon dynamodb"),
+    "Elasticsearch": ("elastic search", "elk", "opensearch"),
+    "Neo4j": (),
+    "Snowflake": (),
+    "BigQuery": ("big query", "google bigquery"),
+    "Redshift": ("amazon redshift", "aws redshift"),
+    # Cloud and infrastructure
+    "AWS": ("amazon web services", "aws cloud"),
+    "Azure": ("microsoft azure", "azure cloud"),
+    "GCP": ("google cloud", "google cloud platform"),
+    "Docker": ("docker compose", "docker-compose", "containerization"),
+    "Kubernetes": ("k8s", "kubectl", "eks", "aks", "gke"),
+    "Helm": ("helm charts",),
+    "Terraform": ("hcl",),
+    "Ansible": (),
+    "Linux": ("unix", "ubuntu", "centos", "rhel", "red hat linux", "debian"),
+    "Git": ("github", "gitlab", "bitbucket", "version control"),
+    "CI/CD": ("cicd", "ci cd", "continuous integration", "continuous delivery", "continuous deployment"),
+    "Jenkins": (),
+    "GitHub Actions": ("gh actions",),
+    "Nginx": (),
+    "Prometheus": (),
+    "Grafana": (),
+    "Serverless": ("aws lambda", "lambda functions", "azure functions", "cloud functions"),
+    # Messaging and data engineering
+    "Kafka": ("apache kafka",),
+    "RabbitMQ": ("rabbit mq",),
+    "Spark": ("apache spark", "pyspark", "spark sql"),
+    "Hadoop": ("apache hadoop", "hdfs", "mapreduce"),
+    "Airflow": ("apache airflow",),
+    "dbt": ("data build tool",),
+    "ETL": ("elt", "etl pipelines", "data pipelines"),
+    "Databricks": (),
+    # Data science and ML
+    "Machine Learning": ("ml", "machine-learning"),
+    "Deep Learning": ("deep-learning", "neural networks"),
+    "NLP": ("natural language processing",),
+    "Computer Vision": ("image processing",),
+    "TensorFlow": ("tensorflow 2", "tf2"),
+    "PyTorch": ("torch",),
+    "Keras": (),
+    "Scikit-learn": ("sklearn", "scikit learn", "scikit"),
+    "Pandas": (),
+    "NumPy": (),
+    "SciPy": (),
+    "OpenCV": (),
+    "Hugging Face": ("huggingface", "transformers"),
+    "LLMs": ("llm", "large language models", "generative ai", "genai"),
+    "MLOps": ("ml ops", "mlflow", "kubeflow"),
+    "Statistics": ("statistical analysis", "statistical modeling", "statistical modelling"),
+    "Data Analysis": ("data analytics",),
+    "Data Visualization": ("data visualisation", "matplotlib", "seaborn", "plotly"),
+    "Tableau": (),
+    "Power BI": ("powerbi", "power-bi"),
+    "Excel": ("ms excel", "microsoft excel", "advanced excel"),
+    # Testing and practices
+    "Unit Testing": ("unit tests", "pytest", "junit", "jest", "mocha", "unittest"),
+    "Selenium": (),
+    "TDD": ("test driven development", "test-driven development"),
+    "Agile": ("scrum", "kanban", "agile methodologies", "agile/scrum"),
+    "Jira": (),
+    "System Design": ("distributed systems", "software architecture"),
+    # Soft skills
+    "Communication": ("communication skills", "verbal communication", "written communication"),
+    "Leadership": ("leadership skills", "team leadership", "people management", "team lead"),
+    "Problem Solving": ("problem-solving", "analytical thinking"),
+    "Teamwork": ("team player",),
+    "Project Management": ("project planning", "pmp"),
+}
+
+# Aliases that are also common English words or letters: only an exact-case
+# mention counts. Lowercase forms are still accepted by canonical(), where the
+# input is known to be a skill name.
+CASE_SENSITIVE = frozenset({
+    "C", "R", "Go", "Rust", "Swift", "Ruby", "Spark", "Excel", "Flask", "Express", "Spring", "Agile", "Helm",
+    "Keras", "Redux", "Dart", "Elixir", "Bootstrap", "Snowflake", "Serverless", "Communication", "Leadership",
+    "Teamwork", "Statistics", "Transformers", "Torch", "Node", "Vue", "REST", "JS", "ML", "ELK", "HCL",
+    "ROR", "DRF", "ELT", "PMP", "Scikit", "Mongo",
+})
+
+# Canonical names too ambiguous to find in free text ("R&D", "C-level",
+# "Spring 2021 internship"); still recognized by canonical() and via their
+# longer aliases
+CONTEXT_ONLY = frozenset({"C", "R", "Spring"})
+
+_TOKEN_RE = re.compile(r"\.(?:js|net)(?![\w+#])|\w+[+#]*")
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text)
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over alias token sequences"""
+
+    def __init__(
+        self,
+        taxonomy: Dict[str, Iterable[str]],
+        case_sensitive: Iterable[str] = CASE_SENSITIVE,
+        context_only: Iterable[str] = CONTEXT_ONLY
+    ):
+        context_only = set(context_only)
+        case_sensitive = {form.lower(): form for form in case_sensitive}
+        self._by_name: Dict[Tuple[str, ...], str] = {}
+        self._forms: Dict[str, List[str]] = {}
+        # Trie: goto[state][token] -> state; output[state] -> (length, canonical, exact tokens or None)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[List[Tuple[int, str, Optional[List[str]]]]] = [[]]
+        for canonical, aliases in taxonomy.items():
+            self._forms[canonical] = [canonical, *aliases]
+            for alias in (canonical, *aliases):
+                tokens = _tokens(alias.lower())
+                if not tokens:
+                    continue
+                self._by_name.setdefault(tuple(tokens), canonical)
+                if alias in context_only:
+                    continue
+                exact = _tokens(case_sensitive[alias.lower()]) if alias.lower() in case_sensitive else None
+                self._insert(tokens, canonical, exact)
+        self._vocabulary = frozenset(token for edges in self._goto for token in edges)
+        self._fail = self._link()
+
+    def _insert(self, tokens: List[str], canonical: str, exact: Optional[List[str]]) -> None:
+        state = 0
+        for token in tokens:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][token] = nxt
+                self._goto.append({})
+                self._output.append([])
+            state = nxt
+        self._output[state].append((len(tokens), canonical, exact))
+
+    def _link(self) -> List[int]:
+        """Breadth-first failure links; each state inherits the outputs of its failure state"""
+        fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                target = fail[state]
+                while target and token not in self._goto[target]:
+                    target = fail[target]
+                fallback = self._goto[target].get(token, 0)
+                fail[nxt] = fallback if fallback != nxt else 0
+                self._output[nxt] = self._output[nxt] + self._output[fail[nxt]]
+        return fail
+
+    def _scan(self, tokens: List[str]) -> List[Tuple[int, int, str, Optional[List[str]]]]:
+        goto, fail, output, vocabulary = self._goto, self._fail, self._output, self._vocabulary
+        hits = []
+        state = 0
+        for idx, token in enumerate(tokens):
+            if token not in vocabulary:  # no alias contains it: every state falls back to the root
+                state = 0
+                continue
+            while True:
+                nxt = goto[state].get(token)
+                if nxt is not None:
+                    state = nxt
+                    break
+                if not state:
+                    break
+                state = fail[state]
+            for length, canonical, exact in output[state]:
+                hits.append((idx - length + 1, length, canonical, exact))
+        return hits
+
+    def find(self, text: Optional[str]) -> List[str]:
+        """Canonical skills mentioned in ``text``, in order of first mention"""
+        if not text:
+            return []
+        tokens = _tokens(text.lower())
+        hits = self._scan(tokens)
+        if not hits:
+            return []
+        original = None
+        if any(exact for *_, exact in hits):
+            original = _tokens(text)
+            if len(original) != len(tokens):  # lower() moved a token boundary (rare non-ASCII)
+                hits = self._scan([token.lower() for token in original])
+        hits.sort(key=lambda hit: (hit[0], -hit[1]))
+        found: Dict[str, None] = {}
+        covered = 0
+        for start, length, canonical, exact in hits:
+            if start < covered:
+                continue
+            if exact and original[start:start + length] != exact:
+                continue
+            covered = start + length
+            found.setdefault(canonical)
+        return list(found)
+
+    def canonical(self, skill: Optional[str]) -> Optional[str]:
+        """Canonical name for a skill name or alias; None if not in the taxonomy"""
+        if not skill:
+            return None
+        return self._by_name.get(tuple(_tokens(skill.lower())))
+
+    def forms(self, canonical: str) -> List[str]:
+        """The canonical name followed by its aliases"""
+        return self._forms.get(canonical, [canonical])
+
+
+def _load_taxonomy() -> Dict[str, Iterable[str]]:
+    taxonomy: Dict[str, Iterable[str]] = dict(TAXONOMY)
+    if settings.SKILL_TAXONOMY_FILE:
+        try:
+            with open(settings.SKILL_TAXONOMY_FILE, encoding="utf-8") as f:
+                extra = json.load(f)
+            taxonomy.update({str(name): tuple(aliases) for name, aliases in extra.items()})
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"Ignoring skill taxonomy file {settings.SKILL_TAXONOMY_FILE}: {e}")
+    return taxonomy
+
+
+@lru_cache(maxsize=1)
+def matcher() -> SkillMatcher:
+    """The shared matcher (built once per process)"""
+    return SkillMatcher(_load_taxonomy())
+
+
+def find_skills(text: Optional[str]) -> List[str]:
+    return matcher().find(text)
+
+
+def canonicalize(skill: str) -> str:
+    """Canonical name if known, otherwise the input with whitespace trimmed"""
+    return matcher().canonical(skill) or skill.strip()
+
+
+def normalize(skills: Optional[Iterable[str]]) -> List[str]:
+    """Canonicalize a skills list, dropping case-insensitive duplicates"""
+    seen, result = set(), []
+    for skill in skills or []:
+        if not isinstance(skill, str) or not skill.strip():
+            continue
+        name = canonicalize(skill)
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            result.append(name)
+    return result
+
+
+def merge(llm_skills: Optional[Iterable[str]], found: List[str], mode: Optional[str] = None) -> List[str]:
+    """
+    Combine LLM-extracted skills with taxonomy matches per SKILL_MATCH_MODE
+
+    merge: LLM skills canonicalized, then taxonomy matches not already listed;
+    replace: taxonomy matches only; off: LLM skills unchanged.
+    """
+    mode = mode or settings.SKILL_MATCH_MODE
+    if mode == "off":
+        return list(llm_skills or [])
+    if mode == "replace":
+        return list(found)
+    return normalize([*(llm_skills or []), *found])